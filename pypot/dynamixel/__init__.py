@@ -11,6 +11,7 @@ from .error import BaseErrorHandler
 from .syncloop import BaseDxlController
 from .motor import DxlMXMotor, DxlAXRXMotor, DxlXL320Motor, DxlSRMotor
 from .io.abstract_io import DxlError
+from .discovery import discover
 
 from ..robot import Robot
 
@@ -71,37 +72,33 @@ def get_port_vendor_info(port=None):
     return port_info_dict[port] if port is not None else port_info_dict
 
 
-def find_port(ids, strict=True):
+def find_port(ids, strict=True, timeout=None):
     """ Find the port with the specified attached motor ids.
 
         :param list ids: list of motor ids to find
         :param bool strict: specify if all ids should be find (when set to False, only half motor must be found)
+        :param float timeout: time to wait for each ping (defaults to the timeout of the ios)
+
+        All the ports are scanned concurrently (see :func:`~pypot.dynamixel.discovery.discover`).
 
         .. warning:: If two (or more) ports are attached to the same list of motor ids the first match will be returned.
 
     """
     ids_founds = []
-    for port in get_available_ports():
-        for DxlIOCls in (DxlIO, Dxl320IO):
-            try:
-                with DxlIOCls(port) as dxl:
-                    _ids_founds = dxl.scan(ids)
-                    ids_founds += _ids_founds
+    for port, scan in discover(ids=ids, timeout=timeout).items():
+        _ids_founds = scan.ids
+        ids_founds += _ids_founds
 
-                    if strict and sorted(_ids_founds) == sorted(ids):
-                        return port
+        if strict and sorted(_ids_founds) == sorted(ids):
+            return port
 
-                    if not strict and len(_ids_founds) >= len(ids) / 2:
-                        logger.warning('Missing ids: {}'.format(ids, list(set(ids) - set(_ids_founds))))
-                        return port
+        if not strict and len(_ids_founds) >= len(ids) / 2:
+            logger.warning('Missing ids: {}'.format(ids, list(set(ids) - set(_ids_founds))))
+            return port
 
-                    if len(ids_founds) > 0:
-                        logger.warning('Port:{} ids found:{}'.format(port, _ids_founds))
+        if len(ids_founds) > 0:
+            logger.warning('Port:{} ids found:{}'.format(port, _ids_founds))
 
-            except DxlError:
-                logger.warning('DxlError on port {}'.format(port))
-                continue
-    
     missing = list(set(ids) - set(ids_founds))
     if len(missing) == 0:
         raise ValueError('All motors have been found but they are not connected as specified in the configuration file, please check connections')
@@ -112,30 +109,26 @@ def autodetect_robot():
     """ Creates a :class:`~pypot.robot.robot.Robot` by detecting dynamixel motors on all available ports. """
     motor_controllers = []
 
-    for port in get_available_ports():
-        for DxlIOCls in (DxlIO, Dxl320IO):
-            dxl_io = DxlIOCls(port)
-            ids = dxl_io.scan()
-
-            if not ids:
-                dxl_io.close()
-                continue
+    for port, scan in discover().items():
+        if not scan.ids:
+            continue
 
-            models = dxl_io.get_model(ids)
+        dxl_io = scan.io_cls(port)
+        ids = scan.ids
+        models = dxl_io.get_model(ids)
 
-            motorcls = {
-                'MX': DxlMXMotor,
-                'RX': DxlAXRXMotor,
-                'AX': DxlAXRXMotor,
-                'XL': DxlXL320Motor,
-                'SR': DxlSRMotor,
-            }
+        motorcls = {
+            'MX': DxlMXMotor,
+            'RX': DxlAXRXMotor,
+            'AX': DxlAXRXMotor,
+            'XL': DxlXL320Motor,
+            'SR': DxlSRMotor,
+        }
 
-            motors = [motorcls[model[:2]](id, model=model)
-                      for id, model in zip(ids, models)]
+        motors = [motorcls[model[:2]](id, model=model)
+                  for id, model in zip(ids, models)]
 
-            c = BaseDxlController(dxl_io, motors)
-            motor_controllers.append(c)
-            break
+        c = BaseDxlController(dxl_io, motors)
+        motor_controllers.append(c)
 
     return Robot(motor_controllers)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+
+import pypot.utils.pypot_time as time
+
+from ..utils.stoppablethread import LoopStats
+from .controller import DxlController, _pos_speed_load_write_filter, _pos_speed_load_writes
+from .io.abstract_io import DxlError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDxlController(object):
+    """ Asyncio version of the main synchronization loops of a :class:`~pypot.dynamixel.syncloop.BaseDxlController`.
+
+        It works with an :class:`~pypot.dynamixel.io.async_io.AsyncDxlIO` (or :class:`~pypot.dynamixel.io.async_io.AsyncDxl320IO`) and runs as tasks of the event loop (e.g. the Tornado IOLoop of a server) instead of threads:
+
+            * reads the present position, speed, load and writes the goal position, moving speed and torque limit at sync_freq,
+            * reads the present voltage and temperature at slow_freq.
+
+        Both loops share the io so their requests are interleaved on the bus. The updates are scheduled against absolute deadlines, the ticks missed by a too long update are skipped (see :attr:`loop_stats`).
+
+        """
+    # Same raw values accessors than the threaded controllers
+    _stored = DxlController._stored
+    _get_values = DxlController._get_values
+    _set_values = DxlController._set_values
+
+    def __init__(self, io, motors, sync_freq=50., slow_freq=1.):
+        self.io = io
+        self.motors = motors
+
+        self.period = 1.0 / sync_freq
+        self.slow_period = 1.0 / slow_freq
+
+        self.store = None
+        self.snapshots = None
+        self.loop_stats = LoopStats()
+
+        self._write_filter = _pos_speed_load_write_filter()
+        self._tasks = []
+
+    @property
+    def working_motors(self):
+        return [m for m in self.motors if not m._broken]
+
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    async def start(self):
+        """ Initializes the motors values and starts the loops (must be called from the event loop). """
+        await self.setup()
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._run(self.period, self.update, self.loop_stats)),
+                       loop.create_task(self._run(self.slow_period, self.update_slow))]
+
+    async def stop(self):
+        """ Stops the loops and waits for them to end. """
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def setup(self):
+        motors = self.working_motors
+        ids = [m.id for m in motors]
+
+        torques = await self.io.is_torque_enabled(ids)
+        for m, c in zip(motors, torques):
+            m.compliant = not c
+        self._old_torques = dict(zip(ids, torques))
+
+        try:
+            values = await self.io.get_goal_position_speed_load(ids)
+            positions, speeds, loads = zip(*values)
+        except ValueError:
+            raise DxlError("Couldn't initialize pos/speed/load sync loop!")
+
+        self._set_values(motors, 'goal_position', positions)
+        self._set_values(motors, 'moving_speed', speeds)
+        self._set_values(motors, 'torque_limit', loads)
+
+    async def update(self):
+        motors = self.working_motors
+
+        await self.get_present_position_speed_load(motors)
+        await self.set_goal_position_speed_load(motors)
+
+    async def update_slow(self):
+        motors = self.working_motors
+        ids = [m.id for m in motors]
+
+        voltages, temperatures = await asyncio.gather(self.io.get_present_voltage(ids),
+                                                      self.io.get_present_temperature(ids))
+        if voltages:
+            self._set_values(motors, 'present_voltage', voltages)
+        if temperatures:
+            self._set_values(motors, 'present_temperature', temperatures)
+
+    async def get_present_position_speed_load(self, motors):
+        ids = [m.id for m in motors]
+        values = await self.io.get_present_position_speed_load(ids)
+
+        if not values:
+            logger.warning('Timeout when getting pos/speed/load from %s', ids)
+            return
+
+        positions, speeds, loads = zip(*values)
+        self._set_values(motors, 'present_position', positions)
+        self._set_values(motors, 'present_speed', speeds)
+        self._set_values(motors, 'present_load', loads)
+
+        if self.snapshots is not None:
+            self.snapshots.publish(motors, {'present_position': positions,
+                                            'present_speed': speeds,
+                                            'present_load': loads})
+
+    async def set_goal_position_speed_load(self, motors):
+        change_torque, write = _pos_speed_load_writes(self, motors)
+
+        if change_torque:
+            await self.io._set_torque_enable(change_torque)
+
+        if write is not None:
+            method, values, written = write
+            await getattr(self.io, method)(values)
+            self._write_filter.written(*written)
+
+    async def _run(self, period, update, stats=None):
+        deadline = time.monotonic()
+        last_start = None
+
+        while True:
+            start = time.monotonic()
+
+            try:
+                await update()
+            except Exception:
+                # the loop keeps running (asyncio.CancelledError is not caught)
+                logger.exception('Error in the update of %s', self)
+
+            end = time.monotonic()
+            if stats is not None:
+                stats.record(start - deadline, end - start,
+                             start - last_start if last_start is not None else None)
+            last_start = start
+
+            deadline += period
+            if end > deadline:
+                missed = int((end - deadline) // period) + 1
+                if stats is not None:
+                    stats.overruns += 1
+                    stats.skipped += missed
+                deadline += missed * period
+
+            await asyncio.sleep(deadline - time.monotonic())
@@ -0,0 +1,250 @@
+"""
+The budget module estimates the bus time used by the synchronization loops of a controller.
+
+For each loop, the instruction packets that would be sent on the bus are built (using the control tables of the io and the framing of its protocol) so the number of bytes on the wire and the expected duration of a loop can be computed without any hardware. From there, the bus utilization of a controller is the sum over its loops of their duration times their frequency.
+
+The estimation relies on:
+    * the baudrate (10 bits per byte are sent on the wire: start, 8 data bits and stop),
+    * the return delay time of the motors (waited before each status packet),
+    * the latency of the usb to serial adapter (waited for each round trip).
+
+When the utilization exceeds a target, :func:`plan` proposes to lower the loops frequencies or to split the motors across several buses.
+
+"""
+import logging
+
+from collections import namedtuple
+
+from .controller import BulkReadDxlController, PosSpeedLoadDxlController
+
+
+logger = logging.getLogger(__name__)
+
+
+LoopCost = namedtuple('LoopCost', ('name', 'frequency',
+                                   'nb_transactions', 'nb_bytes',
+                                   'duration'))
+
+BusPlan = namedtuple('BusPlan', ('utilization', 'target',
+                                 'frequency_factor', 'frequencies',
+                                 'nb_buses'))
+
+# Registers synchronized by a loop but stored as several controls in the io
+_composite_registers = {
+    'goal_position_speed_load': ('goal position speed', 'torque limit'),
+}
+
+
+class BusBudget(object):
+    """ Estimates the bus time used by synchronization loops on a given bus. """
+    def __init__(self, io_cls,
+                 baudrate=1000000, return_delay_time=0,
+                 use_sync_read=False, latency=0.001):
+        """
+        :param io_cls: io class used on the bus (:class:`~pypot.dynamixel.io.DxlIO` or :class:`~pypot.dynamixel.io.Dxl320IO`)
+        :param int baudrate: baudrate of the bus
+        :param float return_delay_time: return delay time of the motors (in µs)
+        :param bool use_sync_read: whether the loops use the SYNC_READ instruction
+        :param float latency: round trip latency of the usb to serial adapter (in s)
+
+        """
+        self.io_cls = io_cls
+        self.protocol = io_cls._protocol
+
+        self.baudrate = baudrate
+        self.return_delay_time = return_delay_time
+        self.use_sync_read = use_sync_read
+        self.latency = latency
+
+    @classmethod
+    def from_io(cls, io, **kwargs):
+        """ Creates the budget matching the settings of an opened io. """
+        return cls(io.__class__, io.baudrate,
+                   use_sync_read=io._sync_read, **kwargs)
+
+    def utilization(self, controller):
+        """ Returns the fraction of the bus time used by the loops of the controller. """
+        return sum(c.duration * c.frequency for c in self.controller_costs(controller))
+
+    def controller_costs(self, controller):
+        """ Returns the :class:`LoopCost` of each loop of a controller. """
+        return [self.loop_cost(loop) for loop in controller_loops(controller)]
+
+    def loop_cost(self, loop):
+        """ Returns the :class:`LoopCost` of a single synchronization loop. """
+        transactions = list(self._transactions(loop))
+
+        nb_bytes = sum(len(ip.to_string()) + status_size
+                       for ip, status_size, _ in transactions)
+        nb_status = sum(n for _, _, n in transactions)
+        nb_round_trips = len([n for _, _, n in transactions if n])
+
+        duration = (nb_bytes * 10.0 / self.baudrate +
+                    nb_status * self.return_delay_time * 1e-6 +
+                    nb_round_trips * self.latency)
+
+        name = (', '.join(loop.varnames)
+                if isinstance(loop, BulkReadDxlController) else
+                loop.varname)
+
+        return LoopCost(name, 1.0 / loop.period,
+                        len(transactions), nb_bytes, duration)
+
+    def _transactions(self, loop):
+        """ Yields (instruction packet, status bytes, number of status packets) for each transaction of the loop. """
+        ids = [m.id for m in loop.motors if not m._broken]
+        if not ids:
+            return
+
+        if isinstance(loop, PosSpeedLoadDxlController):
+            for t in self._read(ids, 'present_position_speed_load'):
+                yield t
+            for t in self._write(ids, 'goal_position_speed_load'):
+                yield t
+
+        elif isinstance(loop, BulkReadDxlController):
+            yield self._bulk_read(ids, loop.varnames)
+
+        elif loop.mode == 'get':
+            for t in self._read(ids, loop.regname):
+                yield t
+
+        else:
+            for t in self._write(ids, loop.regname):
+                yield t
+
+    def _controls(self, regname):
+        controls = self.io_cls._controls_by_name
+
+        def find(name):
+            return controls.get(name, controls.get(name.replace('_', ' ')))
+
+        found = ([find(regname)] if find(regname) is not None else
+                 [find(name) for name in _composite_registers.get(regname, ())])
+
+        if not found or None in found:
+            raise ValueError('unknown register {} for {}'.format(regname, self.io_cls.__name__))
+
+        return found
+
+    def _read(self, ids, regname):
+        for c in self._controls(regname):
+            length = c.length * c.nb_elem
+
+            if self.use_sync_read and len(ids) > 1:
+                ip = self.protocol.DxlSyncReadPacket(ids, c.address, length)
+                nb_status = len(ids) if self.protocol.name == 'v2' else 1
+                yield ip, self.protocol.status_packet_size(ip), nb_status
+            else:
+                for id in ids:
+                    ip = self.protocol.DxlReadDataPacket(id, c.address, length)
+                    yield ip, self.protocol.status_packet_size(ip), 1
+
+    def _write(self, ids, regname):
+        for c in self._controls(regname):
+            yield self.protocol.DxlSyncWriteTemplate(c.address, c.length, c.nb_elem, ids), 0, 0
+
+    def _bulk_read(self, ids, regnames):
+        controls = sum((self._controls(name) for name in regnames), [])
+
+        address = min(c.address for c in controls)
+        end = max(c.address + c.length * c.nb_elem for c in controls)
+
+        ip = self.protocol.DxlBulkReadPacket([(id, address, end - address) for id in ids])
+        return ip, self.protocol.status_packet_size(ip), len(ids)
+
+
+def controller_loops(controller):
+    """ Returns the synchronization loops run by a controller. """
+    return getattr(controller, 'controllers', [controller])
+
+
+def plan(budget, controller, target=0.8, max_buses=8):
+    """ Proposes how to keep the bus utilization of a controller under a target.
+
+        Two solutions are given:
+            * frequency_factor: the factor to apply to all the loops frequencies (1.0 if the utilization is already under the target),
+            * nb_buses: the number of buses needed if the motors were evenly split (keeping the frequencies unchanged, see :func:`split_motors`), None if more than max_buses would be needed.
+
+        :return: a :class:`BusPlan`
+
+        """
+    costs = budget.controller_costs(controller)
+    utilization = sum(c.duration * c.frequency for c in costs)
+
+    factor = min(1.0, target / utilization) if utilization > 0 else 1.0
+    frequencies = [(c.name, c.frequency * factor) for c in costs]
+
+    groups = split_motors(budget, controller.__class__, controller.motors,
+                          target, max_buses)
+    nb_buses = len(groups) if groups is not None else None
+
+    return BusPlan(utilization, target, factor, frequencies, nb_buses)
+
+
+def split_motors(budget, controller_cls, motors, target=0.8, max_buses=8):
+    """ Splits the motors in the smallest number of groups so each bus stays under the target utilization.
+
+        The controller_cls is instantiated (without io) for each group of motors to estimate its utilization. Returns None if more than max_buses would be needed.
+
+        """
+    controller_cls = getattr(controller_cls, 'meta_controller', controller_cls)
+
+    for nb_buses in range(1, max_buses + 1):
+        groups = [motors[i::nb_buses] for i in range(nb_buses)]
+        groups = [g for g in groups if g]
+
+        if all(budget.utilization(controller_cls(None, g)) <= target
+               for g in groups):
+            return groups
+
+    return None
+
+
+def scale_frequencies(controller, factor):
+    """ Multiplies the frequency of all the loops of a controller (before starting it). """
+    for loop in controller_loops(controller):
+        loop.period /= factor
+
+    for slot in getattr(controller, 'slots', []):
+        slot.period /= factor
+
+    if hasattr(controller, 'slots'):
+        controller.period /= factor
+
+
+def check_controller(io, controller, target=None, **kwargs):
+    """ Logs the estimated bus utilization of a controller.
+
+        If a target is given and exceeded, the frequencies of all the loops are lowered to stay under it. Otherwise, a warning is logged when the loops can not fit on the bus.
+
+        :return: the (possibly lowered) bus utilization (None if it could not be estimated)
+
+        """
+    budget = BusBudget.from_io(io, **kwargs)
+
+    try:
+        utilization = budget.utilization(controller)
+    except (ValueError, AttributeError) as e:
+        # Custom loops may not be described by the control tables
+        logger.info('Could not estimate the bus utilization on %s: %s', io.port, e)
+        return None
+
+    logger.info('Estimated bus utilization on %s: %.0f%%',
+                io.port, 100 * utilization)
+
+    if target is not None and utilization > target:
+        factor = target / utilization
+        scale_frequencies(controller, factor)
+
+        logger.warning('Bus utilization on %s (%.0f%%) exceeds %.0f%%, '
+                       'lowering all the loops frequencies by a factor %.2f',
+                       io.port, 100 * utilization, 100 * target, factor)
+        utilization = target
+
+    elif utilization > 1.0:
+        logger.warning('The synchronization loops on %s need %.0f%% of the bus time, '
+                       'their frequencies can not be met.',
+                       io.port, 100 * utilization)
+
+    return utilization
@@ -0,0 +1,143 @@
+""" Full control table dumps of the motors.
+
+    The layout of the control table of each model (see :class:`ControlTableLayout`) is compiled once into a numpy structured dtype, so all the registers of all the motors of a model are decoded in a single pass from the raw bytes.
+
+    """
+import numpy
+import logging
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from .conversion import convert_all
+
+
+logger = logging.getLogger(__name__)
+
+
+class ControlTableLayout(object):
+    """ Contiguous layout of the registers of a model.
+
+        The composite registers (e.g. 'present position speed load') are left out as their values are already given by the registers they contain.
+
+        """
+    def __init__(self, controls, model):
+        controls = [c for c in controls if model in c.models]
+
+        def contains(c, other):
+            start, end = c.address, c.address + c.length * c.nb_elem
+            other_end = other.address + other.length * other.nb_elem
+            return (start <= other.address and other_end <= end and
+                    end - start > other_end - other.address)
+
+        self.controls = sorted((c for c in controls
+                                if not any(contains(c, other) for other in controls)),
+                               key=lambda c: c.address)
+        self.model = model
+
+        self.address = self.controls[0].address
+        end = max(c.address + c.length * c.nb_elem for c in self.controls)
+        self.length = end - self.address
+
+        formats = {1: 'u1', 2: '<u2', 4: '<u4'}
+        self.dtype = numpy.dtype({
+            'names': [c.name for c in self.controls],
+            'formats': [formats[c.length] if c.nb_elem == 1 else (formats[c.length], c.nb_elem)
+                        for c in self.controls],
+            'offsets': [c.address - self.address for c in self.controls],
+            'itemsize': self.length,
+        })
+
+    def decode(self, blocks, models=None):
+        """ Decodes the raw blocks read from several motors of this model.
+
+            :param list blocks: the raw bytes of each motor (self.length bytes read at self.address)
+            :param list models: models of the motors (if given, the values are converted to the standard system)
+            :return: a list of OrderedDict {register name: value} (one per block)
+
+            """
+        raw = numpy.frombuffer(b''.join(blocks), dtype=self.dtype)
+
+        columns = []
+        for c in self.controls:
+            values = raw[c.name].tolist()
+            if c.nb_elem > 1:
+                values = [tuple(v) for v in values]
+            if models is not None:
+                values = convert_all(c.dxl_to_si, values, models)
+            columns.append(values)
+
+        names = [c.name for c in self.controls]
+        return [OrderedDict(zip(names, row)) for row in zip(*columns)]
+
+
+@lru_cache(maxsize=None)
+def control_table_layout(io_cls, model):
+    """ Returns the (cached) :class:`ControlTableLayout` of a model for an io class. """
+    return ControlTableLayout(io_cls._controls_by_name.values(), model)
+
+
+def read_control_tables(dxl_io, ids, convert=True):
+    """ Reads the full control table of the specified motors.
+
+        The motors of the same model are read together (with a single sync read if enabled on the io, one read per motor otherwise) and decoded at once.
+
+        :return: an OrderedDict {id: OrderedDict {register name: value}} (the motors which could not be read are missing)
+
+        """
+    models = dxl_io.get_model(ids)
+
+    ids_for_model = OrderedDict()
+    for motor_id, model in zip(ids, models):
+        ids_for_model.setdefault(model, []).append(motor_id)
+
+    tables = {}
+    for model, model_ids in ids_for_model.items():
+        layout = control_table_layout(type(dxl_io), model)
+
+        blocks = dxl_io.read_blocks(model_ids, layout.address, layout.length)
+        if not blocks:
+            logger.warning('Could not read the control table of %s', model_ids)
+            continue
+
+        decoded = layout.decode(blocks, [model] * len(model_ids) if convert else None)
+        tables.update(zip(model_ids, decoded))
+
+    return OrderedDict((motor_id, tables[motor_id]) for motor_id in ids if motor_id in tables)
+
+
+def diff_control_tables(previous, current):
+    """ Returns the registers which changed between two dumps (see :func:`read_control_tables`).
+
+        :return: an OrderedDict {id: OrderedDict {register name: (previous value, current value)}} with only the motors and registers which changed (a motor missing from previous has all its registers)
+
+        """
+    diff = OrderedDict()
+
+    for motor_id, table in current.items():
+        old = previous.get(motor_id, {})
+        changes = OrderedDict((name, (old.get(name), value))
+                              for name, value in table.items()
+                              if name not in old or old[name] != value)
+        if changes:
+            diff[motor_id] = changes
+
+    return diff
+
+
+class ControlTableMonitor(object):
+    """ Reads the full control table of motors and reports the changes since the previous read. """
+    def __init__(self, dxl_io, ids, convert=True):
+        self.io = dxl_io
+        self.ids = list(ids)
+        self.convert = convert
+
+        self.last = None
+
+    def snapshot(self):
+        """ Reads the control tables and returns them with their differences against the previous snapshot (all the registers for the first one). """
+        tables = read_control_tables(self.io, self.ids, self.convert)
+        diff = diff_control_tables(self.last if self.last is not None else {}, tables)
+
+        self.last = tables
+        return tables, diff
@@ -1,12 +1,125 @@
 import time
+import numpy
 import logging
 
+from . import conversion as conv
 from .io.abstract_io import DxlError
 from ..robot.controller import MotorsController
 
 logger = logging.getLogger(__name__)
 
 
+class _WriteFilter(object):
+    """ Keeps track of the values written on the bus to only write the ones which changed.
+
+        The setters of the motors registers bump a per-register version, so only the motors modified since the last write are compared with the values written. A value is considered as changed when it differs from the written one by at least the threshold of its register (by default any difference). Every refresh_period (if not None) all the values of the refreshed motors are written again.
+
+        The versions of a motor are only recorded once its values are written (or found unchanged), so a failed write is retried at the next update.
+
+        """
+    def __init__(self, varnames, thresholds=None, refresh_period=None, refreshed=None):
+        """
+        :param list varnames: registers written together
+        :param list thresholds: for each register, a function returning the threshold of a motor (or None)
+        :param float refresh_period: period of the full refresh (in seconds)
+        :param refreshed: function telling whether a motor is periodically refreshed (all of them by default)
+
+        """
+        self.varnames = varnames
+        self.thresholds = thresholds if thresholds is not None else [None] * len(varnames)
+        self.refresh_period = refresh_period
+        self.refreshed = refreshed
+
+        self._motor_thresholds = {}
+        self.refresh()
+
+    def refresh(self):
+        """ Forces all the values to be written again. """
+        self._versions = {}
+        self._pending = {}
+        self._written = {}
+        self._last_refresh = time.time()
+
+    def forget(self, motor):
+        """ Forces the values of a motor to be written again. """
+        self._versions.pop(motor.id, None)
+        self._written.pop(motor.id, None)
+
+    def candidates(self, motors):
+        """ Returns the motors whose registers were modified since they were last checked. """
+        if (self.refresh_period is not None and
+                time.time() - self._last_refresh >= self.refresh_period):
+            if self.refreshed is None:
+                self.refresh()
+            else:
+                self._last_refresh = time.time()
+                for m in motors:
+                    if self.refreshed(m):
+                        self.forget(m)
+
+        modified = []
+        for m in motors:
+            versions = tuple(m._write_versions[var] for var in self.varnames)
+            if self._versions.get(m.id) != versions:
+                self._pending[m.id] = versions
+                modified.append(m)
+
+        return modified
+
+    def changed(self, motors, values):
+        """ Filters out the motors whose values did not change.
+
+            :param list values: for each motor, the tuple of the values of the registers
+            :return: the changed motors, their values and the set of the changed registers
+
+            """
+        changed_motors, changed_values, changed_vars = [], [], set()
+
+        for m, v in zip(motors, values):
+            written = self._written.get(m.id)
+
+            if written is None:
+                changed_vars.update(self.varnames)
+            else:
+                diff = [var for var, new, old, threshold in zip(self.varnames, v, written,
+                                                                self._thresholds(m))
+                        if (new != old if threshold is None else abs(new - old) >= threshold)]
+                if not diff:
+                    self._checked(m)
+                    continue
+                changed_vars.update(diff)
+
+            changed_motors.append(m)
+            changed_values.append(v)
+
+        return changed_motors, changed_values, changed_vars
+
+    def written(self, motors, values, varnames=None):
+        """ Records the values written on the bus (only for the given registers). """
+        varnames = self.varnames if varnames is None else varnames
+        columns = [i for i, var in enumerate(self.varnames) if var in varnames]
+
+        for m, v in zip(motors, values):
+            old = self._written.get(m.id, v)
+            new = list(old)
+            for i in columns:
+                new[i] = v[i]
+            self._written[m.id] = tuple(new)
+            self._checked(m)
+
+    def _checked(self, motor):
+        # the values of the motor are up to date (for the versions seen by candidates)
+        versions = self._pending.pop(motor.id, None)
+        if versions is not None:
+            self._versions[motor.id] = versions
+
+    def _thresholds(self, motor):
+        if motor.id not in self._motor_thresholds:
+            self._motor_thresholds[motor.id] = [t(motor) if t is not None else None
+                                                for t in self.thresholds]
+        return self._motor_thresholds[motor.id]
+
+
 class DxlController(MotorsController):
     def __init__(self, io, motors, sync_freq, synchronous,
                  mode, regname, varname=None):
@@ -19,6 +132,12 @@ class DxlController(MotorsController):
         self.regname = regname
         self.varname = regname if varname is None else varname
 
+        # optional DxlStateStore backing the motors (see pypot.dynamixel.store)
+        self.store = None
+
+        # only the modified values are written (and all of them every second)
+        self._write_filter = _WriteFilter([self.varname], refresh_period=1.0)
+
         for m in motors:
             if mode == 'get':
                 m._read_synchronous[self.varname] = self.synchronous
@@ -27,7 +146,12 @@ class DxlController(MotorsController):
 
     @property
     def working_motors(self):
-        return [m for m in self.motors if not m._broken]
+        """ Motors which are not broken (nor skipped by the adaptive timeouts of the io, see :class:`~pypot.dynamixel.io.timeouts.AdaptiveTimeouts`). """
+        timeouts = getattr(self.io, 'timeouts', None)
+        if timeouts is None:
+            return [m for m in self.motors if not m._broken]
+
+        return [m for m in self.motors if not m._broken and timeouts.available(m.id)]
 
     @property
     def synced_motors(self):
@@ -59,6 +183,37 @@ class DxlController(MotorsController):
                 if self.mode == 'get' else
                 self.set_register(self.synced_motors))
 
+    @property
+    def refresh_period(self):
+        """ Period (in seconds) at which all the values are written again, even if they did not change (None to disable). """
+        return self._write_filter.refresh_period
+
+    @refresh_period.setter
+    def refresh_period(self, period):
+        self._write_filter.refresh_period = period
+
+    def refresh(self):
+        """ Forces all the values to be written again at the next update. """
+        self._write_filter.refresh()
+
+    def _stored(self, varname):
+        return self.store is not None and varname in self.store.arrays
+
+    def _get_values(self, motors, varname):
+        """ Returns the raw values of a register for the given motors. """
+        if self._stored(varname):
+            return self.store.get_raw(varname, self.store.indices(motors))
+
+        return [m.__dict__[varname] for m in motors]
+
+    def _set_values(self, motors, varname, values):
+        """ Sets the raw values of a register for the given motors. """
+        if self._stored(varname):
+            self.store.set_raw(varname, values, self.store.indices(motors))
+        else:
+            for m, val in zip(motors, values):
+                m.__dict__[varname] = val
+
     def get_register(self, motors, disable_sync_read=False):
         """ Gets the value from the specified register and sets it to the :class:`~pypot.dynamixel.motor.DxlMotor`. """
         if not motors:
@@ -74,8 +229,7 @@ class DxlController(MotorsController):
         if not values:
             return False
 
-        for m, val in zip(motors, values):
-            m.__dict__[self.varname] = val
+        self._set_values(motors, self.varname, values)
 
         for m in motors:
             m._read_synced[self.varname].done()
@@ -86,10 +240,16 @@ class DxlController(MotorsController):
         """ Gets the value from :class:`~pypot.dynamixel.motor.DxlMotor` and sets it to the specified register. """
         if not motors:
             return
-        ids = [m.id for m in motors]
 
-        values = (m.__dict__[self.varname] for m in motors)
-        getattr(self.io, 'set_{}'.format(self.regname))(dict(zip(ids, values)))
+        changed = self._write_filter.candidates(motors)
+        if changed:
+            values = [(v, ) for v in self._get_values(changed, self.varname)]
+            changed, values, _ = self._write_filter.changed(changed, values)
+
+        if changed:
+            ids = [m.id for m in changed]
+            getattr(self.io, 'set_{}'.format(self.regname))(dict(zip(ids, (v for v, in values))))
+            self._write_filter.written(changed, values)
 
         for m in motors:
             m._write_synced[self.varname].done()
@@ -128,25 +288,127 @@ class AngleLimitRegisterController(DxlController):
         ids = [m.id for m in motors]
         values = self.io.get_angle_limit(ids)
 
-        for m, val in zip(motors, values):
-            m.__dict__['lower_limit'], m.__dict__['upper_limit'] = val
+        if values:
+            lower_limits, upper_limits = zip(*values)
+            self._set_values(motors, 'lower_limit', lower_limits)
+            self._set_values(motors, 'upper_limit', upper_limits)
 
         for m in motors:
             for var in ['lower_limit', 'upper_limit']:
                 m._read_synced[var].done()
 
 
+class BulkReadDxlController(DxlController):
+    """ Reads several registers of the motors in a single bulk read transaction.
+
+        This replaces one :class:`DxlController` (and thus one bus round trip) per register by a single request for all the motors.
+
+        .. note:: The BULK_READ instruction is only supported by the MX motors (protocol v1) and by the protocol v2 motors.
+
+        """
+    def __init__(self, io, motors, sync_freq, synchronous, regnames):
+        DxlController.__init__(self, io, motors, sync_freq,
+                               synchronous, 'get', regnames[0])
+
+        self.varnames = list(regnames)
+        for m in motors:
+            for var in self.varnames:
+                m._read_synchronous[var] = self.synchronous
+
+    @property
+    def synced_motors(self):
+        motors = self.working_motors
+
+        if self.synchronous:
+            motors = [m for m in motors
+                      if any(m._read_synced[var].needed for var in self.varnames)]
+
+        return motors
+
+    def get_register(self, motors, disable_sync_read=False):
+        if not motors:
+            return False
+
+        values = self.io.get_bulk({m.id: self.varnames for m in motors})
+
+        if not values:
+            return False
+
+        for var in self.varnames:
+            self._set_values(motors, var, [values[m.id][var] for m in motors])
+
+        for m in motors:
+            for var in self.varnames:
+                m._read_synced[var].done()
+
+        return True
+
+
+def _pos_speed_load_write_filter():
+    # changes smaller than half a unit would be rounded to the same raw value
+    return _WriteFilter(['goal_position', 'moving_speed', 'torque_limit'],
+                        [lambda m: conv.position_resolution(m.model) / 2,
+                         lambda m: conv.speed_resolution(m.model) / 2,
+                         lambda m: conv.torque_resolution(m.model) / 2],
+                        refresh_period=1.0,
+                        # force control motors are only written when their values change
+                        refreshed=lambda m: not getattr(m, 'force_control_enable', False))
+
+
+def _pos_speed_load_writes(controller, motors):
+    """ Plans the writes of the goal position, moving speed and torque limit of the motors of a controller (see :meth:`PosSpeedLoadDxlController.set_goal_position_speed_load`).
+
+        :return: the torque changes {id: enabled} and the write to send (None if nothing changed): the name of the io method, its {id: value} argument and the arguments of the write filter :meth:`_WriteFilter.written`
+
+        """
+    # the motors may change from one update to the other (e.g. skipped motors)
+    change_torque = {}
+    for m in motors:
+        t = not m.compliant
+        if t != controller._old_torques.get(m.id):
+            change_torque[m.id] = t
+    controller._old_torques.update(change_torque)
+
+    # the goals of the motors turned stiff are always sent
+    for m in motors:
+        if change_torque.get(m.id):
+            controller._write_filter.forget(m)
+
+    rigid_motors = controller._write_filter.candidates([m for m in motors if not m.compliant])
+    if not rigid_motors:
+        return change_torque, None
+
+    values = zip(controller._get_values(rigid_motors, 'goal_position'),
+                 controller._get_values(rigid_motors, 'moving_speed'),
+                 controller._get_values(rigid_motors, 'torque_limit'))
+    rigid_motors, values, changed = controller._write_filter.changed(rigid_motors, values)
+    if not rigid_motors:
+        return change_torque, None
+
+    ids = tuple(m.id for m in rigid_motors)
+
+    if changed == {'goal_position'}:
+        return change_torque, ('set_goal_position',
+                               dict(zip(ids, (p for p, _, _ in values))),
+                               (rigid_motors, values, changed))
+
+    return change_torque, ('set_goal_position_speed_load',
+                           dict(zip(ids, values)),
+                           (rigid_motors, values))
+
+
 class PosSpeedLoadDxlController(DxlController):
     def __init__(self, io, motors, sync_freq):
         DxlController.__init__(self, io, motors, sync_freq,
                                False, 'get', 'present_position')
 
+        self._write_filter = _pos_speed_load_write_filter()
+
     def setup(self):
         torques = self.io.is_torque_enabled(self.ids)
         for m, c in zip(self.working_motors, torques):
             m.compliant = not c
-        self._old_torques = torques
-        self._old_goals = {m.id: 0.0 for m in self.motors}
+        self._old_torques = dict(zip(self.ids, torques))
 
         try:
             values = self.io.get_goal_position_speed_load(self.ids)
@@ -154,10 +416,10 @@ class PosSpeedLoadDxlController(DxlController):
         except ValueError:
             raise DxlError("Couldn't initialize pos/speed/load sync loop!")
 
-        for m, p, s, l in zip(self.working_motors, positions, speeds, loads):
-            m.__dict__['goal_position'] = p
-            m.__dict__['moving_speed'] = s
-            m.__dict__['torque_limit'] = l
+        motors = self.working_motors
+        self._set_values(motors, 'goal_position', positions)
+        self._set_values(motors, 'moving_speed', speeds)
+        self._set_values(motors, 'torque_limit', loads)
 
     def update(self):
         self.get_present_position_speed_load(self.working_motors)
@@ -171,40 +433,34 @@ class PosSpeedLoadDxlController(DxlController):
             logger.warning('Timeout when getting pos/speed/load from %s', ids)
             return
 
-        positions, speeds, loads = zip(*values)
+        if self._stored('present_position'):
+            # single vectorized assignment for the three registers
+            idx = self.store.indices(motors)
+            positions, speeds, loads = numpy.asarray(values, dtype=float).T
+            self.store.arrays['present_position'][idx] = positions
+            self.store.arrays['present_speed'][idx] = speeds
+            self.store.arrays['present_load'][idx] = loads
 
-        for m, p, s, l in zip(motors, positions, speeds, loads):
-            m.__dict__['present_position'] = p
-            m.__dict__['present_speed'] = s
-            m.__dict__['present_load'] = l
-
-    def set_goal_position_speed_load(self, motors):
-        change_torque = {}
-        torques = [not m.compliant for m in motors]
-        for m, t, old_t in zip(motors, torques, self._old_torques):
-            if t != old_t:
-                change_torque[m.id] = t
-        self._old_torques = torques
-        if change_torque:
-            self.io._set_torque_enable(change_torque)
+        else:
+            positions, speeds, loads = zip(*values)
 
-        rigid_motors = []
+            for m, p, s, l in zip(motors, positions, speeds, loads):
+                m.__dict__['present_position'] = p
+                m.__dict__['present_speed'] = s
+                m.__dict__['present_load'] = l
 
-        for m in motors:
-            # Filter force control motors - only update values if goal_position has changed
-            if getattr(m, "force_control_enable", False) and not m.compliant and self._old_goals[m.id] != m.__dict__['goal_position']:
-                rigid_motors += [m]
-                self._old_goals[m.id] = m.__dict__['goal_position']
-            # Do not filter motors without force control
-            elif not m.compliant:
-                rigid_motors += [m]
+        if self.snapshots is not None:
+            self.snapshots.publish(motors, {'present_position': positions,
+                                            'present_speed': speeds,
+                                            'present_load': loads})
 
-        ids = tuple(m.id for m in rigid_motors)
+    def set_goal_position_speed_load(self, motors):
+        change_torque, write = _pos_speed_load_writes(self, motors)
 
-        if not ids:
-            return
+        if change_torque:
+            self.io._set_torque_enable(change_torque)
 
-        values = ((m.__dict__['goal_position'],
-                   m.__dict__['moving_speed'],
-                   m.__dict__['torque_limit']) for m in rigid_motors)
-        self.io.set_goal_position_speed_load(dict(zip(ids, values)))
+        if write is not None:
+            method, values, written = write
+            getattr(self.io, method)(values)
+            self._write_filter.written(*written)
@@ -10,12 +10,16 @@
 
     .. note:: If the control is readonly you only need to write the dxl_to_si conversion.
 
+    Some conversions also have a batch version (see :func:`batch_conversion`) which converts the values of several motors at once using numpy arrays. They take the values and the per-motor parameters of the models (see :func:`model_parameters`) instead of the models.
+
     """
 
 import numpy
 import itertools
 
 from enum import Enum
+from functools import lru_cache
+from collections import namedtuple
 
 # MARK: - Position
 
@@ -55,34 +59,33 @@ velocity = {  # in degree/s
 }
 
 
+def _position_range(model):
+    for family in ('MX', 'SR', 'EX'):
+        if model.startswith(family):
+            return position_range[family]
+    return position_range['*']
+
+
 def dxl_to_degree(value, model):
-    determined_model = '*'
-    if model.startswith('MX'):
-        determined_model = 'MX'
-    elif model.startswith('SR'):
-        determined_model = 'SR'
-    elif model.startswith('EX'):
-        determined_model = 'EX'
-    max_pos, max_deg = position_range[determined_model]
+    max_pos, max_deg = _position_range(model)
 
     return round(((max_deg * float(value)) / (max_pos - 1)) - (max_deg / 2), 2)
 
 
 def degree_to_dxl(value, model):
-    determined_model = '*'
-    if model.startswith('MX'):
-        determined_model = 'MX'
-    elif model.startswith('SR'):
-        determined_model = 'SR'
-    elif model.startswith('EX'):
-        determined_model = 'EX'
-    max_pos, max_deg = position_range[determined_model]
+    max_pos, max_deg = _position_range(model)
 
     pos = int(round((max_pos - 1) * ((max_deg / 2 + float(value)) / max_deg), 0))
     pos = min(max(pos, 0), max_pos - 1)
 
     return pos
 
+
+def position_resolution(model):
+    """ Returns the size (in degrees) of one encoder tick. """
+    max_pos, max_deg = _position_range(model)
+    return max_deg / (max_pos - 1)
+
 # MARK: - Speed
 
 # Speed factor (RPM per least significant bit)
@@ -111,6 +114,11 @@ def speed_to_dxl(value, model):
 
     return int(round(direction + abs(value) / (6 * speed_factor), 0))
 
+
+def speed_resolution(model):
+    """ Returns the size (in degrees per second) of one speed unit. """
+    return 6 * _speed_factor(model)
+
 # MARK: - Torque
 
 
@@ -122,6 +130,11 @@ def torque_to_dxl(value, model):
     return int(round(value * 10.23, 0))
 
 
+def torque_resolution(model):
+    """ Returns the size (in % of the max torque) of one torque unit. """
+    return 1 / 10.23
+
+
 def dxl_to_load(value, model):
     cw, load = divmod(value, 1024)
     direction = -2 * cw + 1
@@ -398,3 +411,152 @@ def dxl_code_all(value, length, nb_elem):
         return list(itertools.chain(*(dxl_code(v, length) for v in value)))
     else:
         return dxl_code(value, length)
+
+# MARK: - Multi-elements registers
+
+
+class elementwise(object):
+    """ Conversion of a multi-elements register applying one conversion per element.
+
+        e.g. elementwise(dxl_to_degree, dxl_to_speed) converts (position, speed) values.
+
+        """
+    def __init__(self, *conversions):
+        self.conversions = conversions
+
+    def __call__(self, value, model):
+        return tuple(f(v, model) for f, v in zip(self.conversions, value))
+
+# MARK: - Batch conversions
+
+
+ModelParameters = namedtuple('ModelParameters', ('max_pos', 'max_deg', 'speed_factor'))
+
+
+@lru_cache(maxsize=64)
+def model_parameters(models):
+    """ Returns the per-motor parameters (as arrays) used by the batch conversions.
+
+        :param tuple models: model of each motor
+
+        """
+    max_pos, max_deg = numpy.array([_position_range(m) for m in models], dtype=float).reshape(-1, 2).T
+    speed_factor = numpy.array([_speed_factor(m) for m in models], dtype=float)
+
+    return ModelParameters(max_pos, max_deg, speed_factor)
+
+
+def dxl_to_degree_array(values, params):
+    return numpy.round(params.max_deg * values / (params.max_pos - 1) - params.max_deg / 2, 2)
+
+
+def degree_to_dxl_array(values, params):
+    pos = numpy.rint((params.max_pos - 1) * ((params.max_deg / 2 + values) / params.max_deg))
+    return numpy.clip(pos, 0, params.max_pos - 1).astype(int)
+
+
+def dxl_to_speed_array(values, params):
+    cw, speed = numpy.divmod(values, 1024)
+    return (1 - 2 * cw) * (speed * params.speed_factor) * 6
+
+
+def speed_to_dxl_array(values, params):
+    max_value = 1023 * params.speed_factor * 6
+    values = numpy.clip(values, -max_value, max_value)
+    direction = numpy.where(values < 0, 1024, 0)
+
+    return numpy.rint(direction + numpy.abs(values) / (6 * params.speed_factor)).astype(int)
+
+
+def dxl_to_torque_array(values, params):
+    return numpy.round(values / 10.23, 1)
+
+
+def torque_to_dxl_array(values, params):
+    return numpy.rint(values * 10.23).astype(int)
+
+
+def dxl_to_load_array(values, params):
+    cw, load = numpy.divmod(values, 1024)
+    return dxl_to_torque_array(load, params) * (1 - 2 * cw)
+
+
+def dxl_to_voltage_array(values, params):
+    return values * 0.1
+
+
+def voltage_to_dxl_array(values, params):
+    return (values * 10).astype(int)
+
+
+def dxl_to_temperature_array(values, params):
+    return values.astype(float)
+
+
+def temperature_to_dxl_array(values, params):
+    return values.astype(int)
+
+
+def dxl_to_bool_array(values, params):
+    return values.astype(bool)
+
+
+def bool_to_dxl_array(values, params):
+    return values.astype(int)
+
+
+_batch_conversions = {
+    dxl_to_degree: dxl_to_degree_array,
+    degree_to_dxl: degree_to_dxl_array,
+    dxl_to_speed: dxl_to_speed_array,
+    speed_to_dxl: speed_to_dxl_array,
+    dxl_to_torque: dxl_to_torque_array,
+    torque_to_dxl: torque_to_dxl_array,
+    dxl_to_load: dxl_to_load_array,
+    dxl_to_voltage: dxl_to_voltage_array,
+    voltage_to_dxl: voltage_to_dxl_array,
+    dxl_to_temperature: dxl_to_temperature_array,
+    temperature_to_dxl: temperature_to_dxl_array,
+    dxl_to_bool: dxl_to_bool_array,
+    bool_to_dxl: bool_to_dxl_array,
+}
+
+
+@lru_cache(maxsize=None)
+def batch_conversion(conversion):
+    """ Returns the batch version of a conversion (None if it has none).
+
+        The batch version takes an array of values (with one row per motor for multi-elements registers) and the :func:`model_parameters` of the motors.
+
+        """
+    if isinstance(conversion, elementwise):
+        batches = [batch_conversion(c) for c in conversion.conversions]
+        if None in batches:
+            return None
+
+        def convert_columns(values, params):
+            return numpy.column_stack([b(values[:, i], params)
+                                       for i, b in enumerate(batches)])
+        return convert_columns
+
+    return _batch_conversions.get(conversion)
+
+
+def convert_all(conversion, values, models):
+    """ Converts the values of several motors, in one numpy operation when the conversion has a batch version.
+
+        :param conversion: scalar conversion (e.g. :func:`dxl_to_degree`)
+        :param list values: one value per motor
+        :param tuple models: model of each motor
+        :return: list of the converted values (tuples for the multi-elements registers)
+
+        """
+    batch = batch_conversion(conversion)
+    if batch is None:
+        return [conversion(v, m) for v, m in zip(values, models)]
+
+    converted = batch(numpy.asarray(values, dtype=float),
+                      model_parameters(tuple(models))).tolist()
+
+    return ([tuple(v) for v in converted] if converted and isinstance(converted[0], list)
+            else converted)
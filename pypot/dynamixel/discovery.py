@@ -0,0 +1,137 @@
+""" Fast discovery of the motors connected to the serial ports.
+
+    All the ports are scanned concurrently (one thread per port), and on protocol v2 a single broadcast ping finds all the motors of a bus.
+
+    The results are cached by USB serial number of the adapter (or by port name if it has none), so a device keeps its cached motors when its port name changes. A cached result is only reused after checking that its motors still answer.
+
+    """
+import logging
+import threading
+
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import serial.tools.list_ports
+
+from .io import DxlIO, Dxl320IO
+from .io.abstract_io import DxlError
+
+
+logger = logging.getLogger(__name__)
+
+PortScan = namedtuple('PortScan', ('io_cls', 'ids'))
+PortScan.__doc__ = """ Result of the scan of a port.
+
+    :param io_cls: class of the io able to talk to the motors (None if no motor was found)
+    :param list ids: ids of the motors found
+
+    """
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def device_key(port):
+    """ Returns the key identifying the device behind a port: its USB serial number if any, the port itself otherwise. """
+    for p in serial.tools.list_ports.comports():
+        if p.device == port and p.serial_number:
+            return p.serial_number
+
+    return port
+
+
+def clear_cache():
+    """ Forgets all the scans results. """
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cached_scan(key, ids):
+    with _cache_lock:
+        cached = _cache.get(key)
+
+    if cached is None:
+        return None
+
+    io_cls, scanned, found = cached
+    # Only usable if all the requested ids were scanned
+    if not set(ids) <= scanned:
+        return None
+
+    return PortScan(io_cls, [id for id in ids if id in found])
+
+
+def scan_port(port, ids=range(254), io_classes=(DxlIO, Dxl320IO),
+              timeout=None, use_cache=True):
+    """ Finds the motors connected to a port.
+
+        Each io class (i.e. each protocol) is tried in turn until some motors answer.
+
+        :param str port: the serial port to scan
+        :param list ids: ids to look for
+        :param tuple io_classes: io classes to try
+        :param float timeout: time to wait for each ping (defaults to the timeout of the io, shorter timeouts speed up the scan but may miss motors behind adapters with a high latency)
+        :param bool use_cache: whether or not to reuse (after validation) the previous scan of the device
+        :return: a :class:`PortScan`
+
+        """
+    ids = list(ids)
+    key = device_key(port)
+
+    if use_cache:
+        cached = _cached_scan(key, ids)
+
+        if cached is not None and cached.io_cls in io_classes:
+            try:
+                with cached.io_cls(port) as io:
+                    valid = io.scan(cached.ids, timeout=timeout) == cached.ids
+            except DxlError:
+                valid = False
+
+            if valid:
+                logger.info('Reusing the scan of %s (ids %s)', port, cached.ids)
+                return cached
+
+    for io_cls in io_classes:
+        try:
+            with io_cls(port) as io:
+                found = io.scan(ids, timeout=timeout)
+        except DxlError:
+            logger.warning('DxlError on port {}'.format(port))
+            continue
+
+        if found:
+            with _cache_lock:
+                _cache[key] = (io_cls, set(ids), set(found))
+            return PortScan(io_cls, found)
+
+    with _cache_lock:
+        _cache.pop(key, None)
+
+    return PortScan(None, [])
+
+
+def discover(ports=None, ids=range(254), io_classes=(DxlIO, Dxl320IO),
+             timeout=None, use_cache=True):
+    """ Scans several ports concurrently (see :func:`scan_port`).
+
+        :param list ports: the ports to scan (defaults to all the available free ports)
+        :param float timeout: time to wait for each ping (defaults to the timeout of the ios)
+        :return: an OrderedDict {port: :class:`PortScan`} (in the ports order)
+
+        """
+    if ports is None:
+        from . import get_available_ports
+        ports = get_available_ports(only_free=True)
+
+    ports = list(ports)
+    ids = list(ids)
+
+    if not ports:
+        return OrderedDict()
+
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        scans = executor.map(lambda port: scan_port(port, ids, io_classes, timeout, use_cache),
+                             ports)
+
+        return OrderedDict(zip(ports, scans))
@@ -0,0 +1,187 @@
+import os
+import json
+import logging
+
+from collections import OrderedDict
+
+from ..utils.appdirs import user_cache_dir
+from .conversion import dxl_decode_all, dxl_to_model
+from .discovery import device_key
+from .io.abstract_io import DxlError
+
+
+logger = logging.getLogger(__name__)
+
+
+class EepromCache(object):
+    """ Versioned on-disk cache of the EEPROM registers of the motors (model, firmware, return delay time, angle limit and control mode).
+
+        The entries are kept per device (USB serial number of the adapter, see :func:`~pypot.dynamixel.discovery.device_key`) and per motor id. They are checked at each use (see :meth:`read`) with a cheap read of the model number and firmware version of the motors (a single sync read when the io uses them, one short read per motor otherwise): the cached registers of a motor are used as long as they match. Only the unknown motors, or the ones which were replaced, have their EEPROM block read (with a single bulk read when the motors support it) and decoded.
+
+        .. note:: The EEPROM registers written by pypot invalidate the cache (see :meth:`invalidate`). If they are changed by another tool, the cache file has to be removed.
+
+        The cache is stored as json in the user cache directory (e.g. ~/.cache/pypot/eeprom_cache.json on Linux). A file written with another version of the format is ignored.
+
+        """
+    version = 1
+    filename = 'eeprom_cache.json'
+
+    # Size of the block holding the cached registers (at the beginning of the control table)
+    block_length = {'v1': 10, 'v2': 12}
+
+    # Size of the model number and firmware version (at the beginning of the block)
+    identity_length = 3
+
+    def __init__(self, path=None):
+        """
+        :param str path: path of the cache file (defaults to the user cache directory)
+
+        """
+        self.path = path if path else os.path.join(user_cache_dir('pypot'), self.filename)
+
+        self._devices = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            logger.info('Ignoring the EEPROM cache %s (format version %s)',
+                        self.path, data.get('version') if isinstance(data, dict) else None)
+            return {}
+
+        return data['devices']
+
+    def save(self):
+        """ Writes the cache on disk (if it changed). """
+        if not self._dirty:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Atomic replace, so a crash never leaves a truncated cache
+        tmp = '{}.tmp'.format(self.path)
+        with open(tmp, 'w') as f:
+            json.dump({'version': self.version, 'devices': self._devices}, f)
+        os.replace(tmp, self.path)
+
+        self._dirty = False
+
+    def _device(self, dxl_io):
+        return '{}:{}'.format(dxl_io._protocol.name, device_key(dxl_io.port))
+
+    def read(self, dxl_io, ids):
+        """ Returns the EEPROM registers of the specified motors.
+
+            The models and control modes are also given to the io, so it does not query them again.
+
+            :return: an OrderedDict {id: {'model', 'firmware', 'return_delay_time', 'angle_limit', 'control_mode'}} (the motors which did not answer are missing)
+
+            """
+        entries = self._devices.setdefault(self._device(dxl_io), {})
+
+        cached = [motor_id for motor_id in ids if str(motor_id) in entries]
+        identities = self._read_identities(dxl_io, cached)
+
+        # the motors which did not answer are skipped
+        to_read = [motor_id for motor_id in ids
+                   if motor_id not in cached or
+                   (motor_id in identities and
+                    identities[motor_id] != entries[str(motor_id)]['raw'][:self.identity_length])]
+        blocks = self._read_blocks(dxl_io, to_read) if to_read else {}
+
+        res = OrderedDict()
+        for motor_id in ids:
+            if motor_id in blocks:
+                entry = {'raw': blocks[motor_id],
+                         'registers': self._decode(dxl_io, blocks[motor_id])}
+                entries[str(motor_id)] = entry
+                self._dirty = True
+            elif motor_id in identities and motor_id not in to_read:
+                entry = entries[str(motor_id)]
+            else:
+                continue
+
+            registers = dict(entry['registers'])
+            registers['angle_limit'] = tuple(registers['angle_limit'])
+            res[motor_id] = registers
+
+            dxl_io._known_models[motor_id] = registers['model']
+            dxl_io._known_mode[motor_id] = registers['control_mode']
+
+        return res
+
+    def invalidate(self, dxl_io, ids):
+        """ Forgets the specified motors (e.g. after writing their EEPROM). """
+        entries = self._devices.get(self._device(dxl_io), {})
+
+        for motor_id in ids:
+            if entries.pop(str(motor_id), None) is not None:
+                self._dirty = True
+
+    def _read_identities(self, dxl_io, ids):
+        length = self.identity_length
+
+        if dxl_io._sync_read and len(ids) > 1:
+            try:
+                _, values = dxl_io._read_raw(ids, 0, length, None)
+            except DxlError:
+                values = ()
+
+            if len(values) == len(ids) * length:
+                return OrderedDict((motor_id, list(values[i * length:(i + 1) * length]))
+                                   for i, motor_id in enumerate(ids))
+
+        # some motors did not answer to the sync read
+        return self._read_each(dxl_io, ids, length)
+
+    def _read_blocks(self, dxl_io, ids):
+        length = self.block_length[dxl_io._protocol.name]
+
+        try:
+            blocks = dxl_io.bulk_read([(motor_id, 0, length) for motor_id in ids],
+                                      error_handler=None)
+            return OrderedDict((motor_id, list(b)) for motor_id, b in zip(ids, blocks))
+        except DxlError:
+            logger.info('Bulk read not supported on %s, reading the motors one by one',
+                        dxl_io.port)
+
+        return self._read_each(dxl_io, ids, length)
+
+    def _read_each(self, dxl_io, ids, length):
+        blocks = OrderedDict()
+        for motor_id in ids:
+            try:
+                sp = dxl_io._send_packet(dxl_io._protocol.DxlReadDataPacket(motor_id, 0, length))
+            except DxlError:  # probably a broken motor so we just skip
+                continue
+
+            blocks[motor_id] = list(sp.parameters)
+
+        return blocks
+
+    def _decode(self, dxl_io, block):
+        model = dxl_to_model(dxl_decode_all(block[0:2], 1))
+
+        registers = {'model': model}
+        for name in ('firmware', 'return delay time', 'angle limit'):
+            c = dxl_io._controls_by_name[name]
+            v = dxl_decode_all(block[c.address:c.address + c.length * c.nb_elem], c.nb_elem)
+            registers[name.replace(' ', '_')] = c.dxl_to_si(v, model)
+
+        if 'control mode' in dxl_io._controls_by_name:
+            c = dxl_io._controls_by_name['control mode']
+            registers['control_mode'] = c.dxl_to_si(block[c.address], model)
+        else:
+            raw_limits = dxl_decode_all(block[6:10], 2)
+            registers['control_mode'] = 'wheel' if raw_limits == (0, 0) else 'joint'
+
+        registers['angle_limit'] = list(registers['angle_limit'])
+
+        return registers
@@ -6,11 +6,15 @@ import operator
 import itertools
 import threading
 
+import pypot.utils.pypot_time as time
+
 from collections import namedtuple, OrderedDict
 from contextlib import contextmanager
 
-from ..conversion import (dxl_code_all, dxl_decode_all, decode_error,
-                          dxl_to_model)
+from ..conversion import dxl_decode_all, decode_error, dxl_to_model, convert_all
+from ..protocol.parser import DxlStatusPacketParser
+from ..protocol.template import DxlPacketTemplate
+from .timeouts import AdaptiveTimeouts
 
 
 logger = logging.getLogger(__name__)
@@ -37,8 +41,12 @@ class AbstractDxlIO(object):
 
     __used_ports = set()
     __controls = []
+    _controls_by_name = {}
     _protocol = None
 
+    # Maximum number of precompiled packets kept by each io
+    max_packet_templates = 128
+
     @classmethod
     def get_used_ports(cls):
         return list(cls.__used_ports)
@@ -49,7 +57,8 @@ class AbstractDxlIO(object):
                  port, baudrate=1000000, timeout=0.05,
                  use_sync_read=False,
                  error_handler_cls=None,
-                 convert=True):
+                 convert=True,
+                 adaptive_timeouts=False):
         """ At instantiation, it opens the serial port and sets the communication parameters.
 
             :param string port: the serial port to use (e.g. Unix (/dev/tty...), Windows (COM...)).
@@ -59,6 +68,7 @@ class AbstractDxlIO(object):
             :param error_handler: set a handler that will receive the different errors
             :type error_handler: :py:class:`~pypot.dynamixel.error.DxlErrorHandler`
             :param bool convert: whether or not convert values to units expressed in the standard system
+            :param bool adaptive_timeouts: whether or not to adapt the timeout of each motor to its measured round-trip time (see :class:`~pypot.dynamixel.io.timeouts.AdaptiveTimeouts`), timeout is then the maximum timeout
 
             :raises: :py:exc:`~pypot.dynamixel.io.DxlError` if the port is already used.
 
@@ -72,6 +82,17 @@ class AbstractDxlIO(object):
 
         self._serial_lock = threading.Lock()
 
+        self._packet_templates = OrderedDict()
+        self._packet_templates_lock = threading.Lock()
+
+        # Received data are kept in a persistent buffer between reads.
+        # The input is only flushed when stale data may be waiting
+        # (e.g. late answers after a timeout).
+        self._parser = DxlStatusPacketParser(self._protocol)
+        self._stale_input = True
+
+        self.timeouts = AdaptiveTimeouts(timeout) if adaptive_timeouts else None
+
         self.open(port, baudrate, timeout)
 
     def __enter__(self):
@@ -106,8 +127,6 @@ class AbstractDxlIO(object):
         # This is  used to circumvent a bug with the driver for the USB2AX on Mac.
         # Warning: If no motor is connected on the bus, this will run forever!!!
         import platform
-        # import time
-        import pypot.utils.pypot_time as time
 
         for i in range(max_recursion):
             self._known_models.clear()
@@ -128,8 +147,12 @@ class AbstractDxlIO(object):
                     self._serial.close()
 
                 self._serial = serial.Serial(port, baudrate, timeout=timeout, write_timeout=timeout)
+                self._timeout = timeout
                 self.__used_ports.add(port)
 
+                if self.timeouts is not None:
+                    self.timeouts.max_timeout = timeout
+
             if (platform.system() == 'Darwin' and
                     self._protocol.name == 'v1' and self._sync_read):
                 if not self.ping(self._protocol.DxlBroadcast):
@@ -163,6 +186,9 @@ class AbstractDxlIO(object):
             self._serial.flushInput()
             self._serial.flushOutput()
 
+            self._parser.clear()
+            self._stale_input = False
+
     def __force_lock(self, condition):
         return with_True() if condition else False
 
@@ -189,7 +215,7 @@ class AbstractDxlIO(object):
     @property
     def timeout(self):
         """ Timeout used by the :class:`~pypot.dynamixel.io.DxlIO`. If set, will re-open a new connection. """
-        return self._serial.timeout
+        return self._timeout
 
     @timeout.setter
     def timeout(self, value):
@@ -202,23 +228,80 @@ class AbstractDxlIO(object):
 
     # MARK: - Motor discovery
 
-    def ping(self, id):
+    def ping(self, id, timeout=None):
         """ Pings the motor with the specified id.
 
+            :param float timeout: time to wait for the answer (defaults to the io timeout)
+
             .. note:: The motor id should always be included in [0, 253]. 254 is used for broadcast.
 
             """
         pp = self._protocol.DxlPingPacket(id)
 
         try:
-            self._send_packet(pp, error_handler=None)
+            self._send_packet(pp, error_handler=None, timeout=timeout)
             return True
         except DxlTimeoutError:
             return False
 
-    def scan(self, ids=range(254)):
-        """ Pings all ids within the specified list, by default it finds all the motors connected to the bus. """
-        return [id for id in ids if self.ping(id)]
+    # Time for a motor to answer a broadcast ping after the previous id (return delay time and status packet)
+    broadcast_ping_slot = 0.003
+
+    def broadcast_ping(self, timeout=None, max_id=253):
+        """ Finds all the motors connected to the bus with a single ping (protocol v2 only).
+
+            All the motors answer to a broadcast ping one after the other, in the order of their ids. So, as the Robotis SDK does, the answers are read during a window sized for the answers of all the ids up to max_id (the gaps between sparse ids do not end the read).
+
+            :param float timeout: time to wait for the first answer, added to the window (defaults to the io timeout)
+            :param int max_id: highest id to wait for
+            :return: the sorted list of the ids which answered
+
+            """
+        if self._protocol.name != 'v2':
+            raise DxlError('broadcast ping requires the protocol v2')
+
+        timeout = self._timeout if timeout is None else timeout
+        pp = self._protocol.DxlPingPacket(self._protocol.DxlBroadcast)
+        answer_time = self._protocol.status_packet_size(pp) * 10.0 / self.baudrate
+        deadline = (time.monotonic() + timeout +
+                    (max_id + 1) * (self.broadcast_ping_slot + answer_time))
+        ids = set()
+
+        with self._serial_lock:
+            try:
+                sp = self.__real_send(pp, True, True, deadline - time.monotonic())
+                while True:
+                    ids.add(sp.id)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # the answers of higher ids are dropped at the next send
+                        self._stale_input = True
+                        break
+                    self.__set_read_timeout(remaining)
+                    sp = self.__real_read(pp, _force_lock=True)
+            except DxlTimeoutError:
+                pass
+
+        return sorted(ids)
+
+    def scan(self, ids=range(254), timeout=None):
+        """ Pings all ids within the specified list, by default it finds all the motors connected to the bus.
+
+            On protocol v2, a single broadcast ping is used first, the ids which did not answer are then pinged one by one (each id is pinged in turn if the answers can not be parsed, e.g. because two motors share the same id).
+
+            :param float timeout: time to wait for each answer (defaults to the io timeout)
+
+            """
+        ids = list(ids)
+        found = []
+
+        if self._protocol.name == 'v2' and ids:
+            try:
+                found = self.broadcast_ping(timeout, max(ids))
+            except DxlCommunicationError:
+                logger.info('Could not parse the answers to the broadcast ping, falling back to single pings')
+
+        return [id for id in ids if id in found or self.ping(id, timeout)]
 
     # MARK: - Specific Getter / Setter
 
@@ -320,39 +403,155 @@ class AbstractDxlIO(object):
 
             ..note:: This function requires the model for each motor to be known. Querring this additional information might add some extra delay.
 
+            The motors of the same model are read together and decoded at once (see :func:`~pypot.dynamixel.control_table.read_control_tables`).
+
             """
-        error_handler = kwargs['error_handler'] if ('error_handler' in kwargs) else self._error_handler
+        from ..control_table import read_control_tables
+
         convert = kwargs['convert'] if ('convert' in kwargs) else self._convert
 
-        bl = ('goal position speed load', 'present position speed load')
-        controls = [c for c in self._AbstractDxlIO__controls if c.name not in bl]
+        tables = read_control_tables(self, ids, convert)
+        return tuple(tables[id] for id in ids if id in tables)
+
+    def bulk_read(self, id_address_length, **kwargs):
+        """ Reads arbitrary blocks of the control table of several motors in a single bulk read transaction.
 
-        res = []
+            :param list id_address_length: list of (id, address, length) to read (each id can only appear once)
+            :return: the raw bytes read for each block (in the request order) or an empty tuple if the transaction failed
 
-        for id, model in zip(ids, self.get_model(ids)):
-            controls = [c for c in controls if model in c.models]
+            """
+        if not id_address_length:
+            return ()
+
+        error_handler = kwargs['error_handler'] if ('error_handler' in kwargs) else self._error_handler
+
+        id_address_length = tuple(tuple(x) for x in id_address_length)
+        ids = [motor_id for motor_id, _, _ in id_address_length]
+        if len(set(ids)) != len(ids):
+            raise ValueError('each id can only be read once per bulk read.')
+
+        rp = self._packet_template(self._protocol.DxlBulkReadPacket, id_address_length)
+
+        values = []
+        try:
+            with self._serial_lock:
+                sp = self._send_packet(rp, _force_lock=True)
 
-            controls = sorted(controls, key=lambda c: c.address)
+                for i, (motor_id, _, length) in enumerate(id_address_length):
+                    if i > 0:
+                        sp = self.__real_read(rp, _force_lock=True)
 
-            address = controls[0].address
-            length = controls[-1].address + controls[-1].nb_elem * controls[-1].length
+                    # The motors answer in the request order, so an unexpected
+                    # status packet means that the transaction failed.
+                    if sp.id != motor_id or len(sp.parameters) != length:
+                        raise DxlCommunicationError(self,
+                                                    'unexpected status packet {}'.format(sp),
+                                                    rp)
 
-            rp = self._protocol.DxlReadDataPacket(id, address, length)
-            sp = self._send_packet(rp, error_handler=error_handler)
+                    if error_handler and sp.error:
+                        self._handle_status_errors(sp, rp, error_handler)
+
+                    values.append(sp.parameters)
+
+        except DxlTimeoutError:
+            e = DxlTimeoutError(self, rp, ids[len(values):])
+            if not error_handler:
+                raise e
+            error_handler.handle_timeout(e)
+            return ()
+
+        except DxlCommunicationError as e:
+            if not error_handler:
+                raise e
+            error_handler.handle_communication_error(e)
+            return ()
+
+        return tuple(values)
+
+    def read_blocks(self, ids, address, length, **kwargs):
+        """ Reads the same block of the control table of several motors (with a single sync read if enabled, one read per motor otherwise).
+
+            :param list ids: ids of the motors to read
+            :param int address: address of the block
+            :param int length: length of the block (in bytes)
+            :return: the raw bytes read for each motor or an empty tuple if a read failed
+
+            """
+        if not ids:
+            return ()
+
+        error_handler = kwargs['error_handler'] if ('error_handler' in kwargs) else self._error_handler
+
+        _, values = self._read_raw(ids, address, length, error_handler)
+        if len(values) < len(ids) * length:
+            return ()
+
+        values = bytes(values)
+        return tuple(values[i * length:(i + 1) * length] for i in range(len(ids)))
+
+    def get_bulk(self, controls_for_id, **kwargs):
+        """ Gets different registers from several motors in a single bulk read transaction.
+
+            For each motor, the smallest block of the control table containing all its requested registers is read and then decoded.
+
+            :param dict controls_for_id: names of the registers to read for each motor (e.g. {11: ['present voltage', 'present temperature'], 12: ['present load']})
+            :return: a dict {id: {register name: value}} (empty if the transaction failed)
+
+            """
+        if not controls_for_id:
+            return {}
+
+        convert = kwargs['convert'] if ('convert' in kwargs) else self._convert
+
+        controls_for_id = OrderedDict((motor_id, [(name, self._control_from_name(name)) for name in names])
+                                      for motor_id, names in controls_for_id.items())
+
+        id_address_length = []
+        for motor_id, controls in controls_for_id.items():
+            address = min(c.address for _, c in controls)
+            end = max(c.address + c.length * c.nb_elem for _, c in controls)
+            id_address_length.append((motor_id, address, end - address))
+
+        blocks = self.bulk_read(id_address_length, **kwargs)
+        if not blocks:
+            return {}
+
+        ids = list(controls_for_id.keys())
+        if convert:
+            models = self.get_model(ids)
+            if not models:
+                return {}
+        else:
+            models = [None] * len(ids)
 
+        res = OrderedDict()
+        for (motor_id, address, _), block, model in zip(id_address_length, blocks, models):
             d = OrderedDict()
-            for c in controls:
-                v = dxl_decode_all(sp.parameters[c.address:c.address + c.nb_elem * c.length], c.nb_elem)
-                d[c.name] = c.dxl_to_si(v, model) if convert else v
+            for name, c in controls_for_id[motor_id]:
+                i = c.address - address
+                v = dxl_decode_all(block[i:i + c.length * c.nb_elem], c.nb_elem)
+                d[name] = c.dxl_to_si(v, model) if convert else v
+            res[motor_id] = d
 
-            res.append(d)
+        return res
 
-        return tuple(res)
+    def _control_from_name(self, name):
+        controls = self._controls_by_name
+        control = controls.get(name, controls.get(name.replace('_', ' ')))
+
+        if control is None or control.access == _DxlAccess.writeonly:
+            raise ValueError('unknown readable register {}'.format(name))
+
+        return control
 
     @classmethod
     def _generate_accessors(cls, control):
         cls.__controls.append(control)
 
+        if '_controls_by_name' not in cls.__dict__:
+            cls._controls_by_name = {}
+        cls._controls_by_name[control.name] = control
+
         if control.access in (_DxlAccess.readonly, _DxlAccess.readwrite):
             def my_getter(self, ids, **kwargs):
                 return self._get_control_value(control, ids, **kwargs)
@@ -380,42 +579,8 @@ class AbstractDxlIO(object):
         error_handler = kwargs['error_handler'] if ('error_handler' in kwargs) else self._error_handler
         convert = kwargs['convert'] if ('convert' in kwargs) else self._convert
 
-        if self._sync_read and len(ids) > 1:
-            rp = self._protocol.DxlSyncReadPacket(ids, control.address,
-                                                  control.length * control.nb_elem)
-
-            with self._serial_lock:
-                sp = self._send_packet(rp,
-                                       error_handler=error_handler,
-                                       _force_lock=True)
-                if not sp:
-                    return ()
-
-                if self._protocol.name == 'v1':
-                    values = sp.parameters
-
-                elif self._protocol.name == 'v2':
-                    values = list(sp.parameters)
-                    for i in range(len(ids) - 1):
-                        try:
-                            sp = self.__real_read(rp, _force_lock=True)
-                        except (DxlTimeoutError, DxlCommunicationError):
-                            return ()
-                        values.extend(sp.parameters)
-
-                    if len(values) < len(ids):
-                        return ()
-
-        else:
-            values = []
-            for motor_id in ids:
-                rp = self._protocol.DxlReadDataPacket(motor_id, control.address, control.length * control.nb_elem)
-                sp = self._send_packet(rp, error_handler=error_handler)
-
-                if not sp:
-                    return ()
-
-                values.extend(sp.parameters)
+        rp, values = self._read_raw(ids, control.address, control.length * control.nb_elem,
+                                    error_handler)
 
         values = list(zip(*([iter(values)] * control.length * control.nb_elem)))
         values = [dxl_decode_all(value, control.nb_elem) for value in values]
@@ -433,20 +598,122 @@ class AbstractDxlIO(object):
                     if v == max_val:
                         lost_ids.append(ids[i // control.nb_elem])
                 e = DxlTimeoutError(self, rp, list(set(lost_ids)))
+                if self.timeouts is not None:
+                    for motor_id in e.ids:
+                        self.timeouts.failure(motor_id)
                 if self._error_handler:
                     self._error_handler.handle_timeout(e)
                     return ()
                 else:
                     raise e
 
+        if self.timeouts is not None and self._sync_read and len(ids) > 1:
+            for motor_id in ids:
+                self.timeouts.success(motor_id)
+
         if convert:
             models = self.get_model(ids)
             if not models:
                 return ()
-            values = [control.dxl_to_si(v, m) for v, m in zip(values, models)]
+            values = convert_all(control.dxl_to_si, values, models)
 
         return tuple(values)
 
+    def _read_raw(self, ids, address, length, error_handler):
+        """ Reads length bytes at address from each motor (with a single sync read if enabled, one read per motor otherwise).
+
+            :return: the last instruction packet sent and the concatenated raw bytes (empty if a read failed)
+
+            """
+        if self._sync_read and len(ids) > 1:
+            rp = self._packet_template(self._protocol.DxlSyncReadPacket,
+                                       tuple(ids), address, length)
+
+            timeouts = self.timeouts
+            v2 = self._protocol.name == 'v2'
+
+            # On v2, the motors answer one after the other (each within its own timeout),
+            # on v1 the adapter gathers all the answers in a single status packet.
+            timeout = None
+            if timeouts is not None:
+                timeout = (timeouts.timeout(ids[0]) if v2 else
+                           min(sum(timeouts.timeout(motor_id) for motor_id in ids), self._timeout))
+
+            with self._serial_lock:
+                try:
+                    values = self._read_sync_answers(rp, ids, length, timeout, error_handler)
+                except DxlTimeoutError as e:
+                    if not error_handler:
+                        raise
+                    error_handler.handle_timeout(e)
+                    return rp, ()
+                except DxlCommunicationError as e:
+                    if not error_handler:
+                        raise
+                    error_handler.handle_communication_error(e)
+                    return rp, ()
+                finally:
+                    self.__set_read_timeout(self._timeout)
+
+        else:
+            values = []
+            for motor_id in ids:
+                rp = self._packet_template(self._protocol.DxlReadDataPacket,
+                                           motor_id, address, length)
+                sp = self._send_packet(rp, error_handler=error_handler)
+
+                if not sp:
+                    return rp, ()
+
+                values.extend(sp.parameters)
+
+        return rp, values
+
+    def _read_sync_answers(self, rp, ids, length, timeout, error_handler):
+        """ Sends a sync read and reads its answers (the serial lock must be held).
+
+            :raises: :py:exc:`~pypot.dynamixel.io.DxlTimeoutError` with the id of the motor which did not answer (on v2) or :py:exc:`~pypot.dynamixel.io.DxlCommunicationError` if an unexpected answer is received
+
+            """
+        timeouts = self.timeouts
+
+        if self._protocol.name == 'v1':
+            sp = self._send_packet(rp, _force_lock=True, timeout=timeout)
+            if len(sp.parameters) != len(ids) * length:
+                raise DxlCommunicationError(self, 'unexpected status packet {}'.format(sp), rp)
+            if error_handler and sp.error:
+                self._handle_status_errors(sp, rp, error_handler)
+            return sp.parameters
+
+        # On v2, the motors answer in the request order
+        values = []
+        for i, motor_id in enumerate(ids):
+            try:
+                if i == 0:
+                    sp = self._send_packet(rp, _force_lock=True, timeout=timeout)
+                else:
+                    if timeouts is not None:
+                        self.__set_read_timeout(timeouts.timeout(motor_id))
+                    sp = self.__real_read(rp, _force_lock=True)
+            except DxlTimeoutError:
+                if timeouts is not None:
+                    timeouts.failure(motor_id)
+                raise DxlTimeoutError(self, rp, [motor_id])
+
+            # e.g. a late answer, its bytes would be given to another motor
+            if sp.id != motor_id or len(sp.parameters) != length:
+                self._stale_input = True
+                raise DxlCommunicationError(self,
+                                            'unexpected status packet {} (expected motor {})'.format(sp, motor_id),
+                                            rp)
+
+            if error_handler and sp.error:
+                self._handle_status_errors(sp, rp, error_handler)
+
+            values.extend(sp.parameters)
+
+        return values
+
     def _set_control_value(self, control, value_for_id, **kwargs):
         if not value_for_id:
             return
@@ -459,18 +726,46 @@ class AbstractDxlIO(object):
                 return
 
             value_for_id = dict(zip(value_for_id.keys(),
-                                    map(control.si_to_dxl, value_for_id.values(), models)))
+                                    convert_all(control.si_to_dxl, list(value_for_id.values()), models)))
+
+        wp = self._packet_template(self._protocol.DxlSyncWriteTemplate,
+                                   control.address, control.length, control.nb_elem,
+                                   tuple(value_for_id.keys()))
 
-        data = []
-        for motor_id, value in value_for_id.items():
-            data.extend(itertools.chain((motor_id, ),
-                                        dxl_code_all(value, control.length, control.nb_elem)))
+        # The template buffer is shared so it has to be filled and sent atomically
+        with self._serial_lock:
+            wp.fill(tuple(value_for_id.values()))
+            self._send_packet(wp, wait_for_status_packet=False, _force_lock=True)
 
-        wp = self._protocol.DxlSyncWritePacket(control.address, control.length * control.nb_elem, data)
-        self._send_packet(wp, wait_for_status_packet=False)
+    def _packet_template(self, packet_cls, *args):
+        """ Returns the precompiled packet for the given packet class and arguments.
+
+            The packets are only built once and then kept in a (bounded) LRU cache, so the header and checksum of a frequently sent packet are not recomputed at each send.
+
+            """
+        key = (packet_cls, ) + args
+
+        with self._packet_templates_lock:
+            try:
+                packet = self._packet_templates[key]
+                self._packet_templates.move_to_end(key)
+                return packet
+            except KeyError:
+                pass
+
+        packet = packet_cls(*args)
+        if not isinstance(packet, DxlPacketTemplate):
+            packet = DxlPacketTemplate(packet)
+
+        with self._packet_templates_lock:
+            self._packet_templates[key] = packet
+            if len(self._packet_templates) > self.max_packet_templates:
+                self._packet_templates.popitem(last=False)
+
+        return packet
 
     # MARK: - Send/Receive packet
-    def __real_send(self, instruction_packet, wait_for_status_packet, _force_lock):
+    def __real_send(self, instruction_packet, wait_for_status_packet, _force_lock, timeout=None):
         if self.closed:
             raise DxlError('try to send a packet on a closed serial communication')
 
@@ -480,15 +775,18 @@ class AbstractDxlIO(object):
                             'timeout': self.timeout})
 
         with self.__force_lock(_force_lock) or self._serial_lock:
-            self.flush(_force_lock=True)
+            if self._stale_input or len(self._parser):
+                self.flush(_force_lock=True)
 
             data = instruction_packet.to_string()
+            start = time.monotonic()
             try:
                 nbytes = self._serial.write(data)
             except serial.serialutil.SerialTimeoutException:
                 nbytes = 0
-            
+
             if len(data) != nbytes:
+                self._stale_input = True
                 raise DxlCommunicationError(self,
                                             'instruction packet not entirely sent',
                                             instruction_packet)
@@ -496,7 +794,27 @@ class AbstractDxlIO(object):
             if not wait_for_status_packet:
                 return
 
-            status_packet = self.__real_read(instruction_packet, _force_lock=True)
+            size_hint = self._protocol.status_packet_size(instruction_packet)
+
+            timeouts = self.timeouts
+            if timeout is not None:
+                self.__set_read_timeout(timeout)
+                status_packet = self.__real_read(instruction_packet, _force_lock=True,
+                                                 size_hint=size_hint)
+            elif timeouts is None or instruction_packet.id == self._protocol.DxlBroadcast:
+                self.__set_read_timeout(self._timeout)
+                status_packet = self.__real_read(instruction_packet, _force_lock=True,
+                                                 size_hint=size_hint)
+            else:
+                motor_id = instruction_packet.id
+                self.__set_read_timeout(timeouts.timeout(motor_id))
+                try:
+                    status_packet = self.__real_read(instruction_packet, _force_lock=True,
+                                                     size_hint=size_hint)
+                except DxlTimeoutError:
+                    timeouts.failure(motor_id)
+                    raise
+                timeouts.success(motor_id, time.monotonic() - start)
 
             logger.debug('Receiving %s', status_packet,
                          extra={'port': self.port,
@@ -505,40 +823,61 @@ class AbstractDxlIO(object):
 
             return status_packet
 
-    def __real_read(self, instruction_packet, _force_lock):
+    def __set_read_timeout(self, timeout):
+        # changing the timeout reconfigures the port, so only do it when needed
+        if self._serial.timeout != timeout:
+            self._serial.timeout = timeout
+
+    def __real_read(self, instruction_packet, _force_lock, size_hint=0):
+        """ Reads the next status packet answering the instruction packet.
+
+            The received data are buffered in a persistent parser. The first read directly asks for the whole expected answer (size_hint bytes), so the following status packets (e.g. for a v2 sync read) are then extracted from the buffer without reading the serial port again.
+
+            """
         with self.__force_lock(_force_lock) or self._serial_lock:
-            data = self._serial.read(self._protocol.DxlPacketHeader.length)
-            if not data:
-                raise DxlTimeoutError(self, instruction_packet, instruction_packet.id)
+            parser = self._parser
+            dropped = parser.dropped
+            received = bytearray()
+            timed_out = False
 
-            try:
-                header = self._protocol.DxlPacketHeader.from_string(data)
-                data += self._serial.read(header.packet_length)
-                status_packet = self._protocol.DxlStatusPacket.from_string(data)
+            while True:
+                for status_packet in parser:
+                    if (instruction_packet.id == self._protocol.DxlBroadcast or
+                            status_packet.id == instruction_packet.id):
+                        return status_packet
+                    # Otherwise, it is a late answer to a previous instruction
 
-            except ValueError:
-                msg = 'could not parse received data {}'.format(bytearray(data))
-                raise DxlCommunicationError(self, msg, instruction_packet)
+                if timed_out:
+                    self._stale_input = True
 
-            return status_packet
+                    if len(parser) or parser.dropped != dropped:
+                        msg = 'could not parse received data {}'.format(received)
+                        raise DxlCommunicationError(self, msg, instruction_packet)
+
+                    raise DxlTimeoutError(self, instruction_packet, instruction_packet.id)
+
+                to_read = max(parser.missing(), size_hint - len(parser))
+                size_hint = 0
+
+                data = self._serial.read(to_read)
+                received.extend(data)
+                parser.feed(data)
+
+                timed_out = len(data) < to_read
 
     def _send_packet(self,
                      instruction_packet, wait_for_status_packet=True,
                      error_handler=None,
-                     _force_lock=False):
+                     _force_lock=False, timeout=None):
 
         if not error_handler:
-            return self.__real_send(instruction_packet, wait_for_status_packet, _force_lock)
+            return self.__real_send(instruction_packet, wait_for_status_packet, _force_lock, timeout)
 
         try:
-            sp = self.__real_send(instruction_packet, wait_for_status_packet, _force_lock)
+            sp = self.__real_send(instruction_packet, wait_for_status_packet, _force_lock, timeout)
 
             if sp and sp.error:
-                errors = decode_error(sp.error)
-                for e in errors:
-                    handler_name = 'handle_{}'.format(e.lower().replace(' ', '_'))
-                    f = operator.methodcaller(handler_name, instruction_packet)
-                    f(error_handler)
+                self._handle_status_errors(sp, instruction_packet, error_handler)
 
             return sp
 
@@ -548,6 +887,13 @@ class AbstractDxlIO(object):
         except DxlCommunicationError as e:
             error_handler.handle_communication_error(e)
 
+    def _handle_status_errors(self, status_packet, instruction_packet, error_handler):
+        errors = decode_error(status_packet.error)
+        for e in errors:
+            handler_name = 'handle_{}'.format(e.lower().replace(' ', '_'))
+            f = operator.methodcaller(handler_name, instruction_packet)
+            f(error_handler)
+
 
 # MARK: - Dxl Errors
 class DxlError(Exception):
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+
+import serial
+import asyncio
+import logging
+import itertools
+import threading
+
+from collections import OrderedDict
+
+from .abstract_io import (AbstractDxlIO, _DxlAccess,
+                          DxlError, DxlCommunicationError, DxlTimeoutError)
+from .io import DxlIO
+from .io_320 import Dxl320IO
+from ..conversion import dxl_decode_all, dxl_to_model, convert_all
+from ..protocol.parser import DxlStatusPacketParser
+from ..protocol import v1, v2
+
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncDxlIOBase(object):
+    """ Asyncio communication with the robotis motors over a non-blocking serial port.
+
+        All the requests go through a single queue owned by a worker task, which sends them on the bus one after the other as soon as the previous transaction ends. So coroutines can issue several requests at once (e.g. with :func:`asyncio.gather`) and they are pipelined on the bus without any lock handoff.
+
+        The timeouts are handled by the worker (not by the callers): cancelling a pending request (e.g. with :func:`asyncio.wait_for`) never leaves a half-read answer in the stream. A request cancelled before being sent is dropped, an answer to a cancelled request is read and discarded.
+
+        .. note:: The io is bound to the event loop running when the first request is made.
+
+        """
+    _protocol = None
+    _controls_by_name = {}
+
+    # Same precompiled packets cache than the threaded ios
+    max_packet_templates = AbstractDxlIO.max_packet_templates
+    _packet_template = AbstractDxlIO._packet_template
+    _control_from_name = AbstractDxlIO._control_from_name
+    _handle_status_errors = AbstractDxlIO._handle_status_errors
+
+    def __init__(self,
+                 port, baudrate=1000000, timeout=0.05,
+                 use_sync_read=False,
+                 error_handler_cls=None,
+                 convert=True):
+        """ At instantiation, it opens the serial port (in non-blocking mode).
+
+            :param string port: the serial port to use (e.g. Unix (/dev/tty...), Windows (COM...)).
+            :param int baudrate: default for new motors: 57600, for PyPot motors: 1000000
+            :param float timeout: time to wait for each status packet (in seconds)
+            :param bool use_sync_read: whether or not to use the SYNC_READ instruction
+            :param error_handler: set a handler that will receive the different errors
+            :type error_handler: :py:class:`~pypot.dynamixel.error.DxlErrorHandler`
+            :param bool convert: whether or not convert values to units expressed in the standard system
+
+            """
+        self._known_models = {}
+
+        self._sync_read = use_sync_read
+        self._error_handler = error_handler_cls() if error_handler_cls else None
+        self._convert = convert
+        self.timeout = timeout
+
+        self._packet_templates = OrderedDict()
+        self._packet_templates_lock = threading.Lock()
+
+        self._parser = DxlStatusPacketParser(self._protocol)
+        self._stale_input = True
+
+        self._loop = None
+        self._requests = None
+        self._readable = None
+        self._worker = None
+
+        self._serial = serial.Serial(port, baudrate, timeout=0, write_timeout=timeout)
+        logger.info("Opening port '%s'", self.port,
+                    extra={'port': port,
+                           'baudrate': baudrate,
+                           'timeout': timeout})
+
+    def __repr__(self):
+        return ('<Async DXL IO: closed={self.closed}, '
+                'port="{self.port}", '
+                'baudrate={self.baudrate}, '
+                'timeout={self.timeout}>').format(self=self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Stops the worker, cancels the pending (and in-flight) requests and closes the serial port. """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._loop.remove_reader(self._serial.fileno())
+
+            while not self._requests.empty():
+                _, _, _, future = self._requests.get_nowait()
+                future.cancel()
+
+            self._worker = None
+
+        if not self.closed:
+            self._serial.close()
+            logger.info("Closing port '%s'", self.port,
+                        extra={'port': self.port,
+                               'baudrate': self.baudrate,
+                               'timeout': self.timeout})
+
+    @property
+    def port(self):
+        return self._serial.port
+
+    @property
+    def baudrate(self):
+        return self._serial.baudrate
+
+    @property
+    def closed(self):
+        """ Checks if the connection is closed. """
+        return not self._serial.isOpen()
+
+    # MARK: - Motor discovery
+
+    async def ping(self, id):
+        """ Pings the motor with the specified id. """
+        try:
+            await self._send_packet(self._protocol.DxlPingPacket(id))
+            return True
+        except DxlTimeoutError:
+            return False
+
+    async def scan(self, ids=range(254)):
+        """ Pings all ids within the specified list (the pings are pipelined). """
+        ids = list(ids)
+        found = await asyncio.gather(*(self.ping(id) for id in ids))
+        return [id for id, f in zip(ids, found) if f]
+
+    # MARK: - Specific Getter / Setter
+
+    async def get_model(self, ids):
+        """ Gets the model for the specified motors. """
+        to_get_ids = [i for i in ids if i not in self._known_models]
+        models = [dxl_to_model(m) for m in await self._get_model(to_get_ids, convert=False)]
+        self._known_models.update(zip(to_get_ids, models))
+
+        return tuple(self._known_models[id] for id in ids)
+
+    async def enable_torque(self, ids):
+        """ Enables torque of the motors with the specified ids. """
+        await self._set_torque_enable(dict(zip(ids, itertools.repeat(True))))
+
+    async def disable_torque(self, ids):
+        """ Disables torque of the motors with the specified ids. """
+        await self._set_torque_enable(dict(zip(ids, itertools.repeat(False))))
+
+    # MARK: - Generic Getter / Setter
+
+    @classmethod
+    def _generate_accessors(cls, control):
+        if '_controls_by_name' not in cls.__dict__:
+            cls._controls_by_name = {}
+        cls._controls_by_name[control.name] = control
+
+        if control.access in (_DxlAccess.readonly, _DxlAccess.readwrite):
+            async def my_getter(self, ids, **kwargs):
+                return await self._get_control_value(control, ids, **kwargs)
+
+            func_name = control.getter_name if control.getter_name else 'get_{}'.format(control.name.replace(' ', '_'))
+            func_name = '_{}'.format(func_name) if hasattr(cls, func_name) else func_name
+            my_getter.__doc__ = 'Gets {} from the specified motors.'.format(control.name)
+            my_getter.__name__ = func_name
+            setattr(cls, func_name, my_getter)
+
+        if control.access in (_DxlAccess.writeonly, _DxlAccess.readwrite):
+            async def my_setter(self, value_for_id, **kwargs):
+                await self._set_control_value(control, value_for_id, **kwargs)
+
+            func_name = control.setter_name if control.setter_name else 'set_{}'.format(control.name.replace(' ', '_'))
+            func_name = '_{}'.format(func_name) if hasattr(cls, func_name) else func_name
+            my_setter.__doc__ = 'Sets {} to the specified motors.'.format(control.name)
+            my_setter.__name__ = func_name
+            setattr(cls, func_name, my_setter)
+
+    async def _get_control_value(self, control, ids, **kwargs):
+        if not ids:
+            return ()
+
+        error_handler = kwargs['error_handler'] if ('error_handler' in kwargs) else self._error_handler
+        convert = kwargs['convert'] if ('convert' in kwargs) else self._convert
+
+        size = control.length * control.nb_elem
+
+        try:
+            if self._sync_read and len(ids) > 1:
+                rp = self._packet_template(self._protocol.DxlSyncReadPacket,
+                                           tuple(ids), control.address, size)
+                nb_status = 1 if self._protocol.name == 'v1' else len(ids)
+                status_packets = await self._send_packet(rp, error_handler=error_handler,
+                                                         nb_status=nb_status)
+            else:
+                # All the reads are queued at once so they are sent back to back
+                rps = [self._packet_template(self._protocol.DxlReadDataPacket,
+                                             motor_id, control.address, size)
+                       for motor_id in ids]
+                answers = await asyncio.gather(*(self._send_packet(rp, error_handler=error_handler)
+                                                 for rp in rps))
+                status_packets = [sp for sps in answers for sp in sps]
+
+        except DxlTimeoutError as e:
+            if not error_handler:
+                raise e
+            error_handler.handle_timeout(e)
+            return ()
+
+        except DxlCommunicationError as e:
+            if not error_handler:
+                raise e
+            error_handler.handle_communication_error(e)
+            return ()
+
+        values = [v for sp in status_packets for v in sp.parameters]
+        if len(values) < len(ids) * size:
+            return ()
+
+        values = list(zip(*([iter(values)] * size)))
+        values = [dxl_decode_all(value, control.nb_elem) for value in values]
+
+        # when using SYNC_READ instead of getting a timeout
+        # a non existing motor will "return" the maximum value
+        if self._sync_read and self._protocol.name == 'v1' and len(ids) > 1:
+            max_val = 2 ** (8 * control.length) - 1
+            flat = list(itertools.chain(*values)) if control.nb_elem > 1 else values
+            lost_ids = list(set(ids[i // control.nb_elem]
+                                for i, v in enumerate(flat) if v == max_val))
+            if lost_ids:
+                e = DxlTimeoutError(self, rp, lost_ids)
+                if not error_handler:
+                    raise e
+                error_handler.handle_timeout(e)
+                return ()
+
+        if convert:
+            models = await self.get_model(ids)
+            if not models:
+                return ()
+            values = convert_all(control.dxl_to_si, values, models)
+
+        return tuple(values)
+
+    async def _set_control_value(self, control, value_for_id, **kwargs):
+        if not value_for_id:
+            return
+
+        convert = kwargs['convert'] if ('convert' in kwargs) else self._convert
+
+        if convert:
+            models = await self.get_model(list(value_for_id.keys()))
+            if not models:
+                return
+
+            value_for_id = dict(zip(value_for_id.keys(),
+                                    convert_all(control.si_to_dxl, list(value_for_id.values()), models)))
+
+        wp = self._packet_template(self._protocol.DxlSyncWriteTemplate,
+                                   control.address, control.length, control.nb_elem,
+                                   tuple(value_for_id.keys()))
+
+        # The template buffer is shared: the bytes are copied before another
+        # coroutine can fill it again.
+        data = wp.fill(tuple(value_for_id.values())).to_string()
+        await self._send_packet(wp, wait_for_status_packet=False, data=data)
+
+    # MARK: - Send/Receive packet
+
+    def _bind(self):
+        if self._worker is not None:
+            return
+
+        if self.closed:
+            raise DxlError('try to send a packet on a closed serial communication')
+
+        self._loop = asyncio.get_running_loop()
+        self._requests = asyncio.Queue()
+        self._readable = asyncio.Event()
+        self._loop.add_reader(self._serial.fileno(), self._on_readable)
+        self._worker = self._loop.create_task(self._process_requests())
+
+    async def _send_packet(self,
+                           instruction_packet, wait_for_status_packet=True,
+                           error_handler=None, nb_status=1, data=None):
+        """ Queues an instruction packet and waits for its status packets.
+
+            :param int nb_status: number of status packets answering the instruction
+            :param bytes data: bytes to send (defaults to instruction_packet.to_string())
+            :return: the list of status packets
+
+            """
+        self._bind()
+
+        future = self._loop.create_future()
+        self._requests.put_nowait((instruction_packet,
+                                   data if data is not None else instruction_packet.to_string(),
+                                   nb_status if wait_for_status_packet else 0,
+                                   future))
+
+        status_packets = await future
+
+        if error_handler:
+            for sp in status_packets:
+                if sp.error:
+                    self._handle_status_errors(sp, instruction_packet, error_handler)
+
+        return status_packets
+
+    async def _process_requests(self):
+        while True:
+            instruction_packet, data, nb_status, future = await self._requests.get()
+
+            try:
+                # Cancelled before being sent: nothing to do
+                if future.cancelled():
+                    continue
+
+                try:
+                    status_packets = await self._transaction(instruction_packet, data, nb_status)
+                except Exception as e:
+                    # the traceback would keep references to the frames of the
+                    # worker (which must never be cleared by the callers)
+                    if not future.done():
+                        future.set_exception(e.with_traceback(None))
+                else:
+                    if not future.done():
+                        future.set_result(status_packets)
+            finally:
+                # The worker was cancelled (see close) in the middle of the transaction
+                if not future.done():
+                    future.cancel()
+
+    async def _transaction(self, instruction_packet, data, nb_status):
+        logger.debug('Sending %s', instruction_packet,
+                     extra={'port': self.port,
+                            'baudrate': self.baudrate,
+                            'timeout': self.timeout})
+
+        if self._stale_input or len(self._parser):
+            self._flush()
+
+        try:
+            nbytes = self._serial.write(data)
+        except serial.serialutil.SerialTimeoutException:
+            nbytes = 0
+
+        if len(data) != nbytes:
+            self._stale_input = True
+            raise DxlCommunicationError(self,
+                                        'instruction packet not entirely sent',
+                                        instruction_packet)
+
+        status_packets = []
+        for _ in range(nb_status):
+            status_packets.append(await self._read_status_packet(instruction_packet))
+
+        return status_packets
+
+    async def _read_status_packet(self, instruction_packet):
+        parser = self._parser
+        dropped = parser.dropped
+        deadline = self._loop.time() + self.timeout
+
+        while True:
+            for status_packet in parser:
+                if (instruction_packet.id == self._protocol.DxlBroadcast or
+                        status_packet.id == instruction_packet.id):
+                    logger.debug('Receiving %s', status_packet,
+                                 extra={'port': self.port,
+                                        'baudrate': self.baudrate,
+                                        'timeout': self.timeout})
+                    return status_packet
+                # Otherwise, it is a late answer to a previous instruction
+
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                self._stale_input = True
+
+                if len(parser) or parser.dropped != dropped:
+                    raise DxlCommunicationError(self, 'could not parse received data',
+                                                instruction_packet)
+
+                raise DxlTimeoutError(self, instruction_packet, instruction_packet.id)
+
+            self._readable.clear()
+            try:
+                await asyncio.wait_for(self._readable.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_readable(self):
+        try:
+            data = self._serial.read(self._serial.in_waiting or 1)
+        except serial.SerialException:
+            logger.exception('Could not read from %s', self.port)
+            self._loop.remove_reader(self._serial.fileno())
+            return
+
+        if data:
+            self._parser.feed(data)
+            self._readable.set()
+
+    def _flush(self):
+        self._serial.reset_input_buffer()
+        self._parser.clear()
+        self._stale_input = False
+
+
+class AsyncDxlIO(_AsyncDxlIOBase):
+    """ Asyncio version of :class:`~pypot.dynamixel.io.DxlIO` (protocol v1): all the getters and setters are coroutines. """
+    _protocol = v1
+
+
+class AsyncDxl320IO(_AsyncDxlIOBase):
+    """ Asyncio version of :class:`~pypot.dynamixel.io.Dxl320IO` (protocol v2): all the getters and setters are coroutines. """
+    _protocol = v2
+
+    async def get_goal_position_speed_load(self, ids):
+        a, b = await asyncio.gather(self._get_goal_pos_speed(ids),
+                                    self.get_torque_limit(ids))
+
+        return list(zip(*list(zip(*a)) + [b]))
+
+    async def set_goal_position_speed_load(self, value_for_ids):
+        values = list(zip(*list(value_for_ids.values())))
+
+        await asyncio.gather(self._set_goal_pos_speed(dict(zip(value_for_ids.keys(),
+                                                               zip(*(values[0], values[1]))))),
+                             self.set_torque_limit(dict(zip(value_for_ids.keys(), values[2]))))
+
+
+# MARK: - Generate the accessors
+
+for control in DxlIO._controls_by_name.values():
+    AsyncDxlIO._generate_accessors(control)
+
+for control in Dxl320IO._controls_by_name.values():
+    AsyncDxl320IO._generate_accessors(control)
@@ -118,10 +118,8 @@ _add_control('return delay time',
 
 _add_control('angle limit',
              address=0x06, nb_elem=2,
-             dxl_to_si=lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                             conv.dxl_to_degree(value[1], model)),
-             si_to_dxl=lambda value, model: (conv.degree_to_dxl(value[0], model),
-                                             conv.degree_to_dxl(value[1], model)))
+             dxl_to_si=conv.elementwise(conv.dxl_to_degree, conv.dxl_to_degree),
+             si_to_dxl=conv.elementwise(conv.degree_to_dxl, conv.degree_to_dxl))
 
 _add_control('drive mode',
              address=0x0A, length=1,
@@ -137,10 +135,8 @@ _add_control('highest temperature limit',
 
 _add_control('voltage limit',
              address=0x0C, length=1, nb_elem=2,
-             dxl_to_si=lambda value, model: (conv.dxl_to_voltage(value[0], model),
-                                             conv.dxl_to_voltage(value[1], model)),
-             si_to_dxl=lambda value, model: (conv.voltage_to_dxl(value[0], model),
-                                             conv.voltage_to_dxl(value[1], model)))
+             dxl_to_si=conv.elementwise(conv.dxl_to_voltage, conv.dxl_to_voltage),
+             si_to_dxl=conv.elementwise(conv.voltage_to_dxl, conv.voltage_to_dxl))
 
 _add_control('max torque',
              address=0x0E,
@@ -207,12 +203,8 @@ _add_control('torque limit',
 
 _add_control('goal position speed load',
              address=0x1E, nb_elem=3,
-             dxl_to_si=lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                             conv.dxl_to_speed(value[1], model),
-                                             conv.dxl_to_load(value[2], model)),
-             si_to_dxl=lambda value, model: (conv.degree_to_dxl(value[0], model),
-                                             conv.speed_to_dxl(value[1], model),
-                                             conv.torque_to_dxl(value[2], model)))
+             dxl_to_si=conv.elementwise(conv.dxl_to_degree, conv.dxl_to_speed, conv.dxl_to_load),
+             si_to_dxl=conv.elementwise(conv.degree_to_dxl, conv.speed_to_dxl, conv.torque_to_dxl))
 
 _add_control('present position',
              address=0x24,
@@ -232,9 +224,7 @@ _add_control('present load',
 _add_control('present position speed load',
              address=0x24, nb_elem=3,
              access=_DxlAccess.readonly,
-             dxl_to_si=lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                             conv.dxl_to_speed(value[1], model),
-                                             conv.dxl_to_load(value[2], model)))
+             dxl_to_si=conv.elementwise(conv.dxl_to_degree, conv.dxl_to_speed, conv.dxl_to_load))
 
 _add_control('present voltage',
              address=0x2A, length=1,
@@ -82,10 +82,8 @@ controls = {
     'angle limit': {
         'address': 0x06,
         'nb_elem': 2,
-        'dxl_to_si': lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                           conv.dxl_to_degree(value[1], model)),
-        'si_to_dxl': lambda value, model: (conv.degree_to_dxl(value[0], model),
-                                           conv.degree_to_dxl(value[1], model))
+        'dxl_to_si': conv.elementwise(conv.dxl_to_degree, conv.dxl_to_degree),
+        'si_to_dxl': conv.elementwise(conv.degree_to_dxl, conv.degree_to_dxl)
     },
     'control mode': {
         'address': 0x0B,
@@ -103,10 +101,8 @@ controls = {
         'address': 0x0D,
         'length': 1,
         'nb_elem': 2,
-        'dxl_to_si': lambda value, model: (conv.dxl_to_voltage(value[0], model),
-                                           conv.dxl_to_voltage(value[1], model)),
-        'si_to_dxl': lambda value, model: (conv.voltage_to_dxl(value[0], model),
-                                           conv.voltage_to_dxl(value[1], model))
+        'dxl_to_si': conv.elementwise(conv.dxl_to_voltage, conv.dxl_to_voltage),
+        'si_to_dxl': conv.elementwise(conv.voltage_to_dxl, conv.voltage_to_dxl)
     },
     'max torque': {
         'address': 0x0F,
@@ -173,10 +169,8 @@ controls = {
     'goal position speed': {
         'address': 0x1E,
         'nb_elem': 2,
-        'dxl_to_si': lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                           conv.dxl_to_speed(value[1], model)),
-        'si_to_dxl': lambda value, model: (conv.degree_to_dxl(value[0], model),
-                                           conv.speed_to_dxl(value[1], model)),
+        'dxl_to_si': conv.elementwise(conv.dxl_to_degree, conv.dxl_to_speed),
+        'si_to_dxl': conv.elementwise(conv.degree_to_dxl, conv.speed_to_dxl),
         'getter_name': '_get_goal_pos_speed',
         'setter_name': '_set_goal_pos_speed'
     },
@@ -199,9 +193,7 @@ controls = {
         'address': 0x25,
         'nb_elem': 3,
         'access': _DxlAccess.readonly,
-        'dxl_to_si': lambda value, model: (conv.dxl_to_degree(value[0], model),
-                                           conv.dxl_to_speed(value[1], model),
-                                           conv.dxl_to_load(value[2], model))
+        'dxl_to_si': conv.elementwise(conv.dxl_to_degree, conv.dxl_to_speed, conv.dxl_to_load)
     },
     'present voltage': {
         'address': 0x2D,
@@ -0,0 +1,121 @@
+import numpy
+import logging
+
+from collections import deque
+
+import pypot.utils.pypot_time as time
+
+
+logger = logging.getLogger(__name__)
+
+
+class _MotorHealth(object):
+    __slots__ = ('rtts', 'nb_samples', 'timeout', 'failures', 'trips', 'open_until')
+
+    def __init__(self, window):
+        self.rtts = deque(maxlen=window)
+        self.nb_samples = 0
+        self.timeout = None
+        self.failures = 0
+        self.trips = 0
+        self.open_until = None
+
+
+class AdaptiveTimeouts(object):
+    """ Per motor timeouts derived from the measured round-trip times, with a circuit breaker.
+
+        For each motor, the timeout is the given percentile of the last round-trip times multiplied by a margin (bounded by min_timeout and max_timeout). Each consecutive timeout of a motor doubles its timeout (up to max_timeout), an answer resets it.
+
+        After failure_threshold consecutive timeouts, the circuit breaker of the motor opens: :meth:`available` returns False during a cooldown, so the synchronization loops skip the motor (see :attr:`~pypot.dynamixel.controller.DxlController.working_motors`). Once the cooldown is over, the motor is probed again by the next request: an answer closes the breaker, a new timeout opens it for twice the previous cooldown (up to max_cooldown).
+
+        """
+    def __init__(self, max_timeout=0.05, min_timeout=0.002,
+                 percentile=99.0, margin=2.0, window=64, min_samples=8,
+                 failure_threshold=3, cooldown=0.5, max_cooldown=30.0):
+        """
+        :param float max_timeout: timeout used for the motors without enough measures (and upper bound of all timeouts)
+        :param float min_timeout: lower bound of the timeouts
+        :param float percentile: percentile of the round-trip times used to compute the timeouts
+        :param float margin: factor applied to the percentile
+        :param int window: number of round-trip times kept for each motor
+        :param int min_samples: number of measures needed before adapting the timeout of a motor
+        :param int failure_threshold: number of consecutive timeouts opening the circuit breaker
+        :param float cooldown: time (in seconds) during which a motor is skipped when its breaker first opens
+        :param float max_cooldown: maximum cooldown (in seconds)
+
+        """
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.percentile = percentile
+        self.margin = margin
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._motors = {}
+        # the percentile is only recomputed every few measures
+        self._update_every = max(1, window // 8)
+
+    def _health(self, id):
+        try:
+            return self._motors[id]
+        except KeyError:
+            return self._motors.setdefault(id, _MotorHealth(self.window))
+
+    def timeout(self, id):
+        """ Returns the current timeout of a motor (in seconds). """
+        h = self._motors.get(id)
+        if h is None or h.timeout is None:
+            return self.max_timeout
+
+        return min(h.timeout * 2 ** min(h.failures, 16), self.max_timeout)
+
+    def success(self, id, rtt=None):
+        """ Records an answer of a motor (and its round-trip time if known). """
+        h = self._health(id)
+
+        if h.trips:
+            logger.info('Motor %s answers again', id)
+
+        h.failures = 0
+        h.trips = 0
+        h.open_until = None
+
+        if rtt is None:
+            return
+
+        h.rtts.append(rtt)
+        h.nb_samples += 1
+
+        if len(h.rtts) >= self.min_samples and h.nb_samples % self._update_every == 0:
+            t = self.margin * numpy.percentile(h.rtts, self.percentile)
+            h.timeout = min(max(t, self.min_timeout), self.max_timeout)
+
+    def failure(self, id):
+        """ Records a timeout of a motor. """
+        h = self._health(id)
+        h.failures += 1
+
+        if h.failures >= self.failure_threshold:
+            cooldown = min(self.cooldown * 2 ** min(h.trips, 16), self.max_cooldown)
+            h.trips += 1
+            h.open_until = time.monotonic() + cooldown
+
+            logger.warning('Motor %s skipped for %.1fs after %d consecutive timeouts',
+                           id, cooldown, h.failures)
+
+    def available(self, id):
+        """ Checks whether a motor should be used (i.e. its circuit breaker is closed or its cooldown is over). """
+        h = self._motors.get(id)
+        return h is None or h.open_until is None or time.monotonic() >= h.open_until
+
+    @property
+    def dropped(self):
+        """ Ids of the motors currently skipped. """
+        return sorted(id for id in self._motors if not self.available(id))
+
+    def forget(self, id):
+        """ Resets the measures and the state of a motor. """
+        self._motors.pop(id, None)
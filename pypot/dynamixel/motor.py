@@ -20,12 +20,19 @@ class DxlRegister(object):
         self.rw = rw
 
     def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
         if instance._read_synchronous[self.label]:
             sync = instance._read_synced[self.label]
 
             if not sync.is_recent:
                 sync.request()
 
+        store = instance._store
+        if store is not None and self.label in store.arrays:
+            return store.arrays[self.label].item(instance._store_index)
+
         value = instance.__dict__.get(self.label, 0)
 
         return value
@@ -36,7 +43,15 @@ class DxlRegister(object):
 
         logger.debug("Setting '%s.%s' to %s",
                      instance.name, self.label, value)
-        instance.__dict__[self.label] = value
+
+        store = instance._store
+        if store is not None and self.label in store.arrays:
+            store.arrays[self.label][instance._store_index] = value
+        else:
+            instance.__dict__[self.label] = value
+
+        # lets the sync loops know which registers were modified since their last write
+        instance._write_versions[self.label] += 1
 
         if instance._write_synchronous[self.label]:
             sync = instance._write_synced[self.label]
@@ -45,6 +60,9 @@ class DxlRegister(object):
 
 class DxlOrientedRegister(DxlRegister):
     def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
         value = DxlRegister.__get__(self, instance, owner)
         return (value if instance.direct else -value)
 
@@ -55,6 +73,9 @@ class DxlOrientedRegister(DxlRegister):
 
 class DxlPositionRegister(DxlOrientedRegister):
     def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
         value = DxlOrientedRegister.__get__(self, instance, owner)
         return value - instance.offset
 
@@ -114,6 +135,10 @@ class DxlMotor(Motor, metaclass=RegisterOwner):
     present_voltage = DxlRegister()
     present_temperature = DxlRegister()
 
+    # set when the motor is attached to a DxlStateStore (see pypot.dynamixel.store)
+    _store = None
+    _store_index = None
+
     def __init__(self, id, name=None, model='',
                  direct=True, offset=0.0,
                  broken=False,
@@ -140,6 +165,7 @@ class DxlMotor(Motor, metaclass=RegisterOwner):
 
         self._write_synchronous = defaultdict(lambda: False)
         self._write_synced = defaultdict(SyncEvent)
+        self._write_versions = defaultdict(int)
 
         if angle_limit is not None:
             self.__dict__['lower_limit'], self.__dict__['upper_limit'] = angle_limit
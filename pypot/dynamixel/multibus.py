@@ -0,0 +1,112 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pypot.utils.pypot_time as time
+
+from ..robot.controller import MotorsController
+
+from .controller import PosSpeedLoadDxlController
+
+
+RobotTick = namedtuple('RobotTick', ('sequence', 'timestamp', 'read_window',
+                                     'motors',
+                                     'present_position', 'present_speed', 'present_load'))
+RobotTick.__doc__ = """ State of the motors of all the buses sampled during the same tick.
+
+    :param int sequence: number of the tick
+    :param float timestamp: middle of the read phase (see :func:`~pypot.utils.pypot_time.monotonic`)
+    :param float read_window: time between the first read request and the last answer (in seconds)
+    :param tuple motors: names of the motors
+    :param tuple present_position: present position of each motor (as seen from the motors)
+    :param tuple present_speed: present speed of each motor
+    :param tuple present_load: present load of each motor
+
+    """
+
+
+class MultiBusController(MotorsController):
+    """ Runs the position/speed/load loops of several buses in lockstep.
+
+        By default, each controller (i.e. each serial port) runs its own pos/speed/load loop so the motors of the different buses are sampled at different instants. This controller takes over those loops and, at each tick:
+
+            * runs the read phase on all the buses in parallel (one worker per port) and waits for all of them,
+            * then runs the write phase on all the buses the same way,
+            * publishes the state read during this tick as a :class:`RobotTick` (see :attr:`last_tick`).
+
+        The other loops (voltage, temperature, pid...) keep running within their own controller.
+
+        .. note:: The motors stay attached to their own controller, this one does not own any motor.
+
+        """
+    def __init__(self, controllers, sync_freq=None):
+        """
+        :param list controllers: controllers (one per port) whose pos/speed/load loops are synchronized
+        :param float sync_freq: frequency of the ticks (defaults to the highest frequency of the loops)
+
+        """
+        self.loops = []
+        for c in controllers:
+            for loop in list(getattr(c, 'controllers', [])):
+                if isinstance(loop, PosSpeedLoadDxlController):
+                    c.detach(loop)
+                    self.loops.append(loop)
+
+        if not self.loops:
+            raise ValueError('No position/speed/load loop to synchronize.')
+
+        if sync_freq is None:
+            sync_freq = 1.0 / min(loop.period for loop in self.loops)
+
+        MotorsController.__init__(self, None, [], sync_freq)
+
+        self.last_tick = None
+        self._sequence = 0
+        self._executor = None
+
+    @property
+    def tick_motors(self):
+        """ Motors sampled at each tick. """
+        return [m for loop in self.loops for m in loop.motors]
+
+    def setup(self):
+        self._executor = ThreadPoolExecutor(max_workers=len(self.loops))
+        self._run_phase(lambda loop: loop.setup())
+
+    def teardown(self):
+        self._run_phase(lambda loop: loop.teardown())
+        self._executor.shutdown()
+
+    def update(self):
+        windows = self._run_phase(self._read)
+        self._run_phase(lambda loop: loop.set_goal_position_speed_load(loop.working_motors))
+
+        start = min(w[0] for w in windows)
+        end = max(w[1] for w in windows)
+        self._publish((start + end) / 2, end - start)
+
+    def _read(self, loop):
+        start = time.monotonic()
+        loop.get_present_position_speed_load(loop.working_motors)
+        return start, time.monotonic()
+
+    def _run_phase(self, func):
+        """ Runs func on all the buses in parallel and waits for all of them to finish. """
+        futures = [self._executor.submit(func, loop) for loop in self.loops]
+        return [f.result() for f in futures]
+
+    def _publish(self, timestamp, read_window):
+        motors = self.tick_motors
+
+        # The loops do not publish on their own: all the buses are published at once
+        if self.snapshots is not None:
+            self.snapshots.publish(motors, {
+                var: [v for loop in self.loops for v in loop._get_values(loop.motors, var)]
+                for var in ('present_position', 'present_speed', 'present_load')
+            }, timestamp)
+
+        self._sequence += 1
+        self.last_tick = RobotTick(self._sequence, timestamp, read_window,
+                                   tuple(m.name for m in motors),
+                                   tuple(m.present_position for m in motors),
+                                   tuple(m.present_speed for m in motors),
+                                   tuple(m.present_load for m in motors))
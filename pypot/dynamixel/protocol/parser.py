@@ -0,0 +1,115 @@
+class DxlStatusPacketParser(object):
+    """ Incremental parser extracting status packets from a stream of bytes.
+
+        Received data are appended to a persistent buffer (see :meth:`feed`) and complete :class:`DxlStatusPacket` are extracted as soon as they are available (see :meth:`next_packet`). The parser resynchronizes on the packet marker (0xFF 0xFF for v1, 0xFF 0xFF 0xFD 0x00 for v2), so garbage or corrupted packets are dropped without losing the following ones.
+
+        This allows to drain several status packets (e.g. the answers to a v2 sync read) with a few large reads instead of two small reads per packet.
+
+        """
+    def __init__(self, protocol, max_packet_length=1024):
+        """
+        :param protocol: protocol module (:mod:`~pypot.dynamixel.protocol.v1` or :mod:`~pypot.dynamixel.protocol.v2`)
+        :param int max_packet_length: larger announced lengths are considered as corrupted data
+
+        """
+        self._protocol = protocol
+        self._header = protocol.DxlPacketHeader
+        self._marker = bytes(self._header.marker)
+        self.max_packet_length = max_packet_length
+
+        self._buff = bytearray()
+        self._start = 0
+
+        self.dropped = 0
+
+    def __len__(self):
+        """ Number of buffered bytes not parsed yet. """
+        return len(self._buff) - self._start
+
+    def __iter__(self):
+        """ Yields all the complete status packets currently available. """
+        while True:
+            packet = self.next_packet()
+            if packet is None:
+                return
+            yield packet
+
+    def clear(self):
+        """ Drops all the buffered data. """
+        self._buff.clear()
+        self._start = 0
+
+    def feed(self, data):
+        """ Appends received data to the buffer. """
+        if self._start:
+            # Only compact the buffer when the parsed part gets large
+            # so we do not move the memory at each read.
+            if self._start == len(self._buff):
+                self._buff.clear()
+                self._start = 0
+            elif self._start > 512:
+                del self._buff[:self._start]
+                self._start = 0
+
+        self._buff.extend(data)
+
+    def missing(self):
+        """ Minimum number of bytes still needed to complete the next status packet. """
+        i = self._find_marker()
+        if i < 0:
+            return self._header.length
+
+        available = len(self._buff) - i
+        if available < self._header.length:
+            return self._header.length - available
+
+        header = self._header.from_string(self._buff[i:i + self._header.length])
+        return max(0, self._header.length + header.packet_length - available)
+
+    def next_packet(self):
+        """ Returns the next complete status packet (or None if there is none yet). """
+        buff = self._buff
+        header_length = self._header.length
+
+        while True:
+            i = self._find_marker()
+            if i < 0:
+                return None
+
+            if len(buff) - i < header_length:
+                return None
+
+            header = self._header.from_string(buff[i:i + header_length])
+            if header.packet_length > self.max_packet_length:
+                self._drop(i + 1)
+                continue
+
+            end = i + header_length + header.packet_length
+            if len(buff) < end:
+                return None
+
+            try:
+                packet = self._protocol.DxlStatusPacket.from_string(buff[i:end])
+            except ValueError:
+                self._drop(i + 1)
+                continue
+
+            self._start = end
+            return packet
+
+    def _find_marker(self):
+        i = self._buff.find(self._marker, self._start)
+
+        if i < 0:
+            # Keeps the end of the buffer as it may contain the beginning of a marker
+            keep = len(self._buff) - len(self._marker) + 1
+            if keep > self._start:
+                self._drop(keep)
+        elif i > self._start:
+            self._drop(i)
+
+        return i
+
+    def _drop(self, end):
+        self.dropped += end - self._start
+        self._start = end
@@ -0,0 +1,109 @@
+import struct
+import itertools
+
+
+_struct_formats = {1: 'B', 2: 'H'}
+
+
+class DxlPacketTemplate(object):
+    """ Precompiled version of an instruction packet.
+
+        The packet is encoded once (header, parameters and checksum) and the resulting bytes are re-used for every send. It can be used wherever an instruction packet is expected (e.g. :meth:`~pypot.dynamixel.io.abstract_io.AbstractDxlIO._send_packet`).
+
+        """
+    def __init__(self, instruction_packet):
+        self.id = instruction_packet.id
+        self.instruction = instruction_packet.instruction
+        self.parameters = instruction_packet.parameters
+
+        self._repr = repr(instruction_packet)
+        self._buff = instruction_packet.to_array()
+        self._string = bytes(self._buff)
+
+    def __repr__(self):
+        return self._repr
+
+    def to_array(self):
+        return self._buff
+
+    def to_string(self):
+        return self._string
+
+
+class DxlSyncWriteTemplate(DxlPacketTemplate):
+    """ Preallocated sync write packet for a fixed (address, length, ids) layout.
+
+        The header, the instruction, the address and the ids are encoded once. Each call to :meth:`fill` packs the new values in place in the preallocated buffer and only recomputes the checksum.
+
+        This class is protocol agnostic, each protocol module provides its own subclass defining:
+            * _packet_cls: the sync write instruction packet class
+            * checksum_length: the number of checksum bytes at the end of the packet
+            * _prepare_checksum / _update_checksum: how to (incrementally) compute the checksum
+
+        """
+    _packet_cls = None
+    checksum_length = None
+
+    def __init__(self, address, length, nb_elem, ids):
+        self.address = address
+        self.length = length
+        self.nb_elem = nb_elem
+        self.ids = tuple(ids)
+
+        stride = 1 + length * nb_elem
+        zeros = (0, ) * (length * nb_elem)
+        data = list(itertools.chain(*((id, ) + zeros for id in self.ids)))
+
+        DxlPacketTemplate.__init__(self, self._packet_cls(address, length * nb_elem, data))
+
+        first_id = len(self._buff) - self.checksum_length - len(self.ids) * stride
+        self._offsets = tuple(first_id + i * stride + 1 for i in range(len(self.ids)))
+        self._struct = struct.Struct('<' + _struct_formats[length] * nb_elem)
+
+        self._prepare_checksum(min(first_id + 1, len(self._buff) - self.checksum_length))
+
+    def __repr__(self):
+        return ('DxlSyncWriteTemplate(ids={}, address={}, '
+                'length={}, values={})'.format(self.ids,
+                                               self.address,
+                                               self.length * self.nb_elem,
+                                               self.values))
+
+    @property
+    def values(self):
+        """ Values currently packed in the buffer (in the ids order). """
+        unpack_from = self._struct.unpack_from
+        values = [unpack_from(self._buff, offset) for offset in self._offsets]
+        return [v if self.nb_elem > 1 else v[0] for v in values]
+
+    def fill(self, values):
+        """ Packs the values (given in the ids order) in place and updates the checksum.
+
+            For multi-elements registers (nb_elem > 1) each value must be a sequence of nb_elem integers.
+
+            """
+        if len(values) != len(self._offsets):
+            raise ValueError('expected {} values (got {})'.format(len(self._offsets), len(values)))
+
+        buff = self._buff
+        pack_into = self._struct.pack_into
+
+        if self.nb_elem > 1:
+            for offset, value in zip(self._offsets, values):
+                pack_into(buff, offset, *value)
+        else:
+            for offset, value in zip(self._offsets, values):
+                pack_into(buff, offset, value)
+
+        self._update_checksum()
+
+        return self
+
+    def to_string(self):
+        return bytes(self._buff)
+
+    def _prepare_checksum(self, first_value):
+        raise NotImplementedError
+
+    def _update_checksum(self):
+        raise NotImplementedError
@@ -5,6 +5,8 @@ import itertools
 
 from collections import namedtuple
 
+from . import template
+
 name = 'v1'
 
 DxlBroadcast = 254
@@ -17,6 +19,7 @@ class DxlInstruction(object):
     RESET = 0x06
     SYNC_WRITE = 0x83
     SYNC_READ = 0x84
+    BULK_READ = 0x92
 
 
 # MARK: - Packet Header
@@ -118,6 +121,28 @@ class DxlSyncReadPacket(DxlInstructionPacket):
                                                 self.parameters[1]))
 
 
+class DxlBulkReadPacket(DxlInstructionPacket):
+    """ This class is used to represent bulk read packet (to read different registers of several motors at once).
+
+        Each motor answers with its own status packet, in the order of the request.
+
+        """
+    def __new__(cls, id_address_length):
+        return DxlInstructionPacket.__new__(cls, DxlBroadcast,
+                                            DxlInstruction.BULK_READ,
+                                            tuple(itertools.chain((0x00, ),
+                                                                  *((length, id, address)
+                                                                    for id, address, length in id_address_length))))
+
+    @property
+    def id_address_length(self):
+        p = self.parameters[1:]
+        return tuple(zip(p[1::3], p[2::3], p[0::3]))
+
+    def __repr__(self):
+        return 'DxlBulkReadPacket(id_address_length={})'.format(self.id_address_length)
+
+
 class DxlWriteDataPacket(DxlInstructionPacket):
     """ This class is used to represent write data packet (to write value). """
     def __new__(cls, id, address, coded_value):
@@ -156,6 +181,18 @@ class DxlSyncWritePacket(DxlInstructionPacket):
                                                            values))
 
 
+class DxlSyncWriteTemplate(template.DxlSyncWriteTemplate):
+    """ Preallocated :class:`~pypot.dynamixel.protocol.v1.DxlSyncWritePacket` (see :class:`~pypot.dynamixel.protocol.template.DxlSyncWriteTemplate`). """
+    _packet_cls = DxlSyncWritePacket
+    checksum_length = 1
+
+    def _prepare_checksum(self, first_value):
+        self._payload = memoryview(self._buff)[2:-1]
+
+    def _update_checksum(self):
+        self._buff[-1] = 255 - (sum(self._payload) % 256)
+
+
 # MARK: - Status Packet
 class DxlStatusPacket(namedtuple('DxlStatusPacket', ('id', 'error', 'parameters'))):
     """ This class is used to represent a dynamixel status packet.
@@ -181,3 +218,18 @@ class DxlStatusPacket(namedtuple('DxlStatusPacket', ('id', 'error', 'parameters'
     @classmethod
     def _checksum(cls, packet):
         return int(255 - (sum(packet[2:-1]) % 256))
+
+
+def status_packet_size(instruction_packet):
+    """ Returns the number of bytes expected in answer to the instruction packet (if all motors answer without error). """
+    if instruction_packet.instruction == DxlInstruction.READ_DATA:
+        nb_params = instruction_packet.parameters[1]
+    elif instruction_packet.instruction == DxlInstruction.SYNC_READ:
+        nb_params = instruction_packet.parameters[1] * (len(instruction_packet.parameters) - 2)
+    elif instruction_packet.instruction == DxlInstruction.BULK_READ:
+        lengths = instruction_packet.parameters[1::3]
+        return len(lengths) * (DxlPacketHeader.length + 2) + sum(lengths)
+    else:
+        nb_params = 0
+
+    return DxlPacketHeader.length + 2 + nb_params
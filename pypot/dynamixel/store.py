@@ -0,0 +1,98 @@
+import numpy
+
+from collections import OrderedDict
+
+from .motor import DxlPositionRegister, DxlOrientedRegister
+
+
+class DxlStateStore(object):
+    """ Structure-of-arrays backing store for the registers of a group of :class:`~pypot.dynamixel.motor.DxlMotor`.
+
+        Each register is stored in a single contiguous array (one value per motor) instead of in the __dict__ of each motor. The motors attached to the store keep the same API, their registers simply read/write their value at their index in the arrays.
+
+        As in the motors, the arrays hold the raw values (as read from the hardware, before orientation and offset). The controllers can thus write decoded values for all motors with a single vectorized assignment (see :meth:`set_raw`), while bulk consumers can directly read whole-robot vectors as seen from the motors (see :meth:`get`).
+
+        .. note:: The orientation and offset of the motors are read when the store is created.
+
+        """
+    default_registers = ('present_position', 'present_speed', 'present_load',
+                         'goal_position', 'moving_speed', 'torque_limit')
+
+    def __init__(self, motors, registers=None):
+        """
+        :param list motors: motors to attach to the store
+        :param list registers: registers stored in arrays (the others stay in the __dict__ of each motor)
+
+        """
+        self.motors = list(motors)
+
+        registers = self.default_registers if registers is None else registers
+        self.arrays = OrderedDict((r, numpy.zeros(len(self.motors))) for r in registers)
+
+        self._sign = numpy.array([1.0 if m.direct else -1.0 for m in self.motors])
+        self._offset = numpy.array([m.offset for m in self.motors], dtype=float)
+
+        self._kinds = {}
+        for r in registers:
+            descriptors = {type(getattr(m.__class__, r, None)) for m in self.motors}
+            self._kinds[r] = ('position' if descriptors == {DxlPositionRegister} else
+                              'oriented' if descriptors == {DxlOrientedRegister} else
+                              'raw')
+
+        for i, m in enumerate(self.motors):
+            for r, a in self.arrays.items():
+                if r in m.__dict__:
+                    a[i] = m.__dict__.pop(r)
+
+            m._store, m._store_index = self, i
+
+    def __len__(self):
+        return len(self.motors)
+
+    def indices(self, motors):
+        """ Returns the indices of the motors in the arrays. """
+        return numpy.fromiter((m._store_index for m in motors),
+                              dtype=numpy.intp, count=len(motors))
+
+    def get_raw(self, register, indices=slice(None)):
+        """ Returns a copy of the raw values of a register. """
+        return self.arrays[register][indices].copy()
+
+    def set_raw(self, register, values, indices=slice(None)):
+        """ Sets the raw values of a register (in one vectorized assignment). """
+        self.arrays[register][indices] = values
+
+    def get(self, register, indices=slice(None)):
+        """ Returns the values of a register as seen from the motors (orientation and offset applied). """
+        raw = self.arrays[register][indices]
+        kind = self._kinds[register]
+
+        if kind == 'position':
+            return self._sign[indices] * raw - self._offset[indices]
+        elif kind == 'oriented':
+            return self._sign[indices] * raw
+
+        return raw.copy()
+
+    def set(self, register, values, indices=slice(None)):
+        """ Sets the values of a register as seen from the motors (orientation and offset applied). """
+        values = numpy.asarray(values, dtype=float)
+        kind = self._kinds[register]
+
+        if kind == 'position':
+            values = self._sign[indices] * (values + self._offset[indices])
+        elif kind == 'oriented':
+            values = self._sign[indices] * values
+
+        self.arrays[register][indices] = values
+
+
+def attach_state_store(controller, registers=None):
+    """ Backs the motors of a controller (and of its synchronization loops) with a :class:`DxlStateStore`. """
+    store = DxlStateStore(controller.motors, registers)
+
+    controller.store = store
+    for loop in getattr(controller, 'controllers', []):
+        loop.store = store
+
+    return store
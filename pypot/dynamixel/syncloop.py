@@ -1,10 +1,18 @@
+import logging
+
+import pypot.utils.pypot_time as time
+
 from ..robot.controller import MotorsController
 
 from .controller import (DxlController,
+                         BulkReadDxlController,
                          PosSpeedLoadDxlController,
                          AngleLimitRegisterController)
 
 
+logger = logging.getLogger(__name__)
+
+
 class MetaDxlController(MotorsController):
     """ Synchronizes the reading/writing of :class:`~pypot.dynamixel.motor.DxlMotor` with the real motors.
 
@@ -29,6 +37,10 @@ class MetaDxlController(MotorsController):
         """ Stops the synchronization loops. """
         [c.stop() for c in self.controllers]
 
+    def detach(self, loop):
+        """ Removes a synchronization loop (e.g. to run it from another controller). """
+        self.controllers.remove(loop)
+
 
 class BaseDxlController(MetaDxlController):
     """ Implements a basic controller that synchronized the most frequently used values.
@@ -117,3 +129,231 @@ class LightDxlController(MetaDxlController):
                                              'set', 'LED_color', 'led'))
 
         MetaDxlController.__init__(self, io, motors, controllers)
+
+
+class _BusSlot(object):
+    """ Group of controllers sharing the same period in a :class:`ScheduledDxlController`. """
+    def __init__(self, period, controllers):
+        self.period = period
+        self.controllers = controllers
+
+        self.release = 0.0
+        self.cost = None
+
+        self.runs = 0
+        self.missed = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+        self.last_run = None
+
+    @property
+    def name(self):
+        return ', '.join(c.varname for c in self.controllers)
+
+    @property
+    def stats(self):
+        return {
+            'frequency': 1.0 / self.period,
+            'controllers': self.name,
+            'runs': self.runs,
+            'missed': self.missed,
+            'skipped': self.skipped,
+            'max_lateness': self.max_lateness,
+            'cost': self.cost,
+        }
+
+
+class ScheduledDxlController(MotorsController):
+    """ Synchronizes the :class:`~pypot.dynamixel.motor.DxlMotor` with the real motors using a single thread.
+
+        Instead of running each synchronization loop of a :class:`MetaDxlController` within its own thread (all of them contending for the serial port), this controller owns the bus and runs them cooperatively:
+
+            * the loops with the same frequency are merged in a single slot (and their register reads are merged in a single bulk read when the motors support it),
+            * the slots are run following a rate-monotonic policy: when several slots are due, the one with the highest frequency runs first, so a 1Hz temperature read can not delay the 50Hz position loop,
+            * the deadline of each slot is accounted (missed deadlines, skipped periods, lateness, see :attr:`stats`),
+            * a warning is issued when the measured bus utilization exceeds :attr:`budget` (i.e. the configured frequencies can not fit the baudrate).
+
+        By default, it runs the same loops as :class:`BaseDxlController` (see :attr:`meta_controller`).
+
+        """
+    meta_controller = BaseDxlController
+
+    # Maximum sleep between two checks of the stop/pause signals
+    max_sleep = 0.1
+
+    def __init__(self, io, motors, controllers=None, budget=0.9):
+        """
+        :param io: IO shared by all the loops
+        :param list motors: motors attached to the controller
+        :param list controllers: synchronization loops to schedule (defaults to the ones of :attr:`meta_controller`)
+        :param float budget: maximum bus utilization before warning
+
+        """
+        if controllers is None:
+            controllers = self.meta_controller(io, motors).controllers
+
+        if not controllers:
+            raise ValueError('No synchronization loop to schedule.')
+
+        periods = [c.period for c in controllers]
+        MotorsController.__init__(self, io, motors, 1.0 / min(periods))
+
+        self.budget = budget
+        self._budget_warned = False
+
+        self.slots = []
+        for period in sorted(set(periods)):
+            same_rate = [c for c in controllers if c.period == period]
+            self.slots.append(_BusSlot(period, self._merge(same_rate)))
+
+        self.controllers = [c for slot in self.slots for c in slot.controllers]
+
+    def detach(self, loop):
+        """ Removes a synchronization loop (e.g. to run it from another controller). """
+        for slot in self.slots:
+            if loop in slot.controllers:
+                slot.controllers.remove(loop)
+
+        # The fastest slot is kept even when empty as it signals the updates at the controller frequency
+        self.slots = self.slots[:1] + [slot for slot in self.slots[1:] if slot.controllers]
+        self.controllers.remove(loop)
+
+    def _merge(self, controllers):
+        """ Merges the register reads of the same motors into a single bulk read loop. """
+        if not self._bulk_read_supported():
+            return controllers
+
+        groups = {}
+        merged = []
+        for c in controllers:
+            if type(c) is DxlController and c.mode == 'get' and c.varname == c.regname:
+                key = (tuple(m.id for m in c.motors), c.synchronous)
+                if key not in groups:
+                    groups[key] = []
+                    merged.append(groups[key])
+                groups[key].append(c)
+            else:
+                merged.append(c)
+
+        for i, group in enumerate(merged):
+            if not isinstance(group, list):
+                continue
+
+            c = group[0]
+            merged[i] = (BulkReadDxlController(self.io, c.motors, 1.0 / c.period,
+                                               c.synchronous, [g.regname for g in group])
+                         if len(group) > 1 else c)
+
+        return merged
+
+    def _bulk_read_supported(self):
+        if self.io._protocol.name == 'v2':
+            return True
+
+        return all(m.model.startswith('MX') for m in self.motors)
+
+    @property
+    def utilization(self):
+        """ Measured fraction of the bus time used by the synchronization loops. """
+        return sum(slot.cost / slot.period
+                   for slot in self.slots if slot.cost is not None)
+
+    @property
+    def stats(self):
+        """ Deadline accounting of each slot (from the highest to the lowest frequency). """
+        return [slot.stats for slot in self.slots]
+
+    def setup(self):
+        [c.setup() for c in self.controllers]
+
+    def teardown(self):
+        [c.teardown() for c in self.controllers]
+
+    def run(self):
+        self._reset_releases()
+
+        while not self.should_stop():
+            if self.should_pause():
+                self.wait_to_resume()
+                self._reset_releases()
+                continue
+
+            now = time.monotonic()
+
+            # Slots are sorted by period: the first one due has the highest priority
+            for slot in self.slots:
+                if slot.release <= now:
+                    self._run_slot(slot, now)
+                    break
+            else:
+                next_release = min([slot.release for slot in self.slots] or [now + self.max_sleep])
+                time.sleep(min(next_release - now, self.max_sleep))
+
+    def _reset_releases(self):
+        now = time.monotonic()
+        for slot in self.slots:
+            slot.release = now
+            slot.last_run = None
+
+    def _run_slot(self, slot, now):
+        slot.max_lateness = max(slot.max_lateness, now - slot.release)
+
+        fastest = slot is self.slots[0]
+        if fastest:
+            self._updated.clear()
+
+        interval = now - slot.last_run if slot.last_run is not None else None
+        slot.last_run = now
+
+        for c in list(slot.controllers):
+            start = time.monotonic()
+            try:
+                c.update()
+            except Exception:
+                # As a crashed loop thread would, the loop stops but the others keep running
+                logger.exception('Synchronization loop "%s" crashed', c.varname)
+                self.detach(c)
+                continue
+
+            c.loop_stats.record(start - slot.release, time.monotonic() - start, interval)
+
+        if fastest:
+            self._updated.set()
+
+        end = time.monotonic()
+        cost = end - now
+        slot.cost = cost if slot.cost is None else 0.9 * slot.cost + 0.1 * cost
+        slot.runs += 1
+
+        deadline = slot.release + slot.period
+        if end > deadline:
+            slot.missed += 1
+            for c in slot.controllers:
+                c.loop_stats.overruns += 1
+
+        # Keeps at most one pending release, the others are skipped
+        slot.release = deadline
+        if end >= slot.release + slot.period:
+            n = int((end - slot.release) // slot.period)
+            slot.skipped += n
+            slot.release += n * slot.period
+            for c in slot.controllers:
+                c.loop_stats.skipped += n
+
+        self._check_budget()
+
+    def _check_budget(self):
+        if self._budget_warned or any(slot.cost is None for slot in self.slots):
+            return
+
+        utilization = self.utilization
+        if utilization > self.budget:
+            self._budget_warned = True
+            logger.warning('Bus utilization of %.0f%% on %s exceeds the %.0f%% budget, '
+                           'the synchronization loops frequencies can not be met.',
+                           100 * utilization, self.io.port, 100 * self.budget)
+
+
+class ScheduledLightDxlController(ScheduledDxlController):
+    """ Single thread version of :class:`LightDxlController` (see :class:`ScheduledDxlController`). """
+    meta_controller = LightDxlController
@@ -1,47 +1,214 @@
 import logging
 import numpy
 
-from collections import defaultdict
-from functools import partial
+from collections import OrderedDict, defaultdict
 from threading import Lock
 
+from ..utils import pypot_time as time
 from ..utils.stoppablethread import StoppableLoopThread
+from .primitive import combined_registers
 
 
 logger = logging.getLogger(__name__)
 
+modes = ('blend', 'mean', 'weighted_mean', 'priority', 'sum', 'max', 'min')
+blend_modes = ('mean', 'override', 'offset', 'min', 'max')
+
+
+def combine(values, mask, mode='mean', weights=None, priorities=None):
+    """ Combines the requests of several primitives for all the motors and registers at once.
+
+        :param values: array (primitives, motors, registers) of the requested values
+        :param mask: boolean array of the same shape (True where a value is requested)
+        :param str mode: 'mean', 'weighted_mean' (mean weighted by the primitives weights), 'priority' (mean of the requests of the highest priority primitives), 'sum', 'max' or 'min'
+        :param weights: weight of each primitive (used by 'weighted_mean')
+        :param priorities: priority of each primitive (used by 'priority')
+        :return: the combined values (motors, registers) and a boolean array telling where they are defined
+
+        """
+    valid = mask.any(axis=0)
+
+    if mode in ('max', 'min'):
+        reduce, fill = (numpy.max, -numpy.inf) if mode == 'max' else (numpy.min, numpy.inf)
+        return reduce(numpy.where(mask, values, fill), axis=0), valid
+
+    if mode == 'sum':
+        return numpy.where(mask, values, 0.0).sum(axis=0), valid
+
+    if mode == 'mean':
+        w = mask.astype(float)
+    elif mode == 'weighted_mean':
+        w = mask * numpy.asarray(weights, dtype=float)[:, None, None]
+    elif mode == 'priority':
+        p = numpy.where(mask, numpy.asarray(priorities, dtype=float)[:, None, None], -numpy.inf)
+        w = (mask & (p == p.max(axis=0))).astype(float)
+    else:
+        raise ValueError('Unknown combination mode {} (should be in {})'.format(mode, modes))
+
+    total = w.sum(axis=0)
+    valid &= total > 0
+
+    combined = (numpy.where(w > 0, values, 0.0) * w).sum(axis=0) / numpy.where(total > 0, total, 1.0)
+    return combined, valid
+
+
+def blend(layers, nb_motors, nb_registers):
+    """ Blends the requests of several primitives for all the motors and registers.
+
+        The 'mean' requests are first averaged (weighted) into a base value. The other layers are then applied in turn on the base:
+
+        * 'override' replaces it (cross-faded when the weight is lower than 1),
+        * 'offset' adds its value (multiplied by the weight),
+        * 'min' (resp. 'max') clamps it to at most (resp. at least) its value (cross-faded when the weight is lower than 1).
+
+        An override without base is used as is, offsets and clamps without base are ignored.
+
+        :param list layers: (blend mode, values, mask, weights) of each primitive by increasing priority, where values and mask are arrays (motors, registers) and weights an array (motors, ) of the effective weights of the requests
+        :return: the blended values (motors, registers) and a boolean array telling where they are defined
+
+        """
+    shape = (nb_motors, nb_registers)
+
+    means = [l for l in layers if l[0] == 'mean']
+    if means:
+        values = numpy.stack([l[1] for l in means])
+        w = numpy.stack([l[2] for l in means]) * numpy.stack([l[3] for l in means])[:, :, None]
+
+        total = w.sum(axis=0)
+        defined = total > 0
+        base = (numpy.where(w > 0, values, 0.0) * w).sum(axis=0) / numpy.where(defined, total, 1.0)
+    else:
+        base = numpy.zeros(shape)
+        defined = numpy.zeros(shape, dtype=bool)
+
+    for mode, values, mask, weights in layers:
+        if mode == 'mean':
+            continue
+
+        r = numpy.minimum(weights, 1.0)[:, None]
+
+        if mode == 'override':
+            mixed = numpy.where(defined, base + r * (values - base), values)
+            base = numpy.where(mask, mixed, base)
+            defined = defined | mask
+            continue
+
+        on = mask & defined
+        if mode == 'offset':
+            target = base + weights[:, None] * values
+        elif mode == 'min':
+            target = base + r * (numpy.minimum(base, values) - base)
+        elif mode == 'max':
+            target = base + r * (numpy.maximum(base, values) - base)
+        else:
+            raise ValueError('Unknown blend mode {} (should be in {})'.format(mode, blend_modes))
+
+        base = numpy.where(on, target, base)
+
+    return base, defined
+
+
+class _Layer(object):
+    """ Blending settings of a primitive, compiled when it starts. """
+    def __init__(self, primitive, motors, order):
+        if primitive.blend not in blend_modes:
+            raise ValueError('Unknown blend mode {} (should be in {})'.format(primitive.blend,
+                                                                             blend_modes))
+        self.primitive = primitive
+        self.blend = primitive.blend
+        self.priority = primitive.priority
+        self.ramp = float(primitive.ramp)
+        self.order = order
+
+        motor_weights = primitive.motor_weights or {}
+        self.weights = primitive.weight * numpy.array([motor_weights.get(m.name, 1.0)
+                                                       for m in motors])
+
+        self.values = primitive.robot._values
+        self.mask = primitive.robot._mask
+
+        self.start = time.time()
+        self.stop = None
+
+    def fade_out(self):
+        # the last requests of the primitive keep fading out after it stopped
+        now = time.time()
+
+        self.values = self.values.copy()
+        self.mask = self.mask.copy()
+        self._from = self.factor(now)
+        self.stop = now
+
+    def factor(self, now):
+        if self.ramp <= 0:
+            return 1.0 if self.stop is None else 0.0
+        if self.stop is None:
+            return min((now - self.start) / self.ramp, 1.0)
+        return max(self._from - (now - self.stop) / self.ramp, 0.0)
+
 
 class PrimitiveManager(StoppableLoopThread):
     """ Combines all :class:`~pypot.primitive.primitive.Primitive` orders and affect them to the real motors.
 
         At a predefined frequency, the manager gathers all the orders sent by the primitive to the "fake" motors, combined them thanks to the filter function and affect them to the "real" motors.
 
+        By default, the requests are blended according to the priority, weights, blend mode and ramp of each primitive (see :class:`~pypot.primitive.primitive.Primitive` and :func:`blend`). The requests of a primitive with a ramp fade in when it starts and fade out (from its last requests) when it stops.
+
+        The filter can also be another combination mode (see :func:`combine`) or a function combining the list of requests of a register (e.g. numpy.mean). With a mode, the numerical requests of the goal position, moving speed and torque limit are kept by the primitives in dense arrays, combined for all the motors in a single pass and affected at each update. The other requests (e.g. compliant or pid) are combined one by one: with the 'blend' and 'priority' modes only the highest priority primitives are kept, then the requests are averaged (or summed, or their max/min is taken, for these modes).
+
         .. note:: The primitives are automatically added (resp. removed) to the manager when they are started (resp. stopped).
 
         """
-    def __init__(self, motors, freq=50, filter=partial(numpy.mean, axis=0)):
+    def __init__(self, motors, freq=50, filter='blend'):
         """
         :param motors: list of real motors used by the attached primitives
         :type motors: list of :class:`~pypot.dynamixel.motor.DxlMotor`
         :param int freq: update frequency
-        :param func filter: function used to combine the different request (default mean)
+        :param filter: 'blend', combination mode (see :func:`combine`) or function used to combine the different request
 
         """
         StoppableLoopThread.__init__(self, freq)
 
+        if not callable(filter) and filter not in modes:
+            raise ValueError('Unknown combination mode {} (should be in {})'.format(filter, modes))
+
         self._prim = []
         self._motors = motors
         self._filter = filter
 
+        # blending layers of the running (resp. stopping) primitives
+        self._layers = OrderedDict()
+        self._fading = []
+        self._sorted_layers = []
+        self._nb_layers = 0
+
         self.syncing = Lock()
 
     def add(self, p):
         """ Add a primitive to the manager. The primitive automatically attached itself when started. """
-        self._prim.append(p)
+        layer = _Layer(p, self._motors, self._nb_layers)
+
+        with self.syncing:
+            self._nb_layers += 1
+            self._layers[p] = layer
+            self._sort_layers()
+
+            self._prim.append(p)
 
     def remove(self, p):
         """ Remove a primitive from the manager. The primitive automatically remove itself when stopped. """
-        self._prim.remove(p)
+        with self.syncing:
+            self._prim.remove(p)
+
+            layer = self._layers.pop(p, None)
+            if layer is not None and layer.ramp > 0:
+                layer.fade_out()
+                self._fading.append(layer)
+            self._sort_layers()
+
+    def _sort_layers(self):
+        self._sorted_layers = sorted(list(self._layers.values()) + self._fading,
+                                     key=lambda l: (l.priority, l.order))
 
     @property
     def primitives(self):
@@ -51,28 +218,100 @@ class PrimitiveManager(StoppableLoopThread):
     def update(self):
         """ Combined at a predefined frequency the request orders and affect them to the real motors. """
         with self.syncing:
-            for m in self._motors:
-                to_set = defaultdict(list)
-
-                for p in self._prim:
-                    for key, val in getattr(p.robot, m.name)._to_set.items():
-                        to_set[key].append(val)
-
-                for key, val in to_set.items():
-                    if key == 'led':
-                        colors = set(val)
-                        if len(colors) > 1:
-                            colors -= {'off'}
-                        filtred_val = colors.pop()
-                    else:
-                        filtred_val = self._filter(val)
-
-                    logger.debug('Combined %s.%s from %s to %s',
-                                 m.name, key, val, filtred_val)
-                    setattr(m, key, filtred_val)
+            if callable(self._filter):
+                self._update_filter()
+            else:
+                self._update_combined()
 
             [p._synced.set() for p in self._prim]
 
+    def _update_combined(self):
+        prims = list(self._prim)
+
+        # the other requests (e.g. compliant) are affected first as they may change the goal position
+        others = defaultdict(list)
+        for p in prims:
+            for i in list(p.robot._other_requests):
+                for key, val in p.robot._motors[i]._to_set.others():
+                    others[i, key].append((p, val))
+
+        for (i, key), requests in others.items():
+            setattr(self._motors[i], key, self._combine_others(key, requests))
+
+        if self._filter == 'blend':
+            if not self._sorted_layers:
+                return
+            combined, valid = self._blend()
+        else:
+            if not prims:
+                return
+
+            values = numpy.stack([p.robot._values for p in prims])
+            mask = numpy.stack([p.robot._mask for p in prims])
+
+            combined, valid = combine(values, mask, self._filter,
+                                      [p.weight for p in prims], [p.priority for p in prims])
+
+        # all the combined values are affected at each update (unchanged values are not written on the bus by the controllers)
+        for i, k in zip(*numpy.nonzero(valid)):
+            m, key = self._motors[i], combined_registers[k]
+            logger.debug('Combined %s.%s to %s', m.name, key, combined[i, k])
+            setattr(m, key, combined[i, k])
+
+    def _blend(self):
+        now = time.time()
+
+        if self._fading:
+            fading = [l for l in self._fading if l.factor(now) > 0]
+            if len(fading) != len(self._fading):
+                self._fading = fading
+                self._sort_layers()
+
+        layers = [(l.blend, l.values, l.mask, l.weights * l.factor(now))
+                  for l in self._sorted_layers]
+        return blend(layers, len(self._motors), len(combined_registers))
+
+    def _combine_others(self, key, requests):
+        if self._filter in ('blend', 'priority'):
+            top = max(p.priority for p, _ in requests)
+            requests = [(p, val) for p, val in requests if p.priority == top]
+
+        val = [v for _, v in requests]
+
+        if key == 'led':
+            return self._combine_leds(val)
+        elif self._filter == 'sum':
+            return numpy.sum(val, axis=0)
+        elif self._filter == 'max':
+            return numpy.max(val, axis=0)
+        elif self._filter == 'min':
+            return numpy.min(val, axis=0)
+        return numpy.mean(val, axis=0)
+
+    def _combine_leds(self, val):
+        colors = set(val)
+        if len(colors) > 1:
+            colors -= {'off'}
+        return colors.pop()
+
+    def _update_filter(self):
+        for m in self._motors:
+            to_set = defaultdict(list)
+
+            for p in self._prim:
+                for key, val in getattr(p.robot, m.name)._to_set.items():
+                    to_set[key].append(val)
+
+            for key, val in to_set.items():
+                if key == 'led':
+                    filtred_val = self._combine_leds(val)
+                else:
+                    filtred_val = self._filter(val)
+
+                logger.debug('Combined %s.%s from %s to %s',
+                             m.name, key, val, filtred_val)
+                setattr(m, key, filtred_val)
+
     def stop(self):
         """ Stop the primitive manager. """
         for p in self.primitives[:]:
@@ -3,10 +3,12 @@
 import json
 import time
 import logging
+import threading
 import numpy as np
 
+from . import move_format
 from .primitive import LoopPrimitive
-from pypot.utils.interpolation import KDTreeDict
+from pypot.utils.interpolation import KDTreeDict, Trajectory
 logger = logging.getLogger(__name__)
 
 
@@ -16,60 +18,152 @@ class Move(object):
 
     This class simply wraps a sequence of positions of specified motors. The sequence must be recorded at a predefined frequency. This move can be recorded through the :class:`~pypot.primitive.move.MoveRecorder` class and played thanks to a :class:`~pypot.primitive.move.MovePlayer`.
 
+    A move is either stored as a dict of timed positions (see :meth:`add_position`) or as columnar frames (see :meth:`from_array`), e.g. memory-mapped from a binary move file (see :meth:`load_binary`).
+
     """
 
     def __init__(self, freq):
         self._framerate = freq
         self._timed_positions = KDTreeDict()
 
+        self._motors = None
+        self._frames = None
+
     def __repr__(self):
         return '<Move framerate={} #keyframes={}>'.format(self.framerate,
-                                                          len(self.positions()))
+                                                          len(self))
+
+    def __len__(self):
+        if self._frames is not None:
+            return len(self._frames)
+        return len(self._timed_positions)
 
     def __getitem__(self, i):
+        if self._frames is not None:
+            return (range(len(self))[i] / self.framerate, self._frame(self._frames[i]))
         return list(self._timed_positions.items())[i]
 
     @property
     def framerate(self):
         return self._framerate
 
+    @property
+    def motors(self):
+        """ Names of the motors of the move. """
+        if self._frames is not None:
+            return list(self._motors)
+        return self.to_array()[0]
+
+    def _frame(self, frame):
+        return dict(zip(self._motors, map(tuple, frame.tolist())))
+
     def add_position(self, pos, time):
         """ Add a new position to the movement sequence.
 
         Each position is typically stored as a dict of (time, (motor_name,motor_position)).
         """
+        if self._frames is not None:
+            self.positions()
+            self._motors, self._frames = None, None
+
         self._timed_positions[time] = pos
 
     def iterpositions(self):
         """ Returns an iterator on the stored positions. """
+        if self._frames is not None:
+            return (self[i] for i in range(len(self)))
         return self._timed_positions.items()
 
     def positions(self):
-        """ Returns a copy of the stored positions. """
+        """ Returns a copy of the stored positions.
+
+        .. note:: For a move stored as columnar frames, the dict of timed positions is built (and kept) at the first call, which loads the whole move in memory.
+        """
+        if self._timed_positions is None:
+            positions = KDTreeDict()
+            for t, pos in self.iterpositions():
+                positions[t] = pos
+            self._timed_positions = positions
+
         return self._timed_positions
 
-    def plot(self, ax):
-        pos = self.positions()
+    def to_array(self):
+        """ Returns the columnar version of the move.
 
-        if not pos:
-            return
+        The timed positions are resampled on the regular grid of the framerate (frame i is at time i / framerate).
+
+        :return: the names of the motors and a float32 array of shape (frames, motors, 2) holding the position and speed of each motor
+        """
+        if self._frames is not None:
+            return list(self._motors), self._frames
+
+        motors, t, values = self._timed_array()
+        if not len(t):
+            return [], np.zeros((0, 0, 2), dtype=np.float32)
+
+        grid = np.arange(len(t)) / self.framerate
+        frames = np.empty(values.shape, dtype=np.float32)
+        for i in range(len(motors)):
+            for j in range(2):
+                frames[:, i, j] = np.interp(grid, t, values[:, i, j])
+
+        return motors, frames
 
-        motors = list(pos[0].keys())
+    def _timed_array(self):
+        # motors names, sorted times and values (times, motors, 2) of the timed positions
+        timed = sorted(((float(t), pos) for t, pos in self._timed_positions.items()),
+                       key=lambda tp: tp[0])
+        if not timed:
+            return [], np.zeros(0), np.zeros((0, 0, 2))
 
-        n = len(pos)
-        t = np.linspace(0, n / self.framerate, n)
-        pos = self.positions()
+        motors = list(timed[0][1].keys())
+        t = np.array([tt for tt, _ in timed])
+        values = np.array([[pos[m][:2] for m in motors] for _, pos in timed], dtype=float)
 
-        p = {}
-        for name in motors:
-            p[name] = []
+        return motors, t, values
 
-        for tt in t:
-            for k, v in pos[float(tt)].items():
-                p[k].append(v[0])
+    def trajectory(self, mode='linear'):
+        """ Returns the motors names and the :class:`~pypot.utils.interpolation.Trajectory` of the move.
+
+        The trajectory interpolates the position and speed of all the motors at once (in the motors order). Columnar moves are used directly (without loading them in memory), timed positions are used at their recorded times.
+
+        :param str mode: interpolation mode ('linear' or 'cubic')
+        """
+        if self._frames is not None:
+            return list(self._motors), Trajectory.uniform(self.framerate, self._frames, mode)
 
-        for name in motors:
-            ax.plot(t, p[name])
+        motors, t, values = self._timed_array()
+        return motors, Trajectory(t, values, mode)
+
+    @classmethod
+    def from_array(cls, framerate, motors, frames):
+        """ Creates a :class:`~pypot.primitive.move.Move` from columnar frames.
+
+        :param float framerate: framerate of the move
+        :param list motors: names of the motors
+        :param frames: array of shape (frames, motors, 2) holding the position and speed of each motor (frame i is at time i / framerate)
+        """
+        frames = np.asanyarray(frames)
+        if frames.ndim != 3 or frames.shape[1:] != (len(motors), 2):
+            raise ValueError('frames of shape {} do not match {} motors'.format(frames.shape,
+                                                                                len(motors)))
+
+        move = cls(framerate)
+        move._timed_positions = None
+        move._motors = list(motors)
+        move._frames = frames
+        return move
+
+    def plot(self, ax):
+        motors, frames = self.to_array()
+
+        if not len(frames):
+            return
+
+        t = np.arange(len(frames)) / self.framerate
+
+        for i in range(len(motors)):
+            ax.plot(t, frames[:, i, 0])
 
         ax.legend(motors)
         ax.set_xlabel('Time (in s)')
@@ -78,14 +172,22 @@ class Move(object):
     def save(self, file):
         """ Saves the :class:`~pypot.primitive.move.Move` to a json file.
 
-        .. note:: The format used to store the :class:`~pypot.primitive.move.Move` is extremely verbose and should be obviously optimized for long moves.
+        .. note:: The format used to store the :class:`~pypot.primitive.move.Move` is extremely verbose, long moves should rather be saved with :meth:`save_binary`.
         """
         d = {
             'framerate': self.framerate,
-            'positions': self._timed_positions,
+            'positions': self.positions() if self._frames is None else dict(self.iterpositions()),
         }
         json.dump(d, file, indent=2)
 
+    def save_binary(self, path):
+        """ Saves the :class:`~pypot.primitive.move.Move` to a binary move file (see :mod:`~pypot.primitive.move_format`).
+
+        The timed positions are resampled on the regular grid of the framerate (see :meth:`to_array`).
+        """
+        motors, frames = self.to_array()
+        move_format.write(path, self.framerate, motors, frames)
+
     @classmethod
     def create(cls, d):
         """ Create a :class:`~pypot.primitive.move.Move` from a dictionary. """
@@ -105,6 +207,14 @@ class Move(object):
         d = json.loads(str)
         return cls.create(d)
 
+    @classmethod
+    def load_binary(cls, path, mmap=True):
+        """ Loads a :class:`~pypot.primitive.move.Move` from a binary move file.
+
+        :param bool mmap: whether to memory-map the frames (they are only read from the disk when played) or to load them in memory
+        """
+        return cls.from_array(*move_format.read(path, mmap))
+
 
 class MoveRecorder(LoopPrimitive):
 
@@ -112,28 +222,64 @@ class MoveRecorder(LoopPrimitive):
 
     The recording can be :meth:`~pypot.primitive.primitive.Primitive.start` and :meth:`~pypot.primitive.primitive.Primitive.stop` by using the :class:`~pypot.primitive.primitive.LoopPrimitive` methods.
 
+    If a filename is given, the frames are streamed to this binary move file (see :class:`~pypot.primitive.move_format.MoveFileWriter`) instead of being kept in memory, so long recordings use a constant amount of memory. The frames are placed on the regular grid of the framerate: a frame is repeated if update ticks were skipped. The recorded :attr:`move` is then read from the file (once the recording is stopped, it is memory-mapped from the file written by the recorder).
+
     .. note:: Re-starting the recording will create a new :class:`~pypot.primitive.move.Move` losing all the previously stored data.
 
+    .. note:: When streaming, the tracked motors are fixed at the start of the recording (see :meth:`add_tracked_motors`).
+
     """
 
-    def __init__(self, robot, freq, tracked_motors):
+    def __init__(self, robot, freq, tracked_motors, filename=None, chunk_size=256):
         LoopPrimitive.__init__(self, robot, freq)
         self.freq = freq
         self.tracked_motors = list(map(self.get_mockup_motor, tracked_motors))
         self._move = Move(self.freq)
 
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self._writer = None
+        self._closing = threading.Lock()
+
     def setup(self):
         self._move = Move(self.freq)
+        if self.filename is None:
+            return
+
+        self._recorded_motors = list(self.tracked_motors)
+        self._writer = move_format.MoveFileWriter(self.filename, self.freq,
+                                                  [m.name for m in self._recorded_motors],
+                                                  self.chunk_size)
+        self._frame = np.empty((len(self._recorded_motors), 2), dtype=np.float32)
 
     def update(self):
-        position = dict([(m.name, (m.present_position, m.present_speed))
-                         for m in self.tracked_motors])
-        self._move.add_position(position, self.elapsed_time)
+        if self._writer is None:
+            position = dict([(m.name, (m.present_position, m.present_speed))
+                             for m in self.tracked_motors])
+            self._move.add_position(position, self.elapsed_time)
+            return
+
+        for i, m in enumerate(self._recorded_motors):
+            self._frame[i] = (m.present_position, m.present_speed)
+
+        missing = int(round(self.elapsed_time * self.freq)) + 1 - self._writer.nb_frames
+        for _ in range(max(missing, 1)):
+            self._writer.append(self._frame)
+
+    def teardown(self):
+        with self._closing:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._move = Move.load_binary(self.filename)
 
     @property
     def move(self):
         """ Returns the currently recorded :class:`~pypot.primitive.move.Move`. """
-        return self._move
+        with self._closing:
+            if self._writer is not None:
+                return Move.load_binary(self._writer.partial_path, mmap=False)
+            return self._move
 
     def add_tracked_motors(self, tracked_motors):
         """Add new motors to the recording"""
@@ -147,16 +293,23 @@ class MovePlayer(LoopPrimitive):
 
     The playing can be :meth:`~pypot.primitive.primitive.Primitive.start` and :meth:`~pypot.primitive.primitive.Primitive.stop` by using the :class:`~pypot.primitive.primitive.LoopPrimitive` methods.
 
+    The positions are interpolated (see :meth:`~pypot.primitive.move.Move.trajectory`) with the interpolation mode ('linear' or 'cubic').
+
     .. warning:: the primitive is run automatically the same framerate than the move record.
         The play_speed attribute change only time lockup/interpolation
     """
 
-    def __init__(self, robot, move=None, play_speed=1.0, move_filename=None, start_max_speed=50, **kwargs):
+    def __init__(self, robot, move=None, play_speed=1.0, move_filename=None, start_max_speed=50,
+                 interpolation='linear', **kwargs):
         self.move = move
+        self.interpolation = interpolation
         self.backwards = False
         if move_filename is not None:
-            with open(move_filename, 'r') as f:
-                self.move = Move.load(f)
+            if move_format.is_move_file(move_filename):
+                self.move = Move.load_binary(move_filename)
+            else:
+                with open(move_filename, 'r') as f:
+                    self.move = Move.load(f)
         self.play_speed = play_speed if play_speed != 0 and isinstance(play_speed, float) else 1.0
         framerate = self.move.framerate if self.move is not None else 50.0
         self.start_max_speed = start_max_speed if start_max_speed != 0 else np.inf
@@ -168,7 +321,8 @@ class MovePlayer(LoopPrimitive):
         if self.move is None:
             raise AttributeError("Attribute move is not defined")
         self.period = 1.0 / self.move.framerate
-        self.positions = self.move.positions()
+        self._motors, self._trajectory = self.move.trajectory(self.interpolation)
+        self._played_motors = [getattr(self.robot, m) for m in self._motors]
         self.__duration = self.duration()
         if self.play_speed < 0:
             self.play_speed = - self.play_speed
@@ -179,9 +333,9 @@ class MovePlayer(LoopPrimitive):
         # Quick fix for limiting too fast movements at the play start
         max_goto_time = 0
         if self.backwards:
-            position = self.positions[self.__duration]
+            position = self._position_at(self.__duration)
         else:
-            position = self.positions[0]
+            position = self._position_at(0)
         for motor, value in position.items():
             motor = getattr(self.robot, motor)
             motor.compliant = False
@@ -196,20 +350,25 @@ class MovePlayer(LoopPrimitive):
     def update(self):
         if self.elapsed_time < self.__duration:
             if self.backwards:
-                position = self.positions[(self.__duration - self.elapsed_time) * self.play_speed]
+                t = (self.__duration - self.elapsed_time) * self.play_speed
             else:
-                position = self.positions[self.elapsed_time * self.play_speed]
+                t = self.elapsed_time * self.play_speed
+
+            positions = self._trajectory(t)[:, 0].tolist()
 
-            for motor, value in position.items():
+            for motor, position in zip(self._played_motors, positions):
                 # TODO: Ask pierre if its not a fgi to turn off the compliance
-                getattr(self.robot, motor).compliant = False
-                getattr(self.robot, motor).goal_position = value[0]
+                motor.compliant = False
+                motor.goal_position = position
         else:
             self.stop()
 
+    def _position_at(self, t):
+        return dict(zip(self._motors, self._trajectory(t).tolist()))
+
     def duration(self):
 
         if self.move is not None:
-            return (len(self.move.positions()) / self.move.framerate) / self.play_speed
+            return (len(self.move) / self.move.framerate) / self.play_speed
         else:
             return 1.0
@@ -0,0 +1,248 @@
+""" Compact binary format of the :class:`~pypot.primitive.move.Move`.
+
+    A binary move file is made of:
+
+        * the magic bytes b'PYPOTMOV',
+        * the length of the header (little-endian uint32),
+        * the header: a utf-8 json dict {'version', 'framerate', 'motors', 'fields'} (padded with spaces so the data is aligned on 64 bytes),
+        * the frames: a contiguous little-endian float32 array of shape (frames, motors, 2) holding the position and speed of each motor (frame i is at time i / framerate).
+
+    The number of frames is not stored but deduced from the size of the file: the frames can thus be appended to an existing file and a partially written last frame is ignored.
+
+    The files are never overwritten in place (which would break the moves memory-mapped from them): they are written to a temporary file next to them, which then replaces them.
+
+    """
+import os
+import json
+import queue
+import struct
+import logging
+import threading
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PYPOTMOV'
+VERSION = 1
+FIELDS = ('position', 'speed')
+
+dtype = np.dtype('<f4')
+
+_length = struct.Struct('<I')
+_alignment = 64
+
+
+def is_move_file(path):
+    """ Checks whether a file is a binary move file. """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except IOError:
+        return False
+
+
+def write_header(f, framerate, motors):
+    """ Writes the header of a binary move file at the current position of f (opened in binary mode).
+
+        :return: the offset of the frames in the file
+
+        """
+    header = json.dumps({
+        'version': VERSION,
+        'framerate': framerate,
+        'motors': list(motors),
+        'fields': list(FIELDS),
+    }).encode('utf-8')
+
+    start = len(MAGIC) + _length.size
+    padding = -(start + len(header)) % _alignment
+    header += b' ' * padding
+
+    f.write(MAGIC)
+    f.write(_length.pack(len(header)))
+    f.write(header)
+
+    return start + len(header)
+
+
+def read_header(f):
+    """ Reads the header of a binary move file from the beginning of f (opened in binary mode).
+
+        :return: the header dict and the offset of the frames in the file
+
+        """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('{} is not a binary move file'.format(getattr(f, 'name', f)))
+
+    (length, ) = _length.unpack(f.read(_length.size))
+    header = json.loads(f.read(length).decode('utf-8'))
+
+    if header.get('version') != VERSION:
+        raise ValueError('Unsupported binary move version {}'.format(header.get('version')))
+
+    return header, len(MAGIC) + _length.size + length
+
+
+def partial_path(path):
+    """ Path of the temporary file used while writing path. """
+    return path + '.part'
+
+
+def write(path, framerate, motors, frames):
+    """ Writes a binary move file.
+
+        :param str path: path of the file
+        :param float framerate: framerate of the move
+        :param list motors: names of the motors
+        :param frames: array-like of shape (frames, motors, 2)
+
+        """
+    frames = np.ascontiguousarray(frames, dtype=dtype)
+
+    with open(partial_path(path), 'wb') as f:
+        write_header(f, framerate, motors)
+        f.write(frames.tobytes())
+
+    os.replace(partial_path(path), path)
+
+
+def read(path, mmap=True):
+    """ Reads a binary move file.
+
+        :param str path: path of the file
+        :param bool mmap: whether to memory-map the frames (read-only, nothing is loaded until used) or to load them in memory
+        :return: the framerate, the names of the motors and the frames (array of shape (frames, motors, 2))
+
+        """
+    with open(path, 'rb') as f:
+        header, offset = read_header(f)
+        size = os.fstat(f.fileno()).st_size
+
+    motors = header['motors']
+    frame_size = len(motors) * len(FIELDS) * dtype.itemsize
+    nb_frames = (size - offset) // frame_size if frame_size else 0
+    shape = (nb_frames, len(motors), len(FIELDS))
+
+    if nb_frames == 0:
+        frames = np.zeros(shape, dtype=dtype)
+    elif mmap:
+        frames = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    else:
+        frames = np.fromfile(path, dtype=dtype, count=int(np.prod(shape)),
+                             offset=offset).reshape(shape)
+
+    return header['framerate'], motors, frames
+
+
+class MoveFileWriter(object):
+    """ Appends frames to a binary move file with bounded memory.
+
+    The frames are copied into preallocated chunks. Each full chunk is handed to a background thread which appends it to the file (and syncs it on the disk), then gives it back for reuse. At most max_pending chunks wait to be written (:meth:`append` blocks when the disk is that slow), so the memory used does not depend on the length of the recording.
+
+    The frames are appended to a temporary file (see :func:`partial_path`) which replaces the file when the writer is closed. As it is append-only and its number of frames deduced from its size, it can be read at any time (see :func:`read`): after a crash, only the frames not yet written (the current chunk and the pending ones) are lost.
+
+    """
+    def __init__(self, path, framerate, motors, chunk_size=256, max_pending=2):
+        """
+        :param str path: path of the file (overwritten)
+        :param float framerate: framerate of the move
+        :param list motors: names of the motors
+        :param int chunk_size: number of frames per chunk
+        :param int max_pending: number of full chunks which can wait to be written
+
+        """
+        self.path = path
+        self.partial_path = partial_path(path)
+        self.motors = list(motors)
+        self.chunk_size = chunk_size
+
+        self._file = open(self.partial_path, 'wb')
+        write_header(self._file, framerate, self.motors)
+        self._file.flush()
+
+        self._shape = (chunk_size, len(self.motors), len(FIELDS))
+        self._chunk = np.empty(self._shape, dtype=dtype)
+        self._length = 0
+        self._nb_frames = 0
+
+        self._pending = queue.Queue(max_pending)
+        self._free = queue.Queue()
+        self._error = None
+
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name='MoveFileWriter({})'.format(path))
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def nb_frames(self):
+        """ Number of frames appended so far (written or not). """
+        return self._nb_frames
+
+    def append(self, frame):
+        """ Appends a frame: an array-like of shape (motors, 2) holding the position and speed of each motor. """
+        self._check()
+
+        self._chunk[self._length] = frame
+        self._length += 1
+        self._nb_frames += 1
+
+        if self._length == self.chunk_size:
+            self._submit()
+
+    def flush(self):
+        """ Hands the current (partial) chunk to the writer. """
+        if self._length:
+            self._submit()
+
+    def close(self):
+        """ Writes the remaining frames, closes the file and moves it to its path. """
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._pending.put(None)
+        self._writer.join()
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _submit(self):
+        self._pending.put((self._chunk, self._length))
+
+        try:
+            self._chunk = self._free.get_nowait()
+        except queue.Empty:
+            self._chunk = np.empty(self._shape, dtype=dtype)
+        self._length = 0
+
+    def _check(self):
+        if self._error is not None:
+            raise IOError('Could not write the move file {}: {}'.format(self.path, self._error))
+
+    def _write_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+
+            chunk, length = item
+            if self._error is None:
+                try:
+                    self._file.write(chunk[:length].tobytes())
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except (IOError, OSError) as e:
+                    logger.exception('Could not write the move file %s', self.path)
+                    self._error = e
+
+            self._free.put(chunk)
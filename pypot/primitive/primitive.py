@@ -1,6 +1,7 @@
 import sys
 
 import numpy
+import numbers
 import logging
 import threading
 
@@ -8,11 +9,16 @@ from collections import deque
 
 from ..utils import pypot_time as time
 
-from ..utils.stoppablethread import StoppableThread, make_update_loop
-from ..utils.trajectory import GotoMinJerk
+from ..utils.stoppablethread import (StoppableThread, make_update_loop,
+                                     LoopOverrunPolicy, LoopStats)
+from ..utils.trajectory import GotoMinJerk, goto_group
 
 logger = logging.getLogger(__name__)
 
+# Registers whose requests are kept in dense arrays and combined at once by the PrimitiveManager
+combined_registers = ('goal_position', 'moving_speed', 'torque_limit')
+_register_index = {r: i for i, r in enumerate(combined_registers)}
+
 
 class Primitive(StoppableThread):
     """ A Primitive is an elementary behavior that can easily be combined to create more complex behaviors.
@@ -38,10 +44,25 @@ class Primitive(StoppableThread):
 
         .. note:: This class should always be extended to define your particular behavior in the :meth:`~pypot.primitive.primitive.Primitive.run` method.
 
+        The following class attributes define how the requests of a primitive are combined with the other ones (see :class:`~pypot.primitive.manager.PrimitiveManager`):
+
+        * priority: the requests of higher priority primitives are applied last (and win with the 'priority' combination mode),
+        * weight: weight of the requests (multiplied by the weight of the motor in motor_weights, a dict {motor name: weight}),
+        * blend: how the requests are blended with the ones of the other primitives ('mean', 'override', 'offset', 'min' or 'max', see :func:`~pypot.primitive.manager.blend`),
+        * ramp: duration (in seconds) of the fade in (resp. out) of the requests when the primitive starts (resp. stops).
+
+        The blend mode, motor weights and ramp are read when the primitive starts.
+
         """
     methods = ['start', 'stop', 'pause', 'resume']
     properties = []
 
+    priority = 0
+    weight = 1.0
+    motor_weights = None
+    blend = 'mean'
+    ramp = 0.0
+
     def __init__(self, robot):
         """ At instantiation, it automatically transforms the :class:`~pypot.robot.robot.Robot` into a :class:`~pypot.primitive.primitive.MockupRobot`.
 
@@ -163,6 +184,8 @@ class LoopPrimitive(Primitive):
 
         You should write your own subclass where you only defined the :meth:`~pypot.primitive.primitive.LoopPrimitive.update` method.
 
+        By default, each primitive runs in its own thread. When its executor is set (e.g. to :func:`~pypot.utils.executor.default_executor`), its updates are run by this shared executor instead, while its setup and teardown run on the executor workers. The update method must then be short and never block.
+
         """
     def __init__(self, robot, freq):
         Primitive.__init__(self, robot)
@@ -170,6 +193,11 @@ class LoopPrimitive(Primitive):
         self.period = 1.0 / freq
         self._recent_updates = deque([], 11)
 
+        self.overrun_policy = LoopOverrunPolicy.skip
+        self.loop_stats = LoopStats()
+
+        self._loop_update = self._wrapped_update
+
     @property
     def recent_update_frequencies(self):
         """ Returns the 10 most recent update frequencies.
@@ -199,11 +227,16 @@ class MockupRobot(object):
         self._robot = robot
         self._motors = []
 
+        # Dense requests of the motors (motors x combined registers) and the motors with other requests
+        self._values = numpy.zeros((len(robot.motors), len(combined_registers)))
+        self._mask = numpy.zeros(self._values.shape, dtype=bool)
+        self._other_requests = set()
+
         for a in robot.alias:
             setattr(self, a, [])
 
-        for m in robot.motors:
-            mockup_motor = MockupMotor(m)
+        for i, m in enumerate(robot.motors):
+            mockup_motor = MockupMotor(m, _Requests(self, i))
             self._motors.append(mockup_motor)
             setattr(self, m.name, mockup_motor)
 
@@ -214,11 +247,8 @@ class MockupRobot(object):
         return getattr(self._robot, attr)
 
     def goto_position(self, position_for_motors, duration, control=None, wait=False):
-        for i, (motor_name, position) in enumerate(position_for_motors.items()):
-            w = False if i < len(position_for_motors) - 1 else wait
-
-            m = getattr(self, motor_name)
-            m.goto_position(position, duration, control, wait=w)
+        motors = [getattr(self, name) for name in position_for_motors]
+        goto_group(motors, list(position_for_motors.values()), duration, control, wait)
 
     @property
     def motors(self):
@@ -232,6 +262,75 @@ class MockupRobot(object):
             m.torque_limit = 100.0
 
 
+class _Requests(dict):
+    """ Requests of a :class:`~pypot.primitive.primitive.MockupMotor`.
+
+        The numerical requests of the combined registers are also stored in the dense arrays of the :class:`~pypot.primitive.primitive.MockupRobot` (only setting, deleting and clearing are mirrored).
+
+        """
+    def __init__(self, robot, index):
+        dict.__init__(self)
+
+        self._robot = robot
+        self._index = index
+        self._values = robot._values[index]
+        self._mask = robot._mask[index]
+        self._others = set()
+
+    def __setitem__(self, key, val):
+        k = _register_index.get(key)
+
+        if k is not None and _is_number(val):
+            self._values[k] = val
+            self._mask[k] = True
+            self._discard_other(key)
+        else:
+            if k is not None:
+                self._mask[k] = False
+            self._others.add(key)
+            self._robot._other_requests.add(self._index)
+
+        dict.__setitem__(self, key, val)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+
+        k = _register_index.get(key)
+        if k is not None:
+            self._mask[k] = False
+        self._discard_other(key)
+
+    def clear(self):
+        dict.clear(self)
+
+        self._mask[:] = False
+        self._others.clear()
+        self._robot._other_requests.discard(self._index)
+
+    def others(self):
+        """ Returns the requests which are not in the dense arrays. """
+        others = []
+        for key in list(self._others):
+            try:
+                others.append((key, self[key]))
+            except KeyError:  # removed meanwhile by its primitive
+                pass
+        return others
+
+    def _discard_other(self, key):
+        self._others.discard(key)
+        if not self._others:
+            self._robot._other_requests.discard(self._index)
+
+
+def _is_number(val):
+    if isinstance(val, (bool, numpy.bool_)):
+        return False
+    if isinstance(val, numpy.ndarray):
+        return val.ndim == 0 and val.dtype.kind in 'iuf'
+    return isinstance(val, numbers.Real)
+
+
 class MockupMotor(object):
     """ Fake Motor used by the primitive to ensure sandboxing:
 
@@ -239,9 +338,9 @@ class MockupMotor(object):
         * the write instructions are stored as request waiting to be combined by the primitive manager.
 
         """
-    def __init__(self, motor):
+    def __init__(self, motor, requests=None):
         object.__setattr__(self, '_m', motor)
-        object.__setattr__(self, '_to_set', {})
+        object.__setattr__(self, '_to_set', requests if requests is not None else {})
 
     def __getattr__(self, attr):
         return getattr(self._m, attr)
@@ -3,10 +3,12 @@ The config module allows the definition of the structure of your robot.
 
 Configuration are written as Python dictionary so you can define/modify them programmatically. You can also import them form file such as JSON formatted file. In the configuration you have to define:
 
-* controllers: For each defined controller, you can specify the port name, the attached motors and the synchronization mode.
+* controllers: For each defined controller, you can specify the port name, the attached motors and the synchronization mode. You can also give a max_bus_utilization (e.g. 0.8): the frequencies of the synchronization loops will be lowered if their estimated bus utilization exceeds it (see :mod:`~pypot.dynamixel.budget`). Setting state_store to true backs the registers of the motors with contiguous arrays (see :mod:`~pypot.dynamixel.store`).
 * motors: You specify all motors belonging to your robot. You have to define their id, type, orientation, offset and angle_limit.
 * motorgroups: It allows to define alias of group of motors. They can be nested.
 
+You can also set synchronized_buses to true: the position/speed/load of the motors of all the controllers are then read (and written) during the same tick (see :class:`~pypot.dynamixel.multibus.MultiBusController`).
+
 """
 import logging
 import numpy
@@ -19,7 +21,11 @@ import pypot.sensor
 import pypot.dynamixel
 import pypot.dynamixel.io
 import pypot.dynamixel.error
+import pypot.dynamixel.eeprom
 import pypot.dynamixel.motor
+import pypot.dynamixel.store
+import pypot.dynamixel.multibus
+import pypot.dynamixel.budget
 import pypot.dynamixel.syncloop
 
 from .robot import Robot
@@ -44,6 +50,12 @@ def from_config(config, strict=True, sync=True, use_dummy_io=False, **extra):
 
     alias = config['motorgroups']
 
+    # Caches the EEPROM of the motors between runs
+    eeprom_cache = None
+    if 'eeprom_cache' in config and config['eeprom_cache'] and not use_dummy_io:
+        path = config['eeprom_cache'] if isinstance(config['eeprom_cache'], str) else None
+        eeprom_cache = pypot.dynamixel.eeprom.EepromCache(path)
+
     # Instatiate the different motor controllers
     controllers = []
     for c_name, c_params in config['controllers'].items():
@@ -61,7 +73,7 @@ def from_config(config, strict=True, sync=True, use_dummy_io=False, **extra):
         if not use_dummy_io:
             dxl_io = dxl_io_from_confignode(config, c_params, attached_ids, strict)
 
-            check_motor_eprom_configuration(config, dxl_io, motor_names)
+            check_motor_eprom_configuration(config, dxl_io, motor_names, eeprom_cache)
 
             logger.info('Instantiating controller on %s with motors %s',
                         dxl_io.port, motor_names,
@@ -72,15 +84,33 @@ def from_config(config, strict=True, sync=True, use_dummy_io=False, **extra):
             SyncLoopCls = getattr(pypot.dynamixel.syncloop, syncloop)
 
             c = SyncLoopCls(dxl_io, attached_motors)
+
+            # Lowers the loops frequencies if they do not fit on the bus
+            target = (c_params['max_bus_utilization'] if 'max_bus_utilization' in c_params
+                      else None)
+            pypot.dynamixel.budget.check_controller(dxl_io, c, target)
+
+            # Backs the motors registers with contiguous arrays
+            if 'state_store' in c_params and c_params['state_store']:
+                pypot.dynamixel.store.attach_state_store(c)
+
             controllers.append(c)
         else:
             controllers.append(DummyController(attached_motors))
 
+    if eeprom_cache is not None:
+        eeprom_cache.save()
+
+    # Samples the motors of all the buses in lockstep
+    if 'synchronized_buses' in config and config['synchronized_buses'] and not use_dummy_io:
+        controllers.append(pypot.dynamixel.multibus.MultiBusController(controllers))
+
     try:
         robot = Robot(motor_controllers=controllers, sync=sync)
     except RuntimeError:
         for c in controllers:
-            c.io.close()
+            if c.io is not None:
+                c.io.close()
 
         raise
 
@@ -185,7 +215,8 @@ def dxl_io_from_confignode(config, c_params, ids, strict):
 
     dxl_io = DxlIOCls(port=port,
                       use_sync_read=sync_read,
-                      error_handler_cls=handler)
+                      error_handler_cls=handler,
+                      adaptive_timeouts=c_params.get('adaptive_timeouts', False))
 
     try:
         found_ids = dxl_io.scan(ids)
@@ -206,22 +237,36 @@ def dxl_io_from_confignode(config, c_params, ids, strict):
     return dxl_io
 
 
-def check_motor_eprom_configuration(config, dxl_io, motor_names):
+def check_motor_eprom_configuration(config, dxl_io, motor_names, eeprom_cache=None):
     """ Change the angles limits depanding on the robot configuration ;
         Check if the return delay time is set to 0.
+
+        If an :class:`~pypot.dynamixel.eeprom.EepromCache` is given, the registers of all the motors are read at once through the cache.
     """
     changed_angle_limits = {}
     changed_return_delay_time = {}
 
+    eeprom = None
+    if eeprom_cache is not None:
+        eeprom = eeprom_cache.read(dxl_io, [config['motors'][name]['id'] for name in motor_names])
+
     for name in motor_names:
         m = config['motors'][name]
         id = m['id']
 
-        try:
-            old_limits = dxl_io.get_angle_limit((id, ))[0]
-            old_return_delay_time = dxl_io.get_return_delay_time((id, ))[0]
-        except IndexError:  # probably a broken motor so we just skip
-            continue
+        if eeprom is not None:
+            if id not in eeprom:  # probably a broken motor so we just skip
+                continue
+
+            old_limits = eeprom[id]['angle_limit']
+            old_return_delay_time = eeprom[id]['return_delay_time']
+
+        else:
+            try:
+                old_limits = dxl_io.get_angle_limit((id, ))[0]
+                old_return_delay_time = dxl_io.get_return_delay_time((id, ))[0]
+            except IndexError:  # probably a broken motor so we just skip
+                continue
 
         if old_return_delay_time != 0:
             logger.warning("Return delay time of %s changed from %s to 0",
@@ -232,6 +277,9 @@ def check_motor_eprom_configuration(config, dxl_io, motor_names):
         if 'wheel_mode' in m and m['wheel_mode']:
             dxl_io.set_wheel_mode([m['id']])
             time.sleep(0.5)
+
+            if eeprom_cache is not None:
+                eeprom_cache.invalidate(dxl_io, [m['id']])
         else:
             # TODO: we probably need a better fix for this.
             # dxl_io.set_joint_mode([m['id']])
@@ -251,6 +299,10 @@ def check_motor_eprom_configuration(config, dxl_io, motor_names):
         dxl_io.set_return_delay_time(changed_return_delay_time)
         time.sleep(0.5)
 
+    # The cached values are outdated (they are read again at the next start)
+    if eeprom_cache is not None:
+        eeprom_cache.invalidate(dxl_io, list(changed_angle_limits) + list(changed_return_delay_time))
+
 
 def instatiate_motors(config):
     motors = []
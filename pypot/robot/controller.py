@@ -54,6 +54,16 @@ class MotorsController(AbstractController):
 
         self.motors = motors
 
+        # where the values read are published (see pypot.robot.snapshot)
+        self.snapshots = None
+
+    def attach_snapshots(self, snapshots):
+        """ Publishes the values read by the controller (and its synchronization loops) in a :class:`~pypot.robot.snapshot.SnapshotBuffer`. """
+        self.snapshots = snapshots
+
+        for c in getattr(self, 'controllers', []):
+            c.attach_snapshots(snapshots)
+
 
 class DummyController(MotorsController):
     def __init__(self, motors):
@@ -90,6 +100,11 @@ class DummyController(MotorsController):
 
         self.last_update = time.time()
 
+        if self.snapshots is not None:
+            self.snapshots.publish(self.motors, {
+                'present_position': [m.__dict__['present_position'] for m in self.motors]
+            })
+
 
 class SensorsController(AbstractController):
     """ Abstract class for sensors controller.
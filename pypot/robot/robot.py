@@ -1,6 +1,10 @@
 import logging
 
+from collections import OrderedDict
+
+from .snapshot import SnapshotBuffer
 from ..primitive.manager import PrimitiveManager
+from ..utils.trajectory import goto_group
 
 
 logger = logging.getLogger(__name__)
@@ -41,6 +45,10 @@ class Robot(object):
 
             self._sensors.extend(controller.sensors)
 
+        self._snapshots = SnapshotBuffer(self._motors)
+        for controller in motor_controllers:
+            controller.attach_snapshots(self._snapshots)
+
         self._attached_primitives = {}
         self._primitive_manager = PrimitiveManager(self.motors)
 
@@ -128,17 +136,52 @@ class Robot(object):
 
             :param dict position_for_motors: which motors you want to move {motor_name: pos, motor_name: pos,...}
             :param float duration: duration of the move
-            :param str control: control type ('dummy', 'minjerk')
+            :param str control: control type ('dummy', 'minjerk', 'linear')
             :param bool wait: whether or not to wait for the end of the move
 
             .. note::In case of dynamixel motors, the speed is automatically adjusted so the goal position is reached after the chosen duration.
 
+            The 'minjerk' and 'linear' moves of all the motors are computed together and start at the same time (see :func:`~pypot.utils.trajectory.goto_group`).
+
+            """
+        motors = [getattr(self, name) for name in position_for_motors]
+        goto_group(motors, list(position_for_motors.values()), duration, control, wait)
+
+    def snapshot(self):
+        """ Returns the last consistent state of the motors (see :class:`~pypot.robot.snapshot.RobotSnapshot`).
+
+            All the values of a snapshot were read during the same synchronization cycle, with the time of this read. It returns None until the synchronization loops have read the motors.
+
             """
-        for i, (motor_name, position) in enumerate(position_for_motors.items()):
-            w = False if i < len(position_for_motors) - 1 else wait
+        return self._snapshots.latest()
+
+    def loop_metrics(self):
+        """ Returns the timing metrics of all the loops running on the robot.
+
+            For each synchronization loop (of each controller), the primitive manager and each attached loop primitive, it gives the number of iterations, overruns and skipped ticks, the achieved frequency and the distributions of the update duration, jitter and interval between two updates (see :class:`~pypot.utils.stoppablethread.LoopStats`).
+
+            """
+        metrics = OrderedDict()
+
+        for i, c in enumerate(self._controllers):
+            name = '{}:{}'.format(c.__class__.__name__,
+                                  getattr(c.io, 'port', i) if c.io is not None else i)
+
+            loops = getattr(c, 'controllers', None)
+            if loops is None:
+                metrics[name] = c.loop_stats.as_dict()
+            else:
+                for loop in loops:
+                    loop_name = getattr(loop, 'varname', loop.__class__.__name__)
+                    metrics['{}/{}'.format(name, loop_name)] = loop.loop_stats.as_dict()
+
+        metrics['primitive_manager'] = self._primitive_manager.loop_stats.as_dict()
+
+        for name, p in self._attached_primitives.items():
+            if hasattr(p, 'loop_stats'):
+                metrics['primitives/{}'.format(name)] = p.loop_stats.as_dict()
 
-            m = getattr(self, motor_name)
-            m.goto_position(position, duration, control, wait=w)
+        return metrics
 
     def power_up(self):
         """ Changes all settings to guarantee the motors will be used at their maximum power. """
@@ -0,0 +1,99 @@
+import numpy
+import threading
+
+from collections import namedtuple
+
+import pypot.utils.pypot_time as time
+
+
+class RobotSnapshot(namedtuple('RobotSnapshot', ('sequence', 'timestamp', 'motors',
+                                                 'present_position',
+                                                 'present_speed',
+                                                 'present_load'))):
+    """ Consistent view of the state of the motors of a robot.
+
+        :param int sequence: number of the snapshot (increases by one at each publication)
+        :param float timestamp: time at which the values were read (see :func:`~pypot.utils.pypot_time.monotonic`)
+        :param tuple motors: names of the motors
+        :param numpy.ndarray present_position: present position of each motor (as seen from the motors)
+        :param numpy.ndarray present_speed: present speed of each motor
+        :param numpy.ndarray present_load: present load of each motor
+
+        The arrays are read-only and are never modified once published, so a snapshot can be kept and read without any lock.
+
+        """
+    __slots__ = ()
+
+    def get(self, register, motor_name):
+        """ Returns the value of a register for the given motor. """
+        return getattr(self, register)[self.motors.index(motor_name)].item()
+
+
+class SnapshotBuffer(object):
+    """ Double buffer holding the last :class:`RobotSnapshot` of a robot.
+
+        The synchronization loops publish the raw values they read (see :meth:`publish`): they are written, with orientation and offset applied, into a new back buffer which is then swapped with the front one. Readers always get the front buffer (see :meth:`latest`) without taking any lock.
+
+        Several loops (e.g. one per bus) can publish the values of their own motors: the other values are kept from the previous snapshot.
+
+        .. note:: The orientation and offset of the motors are read when the buffer is created.
+
+        """
+    registers = ('present_position', 'present_speed', 'present_load')
+
+    def __init__(self, motors):
+        self.motors = list(motors)
+        self._names = tuple(m.name for m in self.motors)
+        self._index = {id(m): i for i, m in enumerate(self.motors)}
+
+        self._sign = numpy.array([1.0 if getattr(m, 'direct', True) else -1.0
+                                  for m in self.motors])
+        self._offset = numpy.array([getattr(m, 'offset', 0.0) for m in self.motors],
+                                   dtype=float)
+
+        # Publishers are serialized, readers never lock
+        self._write_lock = threading.Lock()
+        self._front = None
+        self._sequence = 0
+
+    def latest(self):
+        """ Returns the last published snapshot (None if nothing was published yet). """
+        return self._front
+
+    def indices(self, motors):
+        return numpy.fromiter((self._index[id(m)] for m in motors),
+                              dtype=numpy.intp, count=len(motors))
+
+    def publish(self, motors, raw_values, timestamp=None):
+        """ Publishes the values read for some motors.
+
+            :param list motors: motors whose values were read
+            :param dict raw_values: raw values (as stored in the motors, before orientation and offset) for each register
+            :param float timestamp: time of the read (defaults to now)
+
+            """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        idx = self.indices(motors)
+
+        with self._write_lock:
+            front = self._front
+
+            back = {}
+            for register in self.registers:
+                back[register] = (getattr(front, register).copy() if front is not None
+                                  else numpy.zeros(len(self.motors)))
+
+            for register, values in raw_values.items():
+                values = self._sign[idx] * numpy.asarray(values, dtype=float)
+                if register == 'present_position':
+                    values -= self._offset[idx]
+                back[register][idx] = values
+
+            for a in back.values():
+                a.flags.writeable = False
+
+            self._sequence += 1
+            self._front = RobotSnapshot(self._sequence, timestamp, self._names,
+                                        **back)
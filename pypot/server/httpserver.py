@@ -80,6 +80,16 @@ class LocalIp(PoppyRequestHandler):
 			})
 
 
+class MetricsHandler(PoppyRequestHandler):
+	""" API REST Request Handler for request:
+	GET /metrics
+	"""
+
+	def get(self):
+		self.set_status(200)
+		self.write_json(self.restful_robot.get_loop_metrics())
+
+
 class IndexHandler(PoppyRequestHandler):
 	""" API REST Request Handler for request:
 	GET /robot.json
@@ -1057,6 +1067,7 @@ url_paths = [
 	(r'/', PathsUrl),
 	(r'/robot\.json', IndexHandler),
 	(r'/ip\.json', LocalIp),
+	(r'/metrics', MetricsHandler),
 
 	# Motors
 	(r'/motors/list\.json', MotorsListHandler),
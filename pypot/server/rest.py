@@ -21,6 +21,8 @@ class RESTRobot(object):
 
         * the primitives list (and the active)
         * start/stop primitives
+
+        * the timing metrics of the robot loops
     """
 
     def __init__(self, robot):
@@ -115,6 +117,11 @@ class RESTRobot(object):
     def call_primitive_method(self, primitive, method, kwargs):
         self._call_primitive_method(primitive, method, **kwargs)
 
+    # Access the loops timing metrics
+
+    def get_loop_metrics(self):
+        return self.robot.loop_metrics()
+
     def _set_register_value(self, object, register, value):
         o = getattr(self.robot, object)
         getattr(o, register)  # does register exists ?
@@ -62,15 +62,24 @@ class WsSocketHandler(WebSocketHandler):
         self.handle_command(json.loads(message))
 
     def publish_robot_state(self):
+        # positions, speeds and loads read during the same synchronization cycle
+        snapshot = self.robot.snapshot()
+        present = (zip(snapshot.present_position.tolist(),
+                       snapshot.present_speed.tolist(),
+                       snapshot.present_load.tolist())
+                   if snapshot is not None else
+                   ((m.present_position, m.present_speed, m.present_load)
+                    for m in self.robot.motors))
+
         state = {
             m.name: {
-                'present_position': m.present_position,
-                'present_speed': m.present_speed,
-                'present_load': m.present_load,
+                'present_position': p,
+                'present_speed': s,
+                'present_load': l,
                 'led': m.led,
                 'present_temperature': m.present_temperature,
             }
-            for m in self.robot.motors
+            for m, (p, s, l) in zip(self.robot.motors, present)
         }
         self.write_message(json.dumps(state))
 
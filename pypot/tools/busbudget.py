@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+
+Bus budget estimation.
+
+Estimates, without any hardware, the bus utilization of the synchronization loops of each controller defined in a robot configuration. When it exceeds the target, it proposes lower frequencies or a split of the motors across several buses.
+
+Examples:
+dxl-bus-budget my_robot.json
+dxl-bus-budget my_robot.json --baudrate=57600 --target=0.7
+dxl-bus-budget --help
+
+"""
+
+import json
+
+from collections import OrderedDict
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+
+import pypot.dynamixel.io
+import pypot.dynamixel.syncloop
+
+from pypot.dynamixel.budget import BusBudget, plan, split_motors
+from pypot.robot.config import motor_from_confignode, _motor_extractor
+
+
+def controller_from_confignode(config, c_params):
+    names = sum([_motor_extractor(config['motorgroups'], name)
+                 for name in c_params['attached_motors']], [])
+    motors = [motor_from_confignode(config, name) for name in names]
+
+    syncloop = (c_params['syncloop'] if 'syncloop' in c_params
+                else 'BaseDxlController')
+    SyncLoopCls = getattr(pypot.dynamixel.syncloop, syncloop)
+
+    # The loops are only built (not started) so no io is needed
+    SyncLoopCls = getattr(SyncLoopCls, 'meta_controller', SyncLoopCls)
+
+    return SyncLoopCls(None, motors)
+
+
+def main():
+    parser = ArgumentParser(description='Estimates the bus utilization of the '
+                                        'synchronization loops of a robot configuration.',
+                            formatter_class=ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('config', type=str,
+                        help='Path to the robot JSON configuration.')
+    parser.add_argument('--baudrate', type=int, default=1000000,
+                        help='Baudrate of the buses.')
+    parser.add_argument('--return-delay-time', type=float, default=0,
+                        help='Return delay time of the motors (in µs).')
+    parser.add_argument('--latency', type=float, default=1.0,
+                        help='Round trip latency of the usb to serial adapter (in ms).')
+    parser.add_argument('--sync-read', action='store_true',
+                        help='Assume SYNC_READ is used even if not enabled in the config.')
+    parser.add_argument('--target', type=float, default=0.8,
+                        help='Maximum bus utilization.')
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f, object_pairs_hook=OrderedDict)
+
+    for c_name, c_params in config['controllers'].items():
+        DxlIOCls = (pypot.dynamixel.io.Dxl320IO
+                    if 'protocol' in c_params and c_params['protocol'] == 2
+                    else pypot.dynamixel.io.DxlIO)
+
+        sync_read = args.sync_read or c_params.get('sync_read') is True
+
+        budget = BusBudget(DxlIOCls, args.baudrate,
+                           return_delay_time=args.return_delay_time,
+                           use_sync_read=sync_read,
+                           latency=args.latency / 1000.0)
+
+        controller = controller_from_confignode(config, c_params)
+
+        print('Controller "{}" ({}, {} bauds, {} motors, sync read {})'.format(
+              c_name, DxlIOCls.__name__, args.baudrate,
+              len(controller.motors), 'on' if sync_read else 'off'))
+        print('    {:<45} {:>10} {:>8} {:>10} {:>8}'.format('loop', 'freq (Hz)',
+                                                           'bytes', 'time (ms)',
+                                                           'usage'))
+
+        for cost in budget.controller_costs(controller):
+            print('    {:<45} {:>10.1f} {:>8} {:>10.2f} {:>7.1f}%'.format(
+                  cost.name, cost.frequency, cost.nb_bytes,
+                  1000 * cost.duration, 100 * cost.duration * cost.frequency))
+
+        p = plan(budget, controller, args.target)
+        print('    {:<45} {:>39.1f}%'.format('total', 100 * p.utilization))
+
+        if p.utilization > p.target:
+            print('    Over the {:.0f}% target, either:'.format(100 * p.target))
+            print('      * lower the frequencies by a factor {:.2f}:'.format(p.frequency_factor))
+            for name, freq in p.frequencies:
+                print('          {:<43} {:>10.1f}'.format(name, freq))
+
+            groups = split_motors(budget, controller.__class__, controller.motors, args.target)
+            if groups is not None:
+                print('      * split the motors across {} buses:'.format(len(groups)))
+                for g in groups:
+                    print('          {}'.format([m.name for m in g]))
+        print('')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,7 @@ from collections import namedtuple
 from operator import attrgetter
 from threading import Event
 
-from .stoppablethread import StoppableThread, StoppableLoopThread
+from .stoppablethread import StoppableThread, StoppableLoopThread, LoopOverrunPolicy
 from .pypot_time import time
 from .flushed_print import flushed_print
 
@@ -0,0 +1,118 @@
+""" Shared execution of periodic loops.
+
+    Instead of running each loop in its own thread (see :class:`~pypot.utils.stoppablethread.StoppableLoopThread`), the loops whose executor is set run their updates as tasks of a :class:`LoopExecutor`: a single thread keeps the deadlines of all the tasks in a heap and runs each update when its deadline is reached. Their setups and teardowns, which may block, run on a small pool of worker threads.
+
+    The loops keep their start/stop/pause/resume API. As all their updates run on the same thread, they should be short and never block.
+
+    """
+import heapq
+import logging
+import itertools
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import pypot_time as time
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoopExecutor(object):
+    """ Runs periodic tasks on a single thread and their setups/teardowns on a pool of workers. """
+    def __init__(self, name='LoopExecutor', max_workers=4):
+        self.name = name
+
+        self._tasks = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='{}-worker'.format(name))
+        self._local = threading.local()
+
+    def schedule(self, step, deadline=None):
+        """ Calls step at the deadline (monotonic time, now by default).
+
+            step must return the deadline of its next call, or None when it is over.
+
+            """
+        if deadline is None:
+            deadline = time.monotonic()
+
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+
+            heapq.heappush(self._tasks, (deadline, next(self._counter), step))
+            self._cond.notify()
+
+    def submit(self, func, *args):
+        """ Runs func on a worker thread (returns a :class:`concurrent.futures.Future`). """
+        return self._pool.submit(self._call, func, *args)
+
+    def in_executor(self):
+        """ Checks whether the current thread belongs to the executor (so it must not wait for a task). """
+        return (threading.current_thread() is self._thread or
+                getattr(self._local, 'worker', False))
+
+    def in_loop_thread(self):
+        """ Checks whether the current thread is the one running the periodic tasks (so it must never block). """
+        return threading.current_thread() is self._thread
+
+    @property
+    def nb_tasks(self):
+        """ Number of scheduled tasks. """
+        return len(self._tasks)
+
+    def _call(self, func, *args):
+        self._local.worker = True
+        try:
+            return func(*args)
+        except Exception:
+            logger.exception('Error in %s', func)
+            raise
+        finally:
+            self._local.worker = False
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._tasks:
+                        self._cond.wait()
+                        continue
+
+                    dt = self._tasks[0][0] - time.monotonic()
+                    if dt <= 0:
+                        break
+                    self._cond.wait(dt)
+
+                _, _, step = heapq.heappop(self._tasks)
+
+            try:
+                deadline = step()
+            except Exception:
+                logger.exception('Error in the task %s', step)
+                deadline = None
+
+            if deadline is not None:
+                with self._cond:
+                    heapq.heappush(self._tasks, (deadline, next(self._counter), step))
+
+
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def default_executor():
+    """ Returns the :class:`LoopExecutor` shared by the whole process (created at the first call). """
+    global _default_executor
+
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = LoopExecutor()
+        return _default_executor
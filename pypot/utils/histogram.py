@@ -0,0 +1,100 @@
+import array
+
+
+class LogHistogram(object):
+    """ Fixed-size histogram with a bounded relative error (in the spirit of HdrHistogram).
+
+        The values are recorded as integers (in the given unit) in log-linear buckets: each power of two range is split in 2 ** (precision - 1) linear sub-buckets, so the relative error on the reported values stays under 2 ** (1 - precision).
+
+        All the buckets are preallocated: recording a value is a constant time operation which does not allocate any memory, so it can stay enabled in the control loops.
+
+        """
+    def __init__(self, max_value=100.0, unit=1e-6, precision=5):
+        """
+        :param float max_value: highest value that can be recorded (larger values are clamped)
+        :param float unit: resolution of the histogram (values are recorded as multiples of unit)
+        :param int precision: number of significant bits kept for each value
+
+        """
+        self.unit = unit
+        self.precision = precision
+
+        self._sub_count = 2 ** precision
+        self._half_count = self._sub_count // 2
+
+        self._max_int = int(max_value / unit)
+        self._nb_buckets = self._index(self._max_int) + 1
+
+        self.reset()
+
+    def reset(self):
+        """ Clears all the recorded values. """
+        self._counts = array.array('L', [0]) * self._nb_buckets
+
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, v):
+        if v < self._sub_count:
+            return v
+
+        shift = v.bit_length() - self.precision
+        return self._half_count * shift + (v >> shift)
+
+    def _value(self, index):
+        if index < self._sub_count:
+            return index
+
+        shift = index // self._half_count - 1
+        mantissa = index - self._half_count * shift
+        # middle of the bucket
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def record(self, value):
+        """ Records a value (negative values are recorded as 0). """
+        v = int(value / self.unit)
+        if v < 0:
+            v = 0
+        elif v > self._max_int:
+            v = self._max_int
+
+        self._counts[self._index(v)] += 1
+
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q):
+        """ Returns the value below which q percent of the recorded values fall. """
+        if not self.count:
+            return None
+
+        rank = max(1, int(round(q / 100.0 * self.count)))
+
+        seen = 0
+        for i, c in enumerate(self._counts):
+            seen += c
+            if seen >= rank:
+                return min(self._value(i) * self.unit, self.max)
+
+        return self.max
+
+    def as_dict(self, percentiles=(50, 90, 99, 99.9)):
+        d = {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+        }
+        for q in percentiles:
+            d['p{}'.format(q)] = self.percentile(q)
+        return d
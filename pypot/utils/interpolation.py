@@ -112,3 +112,96 @@ class KDTreeDict(dict):
         if key is None:
             raise SyntaxError('invalid syntax, you must provide a key')
         return self.interpolate_motor_positions(key, self.nearest_keys(key))
+
+
+class Trajectory(object):
+    """ Values of several motors sampled at increasing times, interpolated at any time.
+
+    The values are stored as an array of shape (samples, motors, ...) and all the motors are interpolated at once. The samples surrounding a time are found by index arithmetic for regularly sampled values (see :meth:`uniform`), by a binary search in the sorted times otherwise. Only these samples are read, so the values can be memory-mapped.
+
+    Two interpolation modes are available:
+
+        * 'linear': linear interpolation between the two surrounding samples,
+        * 'cubic': cubic Hermite spline (Catmull-Rom) through the four surrounding samples.
+
+    Times outside of the trajectory are clamped to its first or last sample.
+
+    """
+    modes = ('linear', 'cubic')
+
+    def __init__(self, times, values, mode='linear'):
+        """
+        :param times: sorted times of the samples (or None for regularly sampled values, see :meth:`uniform`)
+        :param values: array of shape (samples, motors, ...)
+        :param str mode: interpolation mode ('linear' or 'cubic')
+        """
+        if mode not in self.modes:
+            raise ValueError('Unknown interpolation mode {} (should be in {})'.format(mode, self.modes))
+        if not len(values):
+            raise ValueError('A trajectory needs at least one sample')
+
+        self.times = np.asarray(times, dtype=float) if times is not None else None
+        self.values = values
+        self.mode = mode
+
+        self._framerate = None
+        self._last = len(values) - 1
+
+    @classmethod
+    def uniform(cls, framerate, values, mode='linear'):
+        """ Creates a trajectory from values sampled at framerate (sample i is at time i / framerate). """
+        trajectory = cls(None, values, mode)
+        trajectory._framerate = float(framerate)
+        return trajectory
+
+    @property
+    def duration(self):
+        if self.times is None:
+            return self._last / self._framerate
+        return self.times[-1] - self.times[0]
+
+    def _time(self, i):
+        return i / self._framerate if self.times is None else self.times[i]
+
+    def _locate(self, t):
+        # index i of the segment [i, i + 1] containing t and the position of t in it (in [0, 1])
+        if self.times is None:
+            x = min(max(t * self._framerate, 0.0), float(self._last))
+            i = min(int(x), max(self._last - 1, 0))
+            return i, x - i
+
+        i = int(np.searchsorted(self.times, t, side='right')) - 1
+        i = min(max(i, 0), max(self._last - 1, 0))
+        if self._last == 0:
+            return 0, 0.0
+
+        t0, t1 = self.times[i], self.times[i + 1]
+        s = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        return i, min(max(s, 0.0), 1.0)
+
+    def __call__(self, t):
+        """ Returns the interpolated values of all the motors at time t (array of shape (motors, ...)). """
+        i, s = self._locate(t)
+
+        if self._last == 0:
+            return np.array(self.values[0], dtype=float)
+
+        p0 = np.asarray(self.values[i], dtype=float)
+        p1 = np.asarray(self.values[i + 1], dtype=float)
+
+        if self.mode == 'linear':
+            return p0 + (p1 - p0) * s
+
+        # tangents from the finite differences of the neighbouring samples
+        h = self._time(i + 1) - self._time(i)
+        if h <= 0:
+            return p0
+
+        prev, nxt = max(i - 1, 0), min(i + 2, self._last)
+
+        m0 = (p1 - np.asarray(self.values[prev], dtype=float)) / (self._time(i + 1) - self._time(prev))
+        m1 = (np.asarray(self.values[nxt], dtype=float) - p0) / (self._time(nxt) - self._time(i))
+
+        s2, s3 = s * s, s * s * s
+        return ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * h * m0 +
+                (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * h * m1)
@@ -5,6 +5,10 @@ def time():
     return system_time.time()
 
 
+def monotonic():
+    return system_time.monotonic()
+
+
 def sleep(t):
     if t > 10:
         print('WARNING: big sleep', t)
@@ -1,6 +1,7 @@
 import threading
 
 from . import pypot_time as time
+from .histogram import LogHistogram
 
 
 class StoppableThread(object):
@@ -13,7 +14,13 @@ class StoppableThread(object):
 
     .. warning:: It is up to the subclass to correctly respond to the stop, pause/resume signals (see :meth:`~pypot.utils.stoppablethread.StoppableThread.run` for details).
 
+    The periodic loops (see :class:`~pypot.utils.stoppablethread.StoppableLoopThread`) can also run on a shared :class:`~pypot.utils.executor.LoopExecutor` instead of their own thread: just set their executor attribute before starting them.
+
     """
+    # Executor running the updates of a loop (None to run it in its own thread)
+    executor = None
+    _loop_update = None
+
     def __init__(self, setup=None, target=None, teardown=None):
         """
         :param func setup: specific setup function to use (otherwise self.setup)
@@ -30,8 +37,10 @@ class StoppableThread(object):
         self._teardown = self.teardown if teardown is None else teardown
         self._crashed = False
 
+        self._used_executor = None
+
     def start(self):
-        """ Start the run method as a new thread.
+        """ Start the run method as a new thread (or the loop on its executor).
 
         It will first stop the thread if it is already running.
 
@@ -39,6 +48,18 @@ class StoppableThread(object):
         if self.running:
             self.stop()
 
+        if self.executor is not None and self._loop_update is not None:
+            # the new run starts once the previous one is torn down (it may still be running
+            # when restarted from the executor, which cannot wait for it)
+            previous = self._done if self._used_executor is not None else None
+
+            self._used_executor = self.executor
+            self._stopping = threading.Event()
+            self._done = threading.Event()
+            self._used_executor.submit(self._executed_setup, self._stopping, self._done, previous)
+            return
+
+        self._used_executor = None
         self._thread = threading.Thread(target=self._wrapped_target)
         self._thread.daemon = True
         self._thread.start()
@@ -49,12 +70,21 @@ class StoppableThread(object):
         More precisely, sends the stopping signal to the thread. It is then up to the run method to correctly responds.
 
         """
+        if self._used_executor is not None:
+            # ends this run even if a new one sets the running flag again
+            self._stopping.set()
+
         if self.started:
             self._running.clear()
             self._resume.set()
 
+            if self._used_executor is not None:
+                # The executor cannot wait for its own tasks
+                if wait and not self._used_executor.in_executor():
+                    self._done.wait()
+
             # We cannot wait for ourself
-            if wait and (threading.current_thread() != self._thread):
+            elif wait and (threading.current_thread() != self._thread):
                 while self._thread.is_alive():
                     self._running.clear()
                     self._resume.set()
@@ -67,7 +97,11 @@ class StoppableThread(object):
         """ Wait for the thread termination. """
         if not self.started:
             raise RuntimeError('cannot join thread before it is started')
-        self._thread.join()
+
+        if self._used_executor is not None:
+            self._wait_done()
+        else:
+            self._thread.join()
 
     @property
     def running(self):
@@ -84,9 +118,14 @@ class StoppableThread(object):
         self._started.wait()
 
         if self._crashed and not allow_failure:
-            self._thread.join()
+            if self._used_executor is not None:
+                self._wait_done()
+                name = self._used_executor.name
+            else:
+                self._thread.join()
+                name = self._thread.name
             raise RuntimeError('Setup failed, see {} Traceback'
-                               'for details.'.format(self._thread.name))
+                               'for details.'.format(name))
 
     def should_stop(self):
         """ Signals if the thread should be stopped or not. """
@@ -94,6 +133,10 @@ class StoppableThread(object):
 
     def wait_to_stop(self):
         """ Wait for the thread to terminate. """
+        if self._used_executor is not None:
+            self._wait_done()
+            return
+
         if not self.started:
             self.wait_to_start()
         self.join()
@@ -142,6 +185,63 @@ class StoppableThread(object):
             self._resume.clear()
             raise
 
+    def _wait_done(self):
+        if not self._done.is_set() and self._used_executor.in_loop_thread():
+            raise RuntimeError('Cannot wait for a loop from the thread of its executor '
+                               '(e.g. from the update of another loop), it would never end.')
+        self._done.wait()
+
+    def _executed_setup(self, stopping, done, previous):
+        if previous is not None:
+            previous.wait()
+
+        # stopped before being set up
+        if stopping.is_set():
+            done.set()
+            return
+
+        try:
+            self._setup()
+        except Exception:
+            self._crashed = True
+            self._started.set()
+            self._running.clear()
+            self._resume.clear()
+            done.set()
+            raise
+
+        self._started.set()
+        self._resume.set()
+        self._running.set()
+
+        clock = _LoopClock(self, self._loop_update)
+        self._used_executor.schedule(lambda: self._executed_step(clock, stopping, done))
+
+    def _executed_step(self, clock, stopping, done):
+        if stopping.is_set() or self.should_stop():
+            self._used_executor.submit(self._executed_teardown, done)
+            return None
+
+        # paused loops are polled at their period
+        if self.should_pause():
+            clock.reset()
+            return time.monotonic() + self.period
+
+        try:
+            return clock.tick()
+        except Exception:
+            self._crashed = True
+            self._running.clear()
+            self._resume.clear()
+            done.set()
+            raise
+
+    def _executed_teardown(self, done):
+        try:
+            self._teardown()
+        finally:
+            done.set()
+
     def should_pause(self):
         """ Signals if the thread should be paused or not. """
         return self.paused
@@ -163,22 +263,168 @@ class StoppableThread(object):
         self._resume.wait()
 
 
+class LoopOverrunPolicy(object):
+    """ Defines how a periodic loop recovers when an update takes longer than its period.
+
+        * skip: the missed ticks are dropped and the loop waits for the next deadline (the loop stays aligned on its initial schedule)
+        * catch_up: the missed ticks are run as soon as possible (back to back) until the loop is back on schedule
+        * run_late: the next tick is run right away and the schedule restarts from there
+
+        """
+    skip, catch_up, run_late = 'skip', 'catch_up', 'run_late'
+
+    # Above this number of missed ticks, catch_up falls back to skip
+    max_catch_up = 10
+
+
+class LoopStats(object):
+    """ Timing counters of a periodic loop.
+
+        * iterations: number of updates
+        * overruns: number of updates which ended after the next deadline
+        * skipped: number of ticks dropped by the skip policy (or by a too long catch up)
+        * jitter / max_jitter: delay between the deadline and the actual start of the last (resp. worst) update (in s)
+        * duration / max_duration: duration of the last (resp. longest) update (in s)
+
+        The distributions of the update durations, of the jitter and of the intervals between two updates are also kept in fixed-size histograms (see :class:`~pypot.utils.histogram.LogHistogram`), so recording does not allocate memory.
+
+        """
+    __slots__ = ('iterations', 'overruns', 'skipped',
+                 'jitter', 'max_jitter', 'total_jitter',
+                 'duration', 'max_duration',
+                 'durations', 'jitters', 'intervals')
+
+    def __init__(self):
+        self.durations = LogHistogram()
+        self.jitters = LogHistogram()
+        self.intervals = LogHistogram()
+
+        self.reset()
+
+    def reset(self):
+        self.iterations = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.jitter = self.max_jitter = self.total_jitter = 0.0
+        self.duration = self.max_duration = 0.0
+
+        self.durations.reset()
+        self.jitters.reset()
+        self.intervals.reset()
+
+    def record(self, jitter, duration, interval=None):
+        self.iterations += 1
+
+        self.jitter = jitter
+        self.total_jitter += jitter
+        if jitter > self.max_jitter:
+            self.max_jitter = jitter
+
+        self.duration = duration
+        if duration > self.max_duration:
+            self.max_duration = duration
+
+        self.durations.record(duration)
+        self.jitters.record(jitter)
+        if interval is not None:
+            self.intervals.record(interval)
+
+    @property
+    def mean_jitter(self):
+        return self.total_jitter / self.iterations if self.iterations else 0.0
+
+    @property
+    def frequency(self):
+        """ Achieved frequency (computed from the mean interval between two updates). """
+        mean = self.intervals.mean
+        return 1.0 / mean if mean else None
+
+    def as_dict(self):
+        return {
+            'iterations': self.iterations,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'frequency': self.frequency,
+            'jitter': self.jitters.as_dict(),
+            'duration': self.durations.as_dict(),
+            'interval': self.intervals.as_dict(),
+        }
+
+
+class _LoopClock(object):
+    """ Deadlines of a periodic loop (shared by the threaded loops and the :class:`~pypot.utils.executor.LoopExecutor`). """
+    def __init__(self, thread, update_func):
+        self.thread = thread
+        self.update_func = update_func
+
+        self.updated = getattr(thread, '_updated', None)
+        self.stats = getattr(thread, 'loop_stats', None)
+        if self.stats is None:
+            self.stats = LoopStats()
+        self.policy = getattr(thread, 'overrun_policy', LoopOverrunPolicy.skip)
+
+        self.reset()
+
+    def reset(self):
+        self.deadline = time.monotonic()
+        self.last_start = None
+
+    def tick(self):
+        """ Runs an update and returns the deadline of the next one. """
+        stats = self.stats
+
+        start = time.monotonic()
+        period = self.thread.period
+
+        # The clock went backward (e.g. simulation reset)
+        if start < self.deadline - period:
+            self.deadline = start
+
+        if self.updated is not None:
+            self.updated.clear()
+            self.update_func()
+            self.updated.set()
+        else:
+            self.update_func()
+
+        end = time.monotonic()
+        stats.record(start - self.deadline, end - start,
+                     start - self.last_start if self.last_start is not None else None)
+        self.last_start = start
+
+        self.deadline += period
+
+        if end > self.deadline:
+            stats.overruns += 1
+            missed = int((end - self.deadline) // period) + 1
+
+            if self.policy == LoopOverrunPolicy.run_late:
+                self.deadline = end
+
+            elif (self.policy == LoopOverrunPolicy.skip or
+                  missed > LoopOverrunPolicy.max_catch_up):
+                stats.skipped += missed
+                self.deadline += missed * period
+
+        return self.deadline
+
+
 def make_update_loop(thread, update_func):
-    """ Makes a run loop which calls an update function at a predefined frequency. """
+    """ Makes a run loop which calls an update function at a predefined frequency.
+
+    The updates are scheduled against absolute deadlines (start + k * period) on a monotonic clock, so the loop does not drift. When an update overruns its period, the thread overrun_policy (see :class:`LoopOverrunPolicy`) defines how the loop recovers. The timings are accounted in the thread loop_stats (see :class:`LoopStats`).
+
+    """
+    clock = _LoopClock(thread, update_func)
+
     while not thread.should_stop():
         if thread.should_pause():
             thread.wait_to_resume()
+            clock.reset()
 
-        start = time.time()
-        if hasattr(thread, '_updated'):
-            thread._updated.clear()
-        update_func()
-        if hasattr(thread, '_updated'):
-            thread._updated.set()
-        end = time.time()
-
-        dt = thread.period - (end - start)
+        deadline = clock.tick()
 
+        dt = deadline - time.monotonic()
         if dt > 0:
             time.sleep(dt)
 
@@ -186,20 +432,27 @@ def make_update_loop(thread, update_func):
 class StoppableLoopThread(StoppableThread):
     """ LoopThread calling an update method at a pre-defined frequency.
 
-    .. note:: This class does not mean to be accurate. The given frequency will be approximately followed - depending for instance on CPU load - and only reached if the update method takes less time than the chosen loop period.
+    The updates are scheduled on absolute deadlines so the loop does not drift (see :func:`make_update_loop`).
+
+    .. note:: The given frequency is only reached if the update method takes less time than the chosen loop period. The actual timings are available in :attr:`loop_stats`.
 
     """
-    def __init__(self, frequency, update=None):
+    def __init__(self, frequency, update=None, overrun_policy=LoopOverrunPolicy.skip):
         """
         :params float frequency: called frequency of the :meth:`~pypot.stoppablethread.StoppableLoopThread.update` method
+        :params str overrun_policy: how the loop recovers when an update overruns its period (see :class:`~pypot.utils.stoppablethread.LoopOverrunPolicy`)
 
         """
         StoppableThread.__init__(self)
 
         self.period = 1.0 / frequency
         self._update = self.update if update is None else update
+        self._loop_update = self._update
         self._updated = threading.Event()
 
+        self.overrun_policy = overrun_policy
+        self.loop_stats = LoopStats()
+
     def run(self):
         """ Called the update method at the pre-defined frequency. """
         make_update_loop(self, self._update)
@@ -1,9 +1,11 @@
 
 
 import numpy
+import collections
 import collections.abc
 
 import pypot.utils.pypot_time as time
+from ..utils.executor import default_executor
 from ..utils.stoppablethread import StoppableLoopThread
 
 
@@ -61,8 +63,10 @@ class MinimumJerkTrajectory(object):
 
 
 class GotoMinJerk(StoppableLoopThread):
+    """ Moves a motor to a position following a minimum jerk trajectory (run by the shared :func:`~pypot.utils.executor.default_executor`). """
     def __init__(self, motor, position, duration, frequency=50):
         StoppableLoopThread.__init__(self, frequency)
+        self.executor = default_executor()
 
         self.motor = motor
         self.goal = position  # dict { 'motor1_name': x1, 'motor2_name': x2 }
@@ -80,6 +84,7 @@ class GotoMinJerk(StoppableLoopThread):
         if numpy.finfo(float).eps < self.duration > self.elapsed_time:
             self.motor.goal_position = self.trajs(self.elapsed_time)
         else:
+            self.motor.goal_position = self.goal
             self.stop(wait=False)
 
     @property
@@ -88,8 +93,10 @@ class GotoMinJerk(StoppableLoopThread):
 
 
 class GotoLinear(StoppableLoopThread):
+    """ Moves a motor to a position at constant speed (run by the shared :func:`~pypot.utils.executor.default_executor`). """
     def __init__(self, motor, position, duration, frequency=50):
         StoppableLoopThread.__init__(self, frequency)
+        self.executor = default_executor()
 
         self.motor = motor
 
@@ -107,3 +114,142 @@ class GotoLinear(StoppableLoopThread):
 
         except StopIteration:
             self.stop(wait=False)
+
+
+class GroupMinJerkTrajectory(object):
+    """ Minimum jerk trajectories of several motors with the same duration.
+
+        The quintic coefficients of all the motors are solved at once (the boundary conditions matrix only depends on the duration) and their positions are evaluated together.
+
+        """
+    def __init__(self, initial, final, duration, init_vel=0.0, init_acc=0.0, final_vel=0.0, final_acc=0.0):
+        """
+        :param initial: initial position of each motor
+        :param final: final position of each motor
+        :param float duration: duration of the trajectories
+        :param init_vel, init_acc, final_vel, final_acc: boundary velocities and accelerations (scalars or one per motor)
+
+        """
+        self.initial = numpy.asarray(initial, dtype=float)
+        self.final = numpy.asarray(final, dtype=float)
+        self.duration = duration
+
+        a0 = self.initial
+        a1 = numpy.broadcast_to(numpy.asarray(init_vel, dtype=float), a0.shape)
+        a2 = numpy.broadcast_to(numpy.asarray(init_acc, dtype=float) / 2.0, a0.shape)
+        d = [duration ** i for i in range(6)]
+
+        A = numpy.array([[d[3], d[4], d[5]],
+                         [3 * d[2], 4 * d[3], 5 * d[4]],
+                         [6 * d[1], 12 * d[2], 20 * d[3]]])
+        B = numpy.array([self.final - a0 - a1 * d[1] - a2 * d[2],
+                         final_vel - a1 - 2 * a2 * d[1],
+                         final_acc - 2 * a2 + numpy.zeros_like(a0)])
+
+        # coefficients (6, motors) of the polynomials
+        self.coefficients = numpy.vstack([a0, a1, a2, numpy.linalg.solve(A, B)])
+
+    def get_value(self, t):
+        """ Returns the positions of all the motors at time t (clamped to the duration). """
+        t = min(max(t, 0.0), self.duration)
+        return numpy.polynomial.polynomial.polyval(t, self.coefficients)
+
+
+class GroupLinearTrajectory(object):
+    """ Constant speed trajectories of several motors with the same duration. """
+    def __init__(self, initial, final, duration):
+        self.initial = numpy.asarray(initial, dtype=float)
+        self.final = numpy.asarray(final, dtype=float)
+        self.duration = duration
+
+    def get_value(self, t):
+        """ Returns the positions of all the motors at time t (clamped to the duration). """
+        s = min(max(t / self.duration, 0.0), 1.0)
+        return self.initial + (self.final - self.initial) * s
+
+
+class GotoGroup(StoppableLoopThread):
+    """ Moves several motors at once along minimum jerk (or linear) trajectories.
+
+        All the positions are computed by a single group trajectory at each update, and the motors start on the same tick (run by the shared :func:`~pypot.utils.executor.default_executor`).
+
+        """
+    trajectories = {'minjerk': GroupMinJerkTrajectory, 'linear': GroupLinearTrajectory}
+
+    def __init__(self, motors, positions, duration, control='minjerk', frequency=50):
+        StoppableLoopThread.__init__(self, frequency)
+        self.executor = default_executor()
+
+        if control not in self.trajectories:
+            raise ValueError('Unknown control {} (should be in {})'.format(control,
+                                                                          tuple(self.trajectories)))
+        self.motors = list(motors)
+        self.goals = list(positions)
+        self.duration = duration
+        self.control = control
+
+    def setup(self):
+        self.t0 = time.time()
+
+        if self.duration < numpy.finfo(float).eps:
+            self.trajectory = None
+            return
+
+        # same starting points than GotoMinJerk and GotoLinear
+        register = 'present_position' if self.control == 'minjerk' else 'goal_position'
+        initial = [getattr(m, register) for m in self.motors]
+
+        self.trajectory = self.trajectories[self.control](initial, self.goals, self.duration)
+
+    def update(self):
+        if self.trajectory is not None and self.elapsed_time < self.duration:
+            positions = self.trajectory.get_value(self.elapsed_time).tolist()
+        else:
+            positions = self.goals
+            self.stop(wait=False)
+
+        for m, p in zip(self.motors, positions):
+            m.goal_position = p
+
+    @property
+    def elapsed_time(self):
+        return time.time() - self.t0
+
+
+def goto_group(motors, positions, duration, control=None, wait=False):
+    """ Moves several motors to positions within a duration.
+
+        The motors using the 'minjerk' or 'linear' control are moved together by a :class:`GotoGroup` (one per control), the other ones by their own goto_position.
+
+        :param list motors: the motors to move
+        :param list positions: the goal position of each motor
+        :param float duration: duration of the move
+        :param str control: control type ('dummy', 'minjerk' or 'linear'), defaults to the goto_behavior of each motor
+        :param bool wait: whether or not to wait for the end of the move
+
+        """
+    groups = collections.OrderedDict()
+    for m, p in zip(motors, positions):
+        c = control if control is not None else m.goto_behavior
+        ms, ps = groups.setdefault(c, ([], []))
+        ms.append(m)
+        ps.append(p)
+
+    gotos = []
+    for c, (ms, ps) in groups.items():
+        if c in GotoGroup.trajectories:
+            goto = GotoGroup(ms, ps, duration, c)
+            goto.start()
+            gotos.append(goto)
+        else:
+            for m, p in zip(ms, ps):
+                m.goto_position(p, duration, c, wait=False)
+
+    if wait:
+        if gotos:
+            for goto in gotos:
+                goto.wait_to_stop()
+        else:
+            time.sleep(duration)
+
+    return gotos
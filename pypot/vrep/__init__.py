@@ -91,6 +91,7 @@ def from_vrep(config, vrep_host='127.0.0.1', vrep_port=19997, scene=None,
 
     vreptime = vrep_time(vrep_io)
     pypot_time.time = vreptime.get_time
+    pypot_time.monotonic = vreptime.get_time
     pypot_time.sleep = vreptime.sleep
 
     if isinstance(config, str):
@@ -81,6 +81,12 @@ class VrepController(MotorsController):
 
             self.io.set_motor_force(motor_name=self._motor_name(m), force=t)
 
+        if self.snapshots is not None:
+            self.snapshots.publish(self.motors, {
+                var: [m.__dict__[var] for m in self.motors]
+                for var in ('present_position', 'present_load')
+            })
+
     def _init_vrep_streaming(self):
         # While the code below may look redundant and that
         # it could be simplified. It is written as such to
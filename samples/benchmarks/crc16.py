@@ -0,0 +1,27 @@
+import os
+import timeit
+import argparse
+
+from pypot.dynamixel.protocol import crc
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Micro-benchmark of the protocol v2 CRC-16 implementations.')
+    parser.add_argument('-N', type=int, default=10000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 14, 64, 256])
+    args = parser.parse_args()
+
+    implementations = [('reference', crc.crc16_reference),
+                       ('table', crc.crc16_table)]
+    if crc.crc16_native is not None:
+        implementations.append(('native', crc.crc16_native))
+
+    print('Default backend: {}'.format(crc.backend))
+
+    for size in args.sizes:
+        data = bytearray(os.urandom(size))
+
+        print('Packet of {} bytes:'.format(size))
+        for name, f in implementations:
+            dt = timeit.timeit(lambda: f(data, size), number=args.N) / args.N
+            print('\t{:<10} {:.2f}us'.format(name, dt * 1e6))
@@ -46,6 +46,7 @@ setup(name='pypot',
           'doc': ['sphinx', 'sphinxjp.themes.basicstrap', 'sphinx-bootstrap-theme'],
           'zmq-server': ['zmq'],
           'remote-robot': ['zerorpc'],
+          'fast-crc': ['crcmod'],
           'camera': ['hampy', 'zmq'],  # Extras require: opencv (not a PyPi packet)
           'tests': ['requests', 'websocket-client', 'poppy-ergo-jr'],
       },
@@ -53,6 +54,7 @@ setup(name='pypot',
       entry_points={
           'console_scripts': [
               'dxl-config = pypot.tools.dxlconfig:main',
+              'dxl-bus-budget = pypot.tools.busbudget:main',
               'poppy-services=pypot.creatures.services_launcher:main',
               'poppy-configure=pypot.creatures.configure_utility:main',
           ],
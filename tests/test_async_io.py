@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+
+from pypot.dynamixel.io.async_io import AsyncDxlIO
+from pypot.dynamixel.async_controller import AsyncDxlController
+from pypot.dynamixel.motor import DxlAXRXMotor
+from pypot.dynamixel.io.abstract_io import DxlTimeoutError
+
+from utils import FakeBus
+
+
+class TestAsyncDxlIO(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.bus = FakeBus([1, 2]).start()
+        self.io = AsyncDxlIO(self.bus.port, timeout=0.05)
+
+    def tearDown(self):
+        self.io.close()
+        self.run_async(asyncio.sleep(0))
+        self.bus.close()
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_coroutine_accessors(self):
+        self.bus.tables[1][36:38] = (512).to_bytes(2, 'little')
+        self.bus.tables[2][36:38] = (1023).to_bytes(2, 'little')
+
+        self.assertTrue(asyncio.iscoroutinefunction(AsyncDxlIO.get_present_position))
+        self.assertEqual(self.run_async(self.io.get_present_position((1, 2), convert=False)),
+                         (512, 1023))
+        self.assertEqual(self.run_async(self.io.get_model((1, 2))), ('AX-12', 'AX-12'))
+
+        self.run_async(self.io.set_goal_position({1: 0.0, 2: 0.0}))
+        self.assertEqual(self.run_async(self.io.get_goal_position((1, 2))), (0.15, 0.15))
+
+    def test_pipelined_requests(self):
+        async def concurrent_reads():
+            return await asyncio.gather(self.io.get_present_position((1, 2), convert=False),
+                                        self.io.scan(range(4)))
+
+        positions, ids = self.run_async(concurrent_reads())
+        self.assertEqual(positions, (0, 0))
+        self.assertEqual(ids, [1, 2])
+
+    def test_timeout(self):
+        with self.assertRaises(DxlTimeoutError):
+            self.run_async(self.io.get_present_position((1, 3), convert=False))
+
+        # the stream is still in sync after a timeout
+        self.bus.tables[1][36:38] = (42).to_bytes(2, 'little')
+        self.assertEqual(self.run_async(self.io.get_present_position((1, ), convert=False)),
+                         (42, ))
+
+    def test_cancellation(self):
+        self.bus.tables[2][36:38] = (7).to_bytes(2, 'little')
+
+        async def cancelled_then_read():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.io.get_present_position((3, ), convert=False), 0.001)
+
+            return await self.io.get_present_position((2, ), convert=False)
+
+        self.assertEqual(self.run_async(cancelled_then_read()), (7, ))
+
+    def test_close_in_flight(self):
+        async def close_while_waiting():
+            # motor 3 never answers: the request is in flight when the io is closed
+            request = asyncio.ensure_future(self.io.get_present_position((3, ), convert=False))
+            await asyncio.sleep(0.01)
+            self.io.close()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(request, 1.0)
+
+        self.run_async(close_while_waiting())
+
+    def test_controller(self):
+        for t in self.bus.tables.values():
+            t[24] = 1  # torque enabled
+            t[36:38] = (512).to_bytes(2, 'little')
+            t[30:32] = (512).to_bytes(2, 'little')
+
+        motors = [DxlAXRXMotor(id) for id in (1, 2)]
+        c = AsyncDxlController(self.io, motors, sync_freq=100.)
+
+        async def run():
+            await c.start()
+            motors[0].goal_position = 30.0
+            await asyncio.sleep(0.1)
+            await c.stop()
+
+        self.run_async(run())
+
+        self.assertFalse(c.running)
+        self.assertGreater(c.loop_stats.iterations, 1)
+        self.assertEqual(motors[1].present_position, 0.15)
+        self.assertEqual(int.from_bytes(self.bus.tables[1][30:32], 'little'), 614)
+        self.assertEqual(int.from_bytes(self.bus.tables[2][30:32], 'little'), 512)
+
+    def test_controller_error(self):
+        c = AsyncDxlController(self.io, [DxlAXRXMotor(1)], sync_freq=100.)
+
+        calls = []
+
+        async def update():
+            calls.append(None)
+            raise ValueError('unexpected')
+
+        async def run():
+            task = asyncio.ensure_future(c._run(c.period, update))
+            await asyncio.sleep(0.1)
+            self.assertFalse(task.done())
+            task.cancel()
+
+        with self.assertLogs('pypot.dynamixel.async_controller', 'ERROR'):
+            self.run_async(run())
+        # the loop kept running after the error
+        self.assertGreater(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from pypot.dynamixel.control_table import (control_table_layout, ControlTableMonitor,
+                                           diff_control_tables)
+from pypot.dynamixel.io import DxlIO, Dxl320IO
+
+from utils import FakeBus
+
+
+class TestControlTable(unittest.TestCase):
+    def test_layout(self):
+        layout = control_table_layout(Dxl320IO, 'XL-320')
+
+        names = [c.name for c in layout.controls]
+        self.assertIn('goal position', names)
+        self.assertNotIn('goal position speed', names)
+        self.assertNotIn('present position speed load', names)
+        self.assertEqual((layout.address, layout.length), (0, 50))
+
+        block = bytearray(layout.length)
+        block[0:2] = (350).to_bytes(2, 'little')
+        block[0x0B] = 2  # joint mode
+        block[0x25:0x27] = (512).to_bytes(2, 'little')
+        table, = layout.decode([bytes(block)], ['XL-320'])
+
+        self.assertEqual(table['model'], 'XL-320')
+        self.assertAlmostEqual(table['present position'], 0.15, places=2)
+        self.assertEqual(table['angle limit'], (-150.0, -150.0))
+
+    def test_monitor(self):
+        bus = FakeBus([1, 2]).start()
+        for t in bus.tables.values():
+            t.extend(bytearray(80))
+
+        try:
+            with DxlIO(bus.port) as io:
+                monitor = ControlTableMonitor(io, [1, 2])
+
+                tables, diff = monitor.snapshot()
+                self.assertEqual(list(tables.keys()), [1, 2])
+                self.assertEqual(tables[1]['model'], 'AX-12')
+                self.assertEqual(diff[1]['model'], (None, 'AX-12'))
+
+                # a single read per motor
+                bus.received = []
+                bus.tables[2][0x2B] = 42
+                tables, diff = monitor.snapshot()
+                self.assertEqual(bus.received, [(1, 0x02), (2, 0x02)])
+                self.assertEqual(diff, {2: {'present temperature': (0.0, 42.0)}})
+
+                self.assertEqual(io.get_control_table([2]), (tables[2], ))
+        finally:
+            bus.close()
+
+    def test_diff(self):
+        self.assertEqual(diff_control_tables({1: {'a': 1}}, {1: {'a': 1}}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
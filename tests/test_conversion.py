@@ -0,0 +1,49 @@
+import random
+import unittest
+
+import pypot.dynamixel.conversion as conv
+
+
+class TestBatchConversion(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+        self.models = tuple(random.choice(['MX-28', 'MX-12', 'AX-12', 'XL-320', 'EX-106'])
+                            for _ in range(200))
+
+    def assertSameConversion(self, conversion, values):
+        self.assertIsNotNone(conv.batch_conversion(conversion))
+
+        expected = [conversion(v, m) for v, m in zip(values, self.models)]
+        self.assertEqual(conv.convert_all(conversion, values, self.models), expected)
+
+    def test_dxl_to_si(self):
+        raw = [random.randint(0, 2047) for _ in self.models]
+
+        for conversion in (conv.dxl_to_degree, conv.dxl_to_speed,
+                           conv.dxl_to_load, conv.dxl_to_torque):
+            self.assertSameConversion(conversion, raw)
+
+    def test_si_to_dxl(self):
+        positions = [random.uniform(-180, 180) for _ in self.models]
+        speeds = [random.uniform(-1000, 1000) for _ in self.models]
+        torques = [random.uniform(0, 100) for _ in self.models]
+
+        self.assertSameConversion(conv.degree_to_dxl, positions)
+        self.assertSameConversion(conv.speed_to_dxl, speeds)
+        self.assertSameConversion(conv.torque_to_dxl, torques)
+
+    def test_elementwise(self):
+        raw = [tuple(random.randint(0, 2047) for _ in range(3)) for _ in self.models]
+        conversion = conv.elementwise(conv.dxl_to_degree, conv.dxl_to_speed, conv.dxl_to_load)
+
+        self.assertSameConversion(conversion, raw)
+
+        # Conversions without batch version are applied value per value
+        conversion = conv.elementwise(conv.dxl_to_degree, conv.dxl_to_current)
+        self.assertIsNone(conv.batch_conversion(conversion))
+        self.assertEqual(conv.convert_all(conversion, [(512, 2048)], ['AX-12']),
+                         [(0.15, 0.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
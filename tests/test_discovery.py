@@ -0,0 +1,66 @@
+import time
+import unittest
+
+from pypot.dynamixel import discovery
+from pypot.dynamixel.io import DxlIO, Dxl320IO
+
+from utils import FakeBus
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        discovery.clear_cache()
+
+        self.v1 = FakeBus([1, 2, 3]).start()
+        self.v2 = FakeBus([10, 11], model=350, protocol=2).start()
+
+    def tearDown(self):
+        self.v1.close()
+        self.v2.close()
+
+    def test_broadcast_ping(self):
+        with Dxl320IO(self.v2.port) as io:
+            self.assertEqual(io.scan([10, 11], timeout=0.01), [10, 11])
+
+        # a single packet was sent
+        self.assertEqual(self.v2.received, [(254, 0x01)])
+
+    def test_sparse_broadcast_ping(self):
+        # the gap between the answers of 1 and 40 is longer than the timeout
+        bus = FakeBus([1, 40], model=350, protocol=2, broadcast_delay=0.003).start()
+        try:
+            with Dxl320IO(bus.port, timeout=0.05) as io:
+                self.assertEqual(io.broadcast_ping(), [1, 40])
+
+                # the ids missing from the broadcast ping are pinged
+                bus.received = []
+                self.assertEqual(io.scan([1, 40, 41]), [1, 40])
+                self.assertEqual(bus.received, [(254, 0x01), (41, 0x01)])
+        finally:
+            bus.close()
+
+    def test_discover(self):
+        start = time.time()
+        scans = discovery.discover([self.v1.port, self.v2.port], ids=range(20), timeout=0.01)
+        self.assertLess(time.time() - start, 1.0)
+
+        self.assertEqual(scans[self.v1.port], (DxlIO, [1, 2, 3]))
+        self.assertEqual(scans[self.v2.port], (Dxl320IO, [10, 11]))
+
+    def test_cache(self):
+        discovery.scan_port(self.v1.port, ids=range(20))
+        self.v1.received = []
+
+        # only the cached ids are pinged again
+        self.assertEqual(discovery.scan_port(self.v1.port, ids=[1, 2, 5]),
+                         (DxlIO, [1, 2]))
+        self.assertEqual(self.v1.received, [(1, 0x01), (2, 0x01)])
+
+        # a motor is missing, the port is scanned again
+        del self.v1.tables[2]
+        self.assertEqual(discovery.scan_port(self.v1.port, ids=[1, 2, 5]),
+                         (DxlIO, [1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
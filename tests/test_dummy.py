@@ -31,6 +31,29 @@ class TestDummy(unittest.TestCase):
         for m in self.jr.motors:
             self.assertEqual(m.goal_position, m.present_position)
 
+    def test_snapshot(self):
+        for m in self.jr.motors:
+            m.moving_speed = 10000
+            m.goal_position = 25
+
+        self.jr._controllers[0]._updated.clear()
+        self.jr._controllers[0]._updated.wait()
+
+        snapshot = self.jr.snapshot()
+        self.assertEqual(snapshot.motors, tuple(m.name for m in self.jr.motors))
+        for m in self.jr.motors:
+            self.assertAlmostEqual(snapshot.get('present_position', m.name), 25)
+
+        with self.assertRaises(ValueError):
+            snapshot.present_position[0] = 0
+
+        self.jr._controllers[0]._updated.clear()
+        self.jr._controllers[0]._updated.wait()
+
+        newer = self.jr.snapshot()
+        self.assertGreater(newer.sequence, snapshot.sequence)
+        self.assertGreater(newer.timestamp, snapshot.timestamp)
+
     def test_empty_primitive(self):
         p = EmptyPrim(self.jr, 50.0)
         p.start()
@@ -0,0 +1,82 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from pypot.dynamixel.eeprom import EepromCache
+from pypot.dynamixel.io import DxlIO
+
+from utils import FakeBus
+
+
+class TestEepromCache(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus([1, 2]).start()
+        for t in self.bus.tables.values():
+            t[5] = 0
+            t[6:10] = bytes([0, 0, 0xFF, 0x03])
+
+        self.io = DxlIO(self.bus.port)
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache', 'eeprom.json')
+
+    def tearDown(self):
+        self.io.close()
+        self.bus.close()
+        shutil.rmtree(self.directory)
+
+    def test_read(self):
+        cache = EepromCache(self.path)
+        eeprom = cache.read(self.io, [1, 2, 3])
+
+        self.assertEqual(list(eeprom.keys()), [1, 2])
+        self.assertEqual(eeprom[1]['model'], 'AX-12')
+        self.assertEqual(eeprom[1]['return_delay_time'], 0)
+        self.assertEqual(eeprom[1]['angle_limit'], (-150.0, 150.0))
+        self.assertEqual(eeprom[1]['control_mode'], 'joint')
+
+        # the io does not need to ask the models again
+        self.bus.received = []
+        self.assertEqual(self.io.get_model([1, 2]), ('AX-12', 'AX-12'))
+        self.assertEqual(self.bus.received, [])
+
+    def test_persistence(self):
+        cache = EepromCache(self.path)
+        cache.read(self.io, [1, 2])
+        cache.save()
+
+        cache = EepromCache(self.path)
+        self.bus.received = []
+        self.assertEqual(cache.read(self.io, [1, 2])[2]['control_mode'], 'joint')
+        self.assertFalse(cache._dirty)
+        # only the model and firmware of the motors are read
+        self.assertEqual(self.bus.received, [(1, 0x02), (2, 0x02)])
+
+        # the cache is validated against the motors
+        self.bus.tables[2][2] += 1
+        self.bus.tables[2][6:10] = bytes([0, 0, 0, 0])
+        self.assertEqual(cache.read(self.io, [1, 2])[2]['control_mode'], 'wheel')
+        self.assertTrue(cache._dirty)
+
+    def test_invalidate(self):
+        cache = EepromCache(self.path)
+        cache.read(self.io, [1, 2])
+
+        self.bus.tables[1][6:10] = bytes([0, 0, 0, 0])
+        self.assertEqual(cache.read(self.io, [1, 2])[1]['control_mode'], 'joint')
+
+        cache.invalidate(self.io, [1])
+        self.assertEqual(cache.read(self.io, [1, 2])[1]['control_mode'], 'wheel')
+
+    def test_version(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            json.dump({'version': EepromCache.version + 1, 'devices': {'x': {}}}, f)
+
+        self.assertEqual(EepromCache(self.path)._devices, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
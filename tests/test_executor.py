@@ -0,0 +1,178 @@
+import time
+import threading
+import unittest
+
+from pypot.creatures import PoppyErgoJr
+from pypot.primitive import LoopPrimitive
+from pypot.utils.executor import LoopExecutor, default_executor
+from pypot.utils.stoppablethread import StoppableLoopThread
+
+
+class Counter(StoppableLoopThread):
+    def __init__(self, executor, frequency=100., limit=None):
+        StoppableLoopThread.__init__(self, frequency)
+        self.executor = executor
+        self.limit = limit
+
+        self.updates = 0
+        self.teardowns = 0
+
+    def update(self):
+        self.updates += 1
+        if self.updates == self.limit:
+            self.stop(wait=False)
+
+    def teardown(self):
+        self.teardowns += 1
+
+
+class Crasher(Counter):
+    def setup(self):
+        raise ValueError('crash')
+
+
+class TestLoopExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = LoopExecutor('TestExecutor')
+
+    def test_shared_thread(self):
+        loops = [Counter(self.executor) for _ in range(20)]
+
+        loops[0].start()
+        loops[0].wait_to_start()
+        nb_threads = threading.active_count()
+
+        for loop in loops[1:]:
+            loop.start()
+            loop.wait_to_start()
+        # at most the other workers of the pool were started
+        self.assertLessEqual(threading.active_count(), nb_threads + 3)
+
+        time.sleep(0.3)
+        for loop in loops:
+            loop.stop()
+
+        for loop in loops:
+            self.assertGreater(loop.updates, 20)
+            self.assertEqual(loop.teardowns, 1)
+            self.assertFalse(loop.running)
+
+        time.sleep(0.05)
+        self.assertEqual(self.executor.nb_tasks, 0)
+
+    def test_pause_resume(self):
+        loop = Counter(self.executor)
+        loop.start()
+        loop.wait_to_start()
+        time.sleep(0.1)
+
+        loop.pause()
+        time.sleep(0.05)
+        updates = loop.updates
+        time.sleep(0.1)
+        self.assertEqual(loop.updates, updates)
+
+        loop.resume()
+        time.sleep(0.1)
+        self.assertGreater(loop.updates, updates)
+
+        loop.stop()
+
+    def test_stop_from_update(self):
+        loop = Counter(self.executor, limit=5)
+        loop.start()
+        loop.wait_to_stop()
+
+        self.assertEqual(loop.updates, 5)
+        self.assertEqual(loop.teardowns, 1)
+
+        # restart
+        loop.limit = 10
+        loop.start()
+        loop.wait_to_stop()
+        self.assertEqual(loop.updates, 10)
+        self.assertEqual(loop.teardowns, 2)
+
+    def test_restart_from_executor(self):
+        loop = Counter(self.executor, frequency=50.)
+        loop.start()
+        loop.wait_to_start()
+
+        self.executor.schedule(lambda: loop.start())
+        time.sleep(0.2)
+        updates = loop.updates
+        time.sleep(0.5)
+
+        # a single chain of updates is left running
+        self.assertLess(loop.updates - updates, 35)
+        self.assertEqual(loop.teardowns, 1)
+        loop.stop()
+        self.assertEqual(loop.teardowns, 2)
+
+    def test_wait_from_executor(self):
+        other = Counter(self.executor)
+        other.start()
+        other.wait_to_start()
+
+        errors = []
+
+        def wait():
+            try:
+                other.wait_to_stop()
+            except RuntimeError as e:
+                errors.append(e)
+
+        self.executor.schedule(wait)
+        time.sleep(0.1)
+        self.assertEqual(len(errors), 1)
+        other.stop()
+
+    def test_crashed_at_setup(self):
+        loop = Crasher(self.executor)
+        loop.start()
+        self.assertRaises(RuntimeError, loop.wait_to_start)
+
+
+class Follower(LoopPrimitive):
+    executor = default_executor()
+
+    def update(self):
+        self.robot.m1.goal_position = 12.
+
+
+class TestExecutedPrimitives(unittest.TestCase):
+    def setUp(self):
+        self.jr = PoppyErgoJr(simulator='dummy')
+
+    def tearDown(self):
+        self.jr.close()
+
+    def test_primitive(self):
+        p = Follower(self.jr, 50)
+        p.start()
+        time.sleep(0.2)
+        self.assertTrue(p.running)
+        self.assertAlmostEqual(self.jr.m1.goal_position, 12.)
+
+        p.stop()
+        self.assertFalse(p.running)
+        self.assertNotIn(p, self.jr._primitive_manager.primitives)
+
+    def test_goto(self):
+        nb_threads = threading.active_count()
+
+        for m in self.jr.motors[1:]:
+            m.goto_position(20., 0.3, control='minjerk')
+        # at most the thread and the workers of the shared executor
+        self.assertLessEqual(threading.active_count(), nb_threads + 5)
+
+        self.jr.m1.goto_position(-20., 0.3, control='linear', wait=True)
+        time.sleep(0.1)
+
+        self.assertAlmostEqual(self.jr.m1.goal_position, -20.)
+        for m in self.jr.motors[1:]:
+            self.assertAlmostEqual(m.goal_position, 20., places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from pypot.utils.interpolation import Trajectory
+
+
+class TestTrajectory(unittest.TestCase):
+    def test_uniform_linear(self):
+        values = np.zeros((4, 2, 2))
+        values[:, 0, 0] = [0., 10., 30., 60.]
+        values[:, 1, 0] = -1.
+
+        trajectory = Trajectory.uniform(10, values)
+        self.assertAlmostEqual(trajectory.duration, 0.3)
+
+        for t, p in ((0., 0.), (0.05, 5.), (0.25, 45.), (0.3, 60.), (1., 60.), (-1., 0.)):
+            position = trajectory(t)
+            self.assertEqual(position.shape, (2, 2))
+            self.assertAlmostEqual(position[0, 0], p)
+            self.assertAlmostEqual(position[1, 0], -1.)
+
+    def test_timed_linear(self):
+        times = np.array([0.02, 0.05, 0.07, 0.12, 0.13])
+        values = np.random.uniform(-90, 90, (5, 3, 2))
+        trajectory = Trajectory(times, values)
+
+        for t in np.linspace(0, 0.15, 31):
+            expected = [np.interp(t, times, values[:, m, 0]) for m in range(3)]
+            np.testing.assert_allclose(trajectory(t)[:, 0], expected)
+
+    def test_cubic(self):
+        t = np.arange(10) / 10.
+        values = (3 * t ** 2 - t)[:, None, None]
+
+        linear = Trajectory.uniform(10, values)
+        cubic = Trajectory.uniform(10, values, mode='cubic')
+
+        for tt in np.linspace(0.1, 0.8, 15):
+            self.assertAlmostEqual(cubic(tt)[0, 0], 3 * tt ** 2 - tt)
+            # both go through the samples
+            self.assertAlmostEqual(cubic(round(tt, 1))[0, 0], linear(round(tt, 1))[0, 0])
+
+    def test_single_sample(self):
+        trajectory = Trajectory([0.1], np.ones((1, 2, 2)), mode='cubic')
+        np.testing.assert_array_equal(trajectory(5.), np.ones((2, 2)))
+
+    def test_errors(self):
+        self.assertRaises(ValueError, Trajectory, None, np.zeros((0, 1, 2)))
+        self.assertRaises(ValueError, Trajectory, None, np.zeros((3, 1, 2)), 'nearest')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import time
+import unittest
+
+import numpy as np
+
+from pypot.creatures import PoppyErgoJr
+from pypot.primitive import LoopPrimitive
+from pypot.primitive.manager import blend, combine
+
+
+class TestCombine(unittest.TestCase):
+    def setUp(self):
+        # 3 primitives, 2 motors, 2 registers
+        self.values = np.array([[[10., 1.], [0., 0.]],
+                                [[-20., 2.], [5., 0.]],
+                                [[40., 3.], [0., 0.]]])
+        self.mask = np.array([[[True, True], [False, False]],
+                              [[True, False], [True, False]],
+                              [[False, True], [False, False]]])
+
+    def test_mean(self):
+        combined, valid = combine(self.values, self.mask)
+        np.testing.assert_array_equal(valid, [[True, True], [True, False]])
+        np.testing.assert_allclose(combined[valid], [-5., 2., 5.])
+
+    def test_weighted_mean(self):
+        combined, valid = combine(self.values, self.mask, 'weighted_mean', weights=[3., 1., 0.])
+        np.testing.assert_array_equal(valid, [[True, True], [True, False]])
+        np.testing.assert_allclose(combined[valid], [2.5, 1., 5.])
+
+    def test_priority(self):
+        combined, valid = combine(self.values, self.mask, 'priority', priorities=[0, 1, 0])
+        np.testing.assert_allclose(combined[valid], [-20., 2., 5.])
+
+        combined, valid = combine(self.values, self.mask, 'priority', priorities=[1, 0, 1])
+        np.testing.assert_allclose(combined[valid], [10., 2., 5.])
+
+    def test_sum(self):
+        combined, valid = combine(self.values, self.mask, 'sum')
+        np.testing.assert_allclose(combined[valid], [-10., 4., 5.])
+
+    def test_max_min(self):
+        combined, valid = combine(self.values, self.mask, 'max')
+        np.testing.assert_allclose(combined[valid], [10., 3., 5.])
+
+        combined, valid = combine(self.values, self.mask, 'min')
+        np.testing.assert_allclose(combined[valid], [-20., 1., 5.])
+
+    def test_unknown_mode(self):
+        self.assertRaises(ValueError, combine, self.values, self.mask, 'median')
+
+
+class TestBlend(unittest.TestCase):
+    def layer(self, mode, values, weights=(1., 1.)):
+        values = np.array(values, dtype=float)[:, None]
+        return (mode, np.nan_to_num(values), ~np.isnan(values), np.array(weights))
+
+    def test_mean(self):
+        combined, valid = blend([self.layer('mean', [10., np.nan], (3., 1.)),
+                                 self.layer('mean', [-10., np.nan], (1., 1.))], 2, 1)
+        np.testing.assert_array_equal(valid, [[True], [False]])
+        self.assertAlmostEqual(combined[0, 0], 5.)
+
+    def test_override(self):
+        base = self.layer('mean', [10., 10.])
+
+        combined, _ = blend([base, self.layer('override', [-10., np.nan])], 2, 1)
+        np.testing.assert_allclose(combined[:, 0], [-10., 10.])
+
+        # cross-fade
+        combined, _ = blend([base, self.layer('override', [-10., -10.], (0.25, 0.75))], 2, 1)
+        np.testing.assert_allclose(combined[:, 0], [5., -5.])
+
+        # applied by increasing priority
+        combined, _ = blend([base,
+                             self.layer('override', [-10., np.nan]),
+                             self.layer('override', [20., np.nan])], 2, 1)
+        self.assertAlmostEqual(combined[0, 0], 20.)
+
+    def test_offset_and_clamps(self):
+        base = self.layer('mean', [10., np.nan])
+
+        combined, valid = blend([base, self.layer('offset', [5., 5.], (0.5, 1.))], 2, 1)
+        np.testing.assert_array_equal(valid, [[True], [False]])
+        self.assertAlmostEqual(combined[0, 0], 12.5)
+
+        combined, _ = blend([base, self.layer('min', [4., 4.])], 2, 1)
+        self.assertAlmostEqual(combined[0, 0], 4.)
+
+        combined, _ = blend([base, self.layer('max', [4., 4.])], 2, 1)
+        self.assertAlmostEqual(combined[0, 0], 10.)
+
+        combined, _ = blend([base, self.layer('max', [20., 4.], (0.5, 1.))], 2, 1)
+        self.assertAlmostEqual(combined[0, 0], 15.)
+
+
+class Holder(LoopPrimitive):
+    def __init__(self, robot, position, priority=0):
+        LoopPrimitive.__init__(self, robot, 50)
+        self.position = position
+        self.priority = priority
+
+    def update(self):
+        self.robot.m1.goal_position = self.position
+        self.robot.m2.led = 'red'
+
+
+class TestManager(unittest.TestCase):
+    def setUp(self):
+        self.jr = PoppyErgoJr(simulator='dummy')
+
+    def tearDown(self):
+        self.jr.close()
+
+    def hold(self, *prims):
+        for p in prims:
+            p.start()
+        time.sleep(0.2)
+        position = self.jr.m1.goal_position
+        for p in prims:
+            p.stop()
+        return position
+
+    def test_mean(self):
+        self.jr._primitive_manager._filter = 'mean'
+        self.assertAlmostEqual(self.hold(Holder(self.jr, 10.), Holder(self.jr, -20.)), -5.)
+        self.assertEqual(self.jr.m2.led, 'red')
+
+    def test_priority(self):
+        self.jr._primitive_manager._filter = 'priority'
+        self.assertAlmostEqual(self.hold(Holder(self.jr, 10.), Holder(self.jr, -20., priority=1)), -20.)
+
+    def test_blend(self):
+        self.jr._primitive_manager._filter = 'blend'
+
+        gait, balance = Holder(self.jr, 10.), Holder(self.jr, -20., priority=1)
+        balance.blend = 'override'
+        self.assertAlmostEqual(self.hold(gait, balance), -20.)
+
+        gait, balance = Holder(self.jr, 10.), Holder(self.jr, 4., priority=1)
+        balance.blend = 'offset'
+        balance.motor_weights = {'m1': 0.5}
+        self.assertAlmostEqual(self.hold(gait, balance), 12.)
+
+    def test_ramp(self):
+        self.jr._primitive_manager._filter = 'blend'
+
+        gait, balance = Holder(self.jr, 10.), Holder(self.jr, -10., priority=1)
+        balance.blend = 'override'
+        balance.ramp = 1.
+
+        gait.start()
+        balance.start()
+
+        positions = []
+        for _ in range(3):
+            time.sleep(0.3)
+            positions.append(self.jr.m1.goal_position)
+
+        time.sleep(0.5)
+        self.assertAlmostEqual(self.jr.m1.goal_position, -10.)
+        self.assertTrue(10. > positions[0] > positions[1] > positions[2] > -10.)
+
+        balance.stop()
+        time.sleep(0.4)
+        self.assertTrue(-10. < self.jr.m1.goal_position < 10.)
+        time.sleep(0.8)
+        self.assertAlmostEqual(self.jr.m1.goal_position, 10.)
+
+        gait.stop()
+
+    def test_stiffen(self):
+        class Stiffen(LoopPrimitive):
+            def update(self):
+                self.robot.m1.compliant = False
+                self.robot.m1.goal_position = 42.
+
+        self.jr._primitive_manager._filter = 'blend'
+        self.jr.m1.compliant = True
+
+        p = Stiffen(self.jr, 50)
+        p.start()
+        time.sleep(0.2)
+        self.assertFalse(self.jr.m1.compliant)
+        self.assertAlmostEqual(self.jr.m1.goal_position, 42.)
+
+        # the requests are affected again when the register is changed outside of the primitives
+        self.jr.m1.goal_position = 0.
+        time.sleep(0.1)
+        self.assertAlmostEqual(self.jr.m1.goal_position, 42.)
+        p.stop()
+
+    def test_filter_function(self):
+        self.jr._primitive_manager._filter = lambda val: max(val)
+        self.assertAlmostEqual(self.hold(Holder(self.jr, 10.), Holder(self.jr, -20.)), 10.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from pypot.creatures import PoppyErgoJr
+from pypot.primitive import move_format
+from pypot.primitive.move import Move, MovePlayer, MoveRecorder
+
+
+class TestBinaryMove(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'move.bin')
+
+        self.motors = ['m1', 'm2', 'm3']
+        self.frames = np.random.uniform(-90, 90, (200, 3, 2)).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_roundtrip(self):
+        Move.from_array(50, self.motors, self.frames).save_binary(self.path)
+        self.assertTrue(move_format.is_move_file(self.path))
+
+        move = Move.load_binary(self.path)
+        self.assertIsInstance(move._frames, np.memmap)
+        self.assertEqual(move.framerate, 50)
+        self.assertEqual(move.motors, self.motors)
+        self.assertEqual(len(move), 200)
+        np.testing.assert_array_equal(move.to_array()[1], self.frames)
+
+        move = Move.load_binary(self.path, mmap=False)
+        self.assertNotIsInstance(move._frames, np.memmap)
+        np.testing.assert_array_equal(move.to_array()[1], self.frames)
+
+    def test_partial_frame(self):
+        Move.from_array(50, self.motors, self.frames).save_binary(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 7)
+
+        self.assertEqual(len(Move.load_binary(self.path)), 200)
+
+    def test_json_conversion(self):
+        move = Move(50)
+        for i, frame in enumerate(self.frames.tolist()):
+            move.add_position(dict(zip(self.motors, frame)), i / 50.)
+
+        f = io.StringIO()
+        move.save(f)
+        Move.loads(f.getvalue()).save_binary(self.path)
+
+        binary = Move.load_binary(self.path)
+        np.testing.assert_allclose(binary.to_array()[1], self.frames, atol=1e-4)
+
+        f = io.StringIO()
+        binary.save(f)
+        back = Move.loads(f.getvalue())
+        self.assertEqual(len(back), 200)
+        np.testing.assert_allclose(back.to_array()[1], self.frames, atol=1e-4)
+
+    def test_resampling(self):
+        move = Move(10)
+        for t, p in ((0.0, 0.0), (0.12, 12.0), (0.19, 19.0)):
+            move.add_position({'m1': (p, 1.0)}, t)
+
+        motors, frames = move.to_array()
+        self.assertEqual(motors, ['m1'])
+        np.testing.assert_allclose(frames[:, 0, 0], [0., 10., 19.])
+
+    def test_trajectory(self):
+        move = Move(10)
+        for t, p in ((0.02, 0.0), (0.12, 10.0), (0.19, 17.0)):
+            move.add_position({'m1': (p, 1.0), 'm2': (-p, 0.0)}, t)
+
+        motors, trajectory = move.trajectory()
+        self.assertEqual(motors, ['m1', 'm2'])
+        np.testing.assert_allclose(trajectory(0.16), [[14., 1.], [-14., 0.]])
+        np.testing.assert_allclose(trajectory(0.), [[0., 1.], [0., 0.]])
+
+    def test_not_a_move(self):
+        with open(self.path, 'w') as f:
+            f.write('{"framerate": 50}')
+
+        self.assertFalse(move_format.is_move_file(self.path))
+        self.assertRaises(ValueError, Move.load_binary, self.path)
+
+
+class TestMoveFileWriter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'move.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_chunks(self):
+        frames = np.random.uniform(-90, 90, (1000, 4, 2)).astype(np.float32)
+
+        with move_format.MoveFileWriter(self.path, 50, 'abcd', chunk_size=64) as writer:
+            for frame in frames[:300]:
+                writer.append(frame)
+
+            # only the full chunks are written
+            deadline = time.time() + 5
+            while len(Move.load_binary(writer.partial_path)) < 256 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(Move.load_binary(writer.partial_path)), 256)
+
+            for frame in frames[300:]:
+                writer.append(frame)
+
+            self.assertEqual(writer.nb_frames, 1000)
+            # the chunks are reused
+            self.assertLessEqual(writer._free.qsize(), 4)
+
+        move = Move.load_binary(self.path)
+        self.assertEqual(move.motors, list('abcd'))
+        np.testing.assert_array_equal(move.to_array()[1], frames)
+        self.assertFalse(os.path.exists(writer.partial_path))
+
+    def test_overwrite_mapped_file(self):
+        frames = np.random.uniform(-90, 90, (1000, 4, 2)).astype(np.float32)
+        Move.from_array(50, 'abcd', frames).save_binary(self.path)
+        old = Move.load_binary(self.path)
+
+        with move_format.MoveFileWriter(self.path, 50, 'abcd') as writer:
+            writer.append(frames[0])
+        Move.from_array(50, 'abcd', frames[:10]).save_binary(self.path)
+
+        # the moves mapped from the previous files are still readable
+        np.testing.assert_array_equal(old.to_array()[1][500], frames[500])
+        self.assertEqual(len(Move.load_binary(self.path)), 10)
+
+
+class TestStreamingRecorder(unittest.TestCase):
+    def setUp(self):
+        self.jr = PoppyErgoJr(simulator='dummy')
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.jr.close()
+        shutil.rmtree(self.dir)
+
+    def test_record(self):
+        path = os.path.join(self.dir, 'record.bin')
+
+        Move.from_array(50, ['m1'], np.zeros((5, 1, 2))).save_binary(path)
+
+        recorder = MoveRecorder(self.jr, 50, self.jr.motors, filename=path, chunk_size=8)
+        # a move of a previous session is not returned
+        self.assertEqual(len(recorder.move), 0)
+
+        recorder.start()
+        time.sleep(0.5)
+        recorder.stop()
+
+        move = recorder.move
+        self.assertIs(recorder.move, move)
+        self.assertEqual(move.framerate, 50)
+        self.assertEqual(move.motors, [m.name for m in self.jr.motors])
+        self.assertGreaterEqual(len(move), 20)
+        np.testing.assert_allclose(move.to_array()[1][-1, :, 0],
+                                   [m.present_position for m in self.jr.motors], atol=1e-3)
+
+        # restarting the recording keeps the previous move readable
+        frames = np.array(move.to_array()[1])
+        recorder.start()
+        time.sleep(0.1)
+        recorder.stop()
+        np.testing.assert_array_equal(move.to_array()[1], frames)
+        self.assertLess(len(recorder.move), len(move))
+
+
+class TestColumnarPlayer(unittest.TestCase):
+    def setUp(self):
+        self.jr = PoppyErgoJr(simulator='dummy')
+
+    def tearDown(self):
+        self.jr.close()
+
+    def test_position_at(self):
+        frames = np.zeros((3, 1, 2), dtype=np.float32)
+        frames[:, 0, 0] = [0., 10., 30.]
+
+        player = MovePlayer(self.jr, Move.from_array(10, ['m1'], frames))
+        player._motors, player._trajectory = player.move.trajectory()
+
+        self.assertAlmostEqual(player.duration(), 0.3)
+        self.assertAlmostEqual(player._position_at(0.05)['m1'][0], 5.)
+        self.assertAlmostEqual(player._position_at(0.15)['m1'][0], 20.)
+        self.assertAlmostEqual(player._position_at(1.0)['m1'][0], 30.)
+        self.assertAlmostEqual(player._position_at(-1.0)['m1'][0], 0.)
+
+    def test_play(self):
+        frames = np.zeros((10, 2, 2), dtype=np.float32)
+        frames[:, 0, 0] = np.linspace(0, 3, 10)
+        frames[:, 1, 0] = -4.
+
+        with tempfile.NamedTemporaryFile(suffix='.bin') as f:
+            Move.from_array(50, ['m1', 'm2'], frames).save_binary(f.name)
+
+            player = MovePlayer(self.jr, move_filename=f.name)
+            player.start()
+            player.wait_to_stop()
+
+        self.assertAlmostEqual(self.jr.m2.goal_position, -4., places=3)
+        self.assertGreater(self.jr.m1.goal_position, 2.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import unittest
+import itertools
+
+from pypot.dynamixel.protocol import v1, v2, crc
+from pypot.dynamixel.protocol.parser import DxlStatusPacketParser
+from pypot.dynamixel.conversion import dxl_code, dxl_code_all
+
+
+def v1_status_packet(id, parameters, error=0):
+    data = bytearray((0xFF, 0xFF, id, len(parameters) + 2, error)) + bytearray(parameters)
+    return data + bytearray((255 - sum(data[2:]) % 256, ))
+
+
+def v2_status_packet(id, parameters, error=0):
+    data = bytearray((0xFF, 0xFF, 0xFD, 0x00, id))
+    data += bytearray(dxl_code(len(parameters) + 4, 2))
+    data += bytearray((0x55, error)) + bytearray(parameters)
+    return data + bytearray(dxl_code(crc.crc16(data, len(data)), 2))
+
+
+class TestSyncWriteTemplate(unittest.TestCase):
+    def check_template(self, protocol, length, nb_elem, value_for_id):
+        ids = tuple(value_for_id.keys())
+        t = protocol.DxlSyncWriteTemplate(0x1E, length, nb_elem, ids)
+
+        data = []
+        for motor_id, value in value_for_id.items():
+            data.extend(itertools.chain((motor_id, ),
+                                        dxl_code_all(value, length, nb_elem)))
+        p = protocol.DxlSyncWritePacket(0x1E, length * nb_elem, data)
+
+        self.assertEqual(t.fill(tuple(value_for_id.values())).to_string(),
+                         p.to_string())
+        self.assertEqual(t.values, list(value_for_id.values()))
+
+    def test_v1(self):
+        self.check_template(v1, 2, 1, {1: 512, 2: 1023, 12: 0})
+        self.check_template(v1, 2, 3, {11: (2048, 0, 1023), 12: (0, 1024, 12)})
+        self.check_template(v1, 1, 1, {3: 1})
+
+    def test_v2(self):
+        self.check_template(v2, 2, 1, {1: 512, 2: 1023, 12: 0})
+        self.check_template(v2, 2, 2, {11: (500, 1000), 12: (0, 1024)})
+        self.check_template(v2, 1, 1, {3: 7})
+
+    def test_refill(self):
+        for protocol in (v1, v2):
+            t = protocol.DxlSyncWriteTemplate(0x1E, 2, 1, (1, 2))
+
+            for values in ((0, 0), (1023, 12), (511, 4095)):
+                data = [1, values[0] % 256, values[0] >> 8,
+                        2, values[1] % 256, values[1] >> 8]
+                p = protocol.DxlSyncWritePacket(0x1E, 2, data)
+                self.assertEqual(t.fill(values).to_string(), p.to_string())
+
+    def test_wrong_number_of_values(self):
+        t = v1.DxlSyncWriteTemplate(0x1E, 2, 1, (1, 2))
+        with self.assertRaises(ValueError):
+            t.fill((0, ))
+
+
+class TestCRC16(unittest.TestCase):
+    def check_crc(self, f):
+        for size in range(32):
+            data = bytearray(os.urandom(size + 2))
+            for blk in (data, memoryview(data), list(data)):
+                self.assertEqual(f(blk, size, 0x1234),
+                                 crc.crc16_reference(data, size, 0x1234))
+
+    def test_table(self):
+        self.check_crc(crc.crc16_table)
+
+    @unittest.skipIf(crc.crc16_native is None, 'crcmod is not installed')
+    def test_native(self):
+        self.check_crc(crc.crc16_native)
+
+    def test_status_packet(self):
+        sp = v2.DxlStatusPacket(1, 0, (0x00, 0x02))
+        data = bytearray((0xFF, 0xFF, 0xFD, 0x00, 0x01, 0x06, 0x00, 0x55, 0x00, 0x00, 0x02))
+        data.extend(v2.dxl_code(crc.crc16(data, len(data)), 2))
+
+        self.assertEqual(v2.DxlStatusPacket.from_string(data), sp)
+
+        data[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            v2.DxlStatusPacket.from_string(data)
+
+
+class TestStatusPacketParser(unittest.TestCase):
+    def check_parser(self, protocol, make_packet):
+        packets = [make_packet(1, (0, 2)), make_packet(2, (1, 2, 3)), make_packet(3, ())]
+        corrupted = make_packet(4, (1, 2))
+        corrupted[-1] ^= 0xFF
+
+        stream = b'\x00\xFF' + packets[0] + corrupted + packets[1] + b'\xFF' + packets[2]
+
+        parser = DxlStatusPacketParser(protocol)
+        parsed = []
+
+        # Feed the stream byte per byte to check partial packets handling
+        for i in range(len(stream)):
+            parser.feed(stream[i:i + 1])
+            parsed.extend(parser)
+
+        self.assertEqual([p.id for p in parsed], [1, 2, 3])
+        self.assertEqual([p.parameters for p in parsed], [(0, 2), (1, 2, 3), ()])
+        self.assertEqual(len(parser), 0)
+        self.assertEqual(parser.dropped, 3 + len(corrupted))
+
+    def test_v1(self):
+        self.check_parser(v1, v1_status_packet)
+
+    def test_v2(self):
+        self.check_parser(v2, v2_status_packet)
+
+    def test_missing(self):
+        packet = v2_status_packet(1, (0, 2))
+        parser = DxlStatusPacketParser(v2)
+
+        self.assertEqual(parser.missing(), v2.DxlPacketHeader.length)
+        parser.feed(packet[:5])
+        self.assertEqual(parser.missing(), v2.DxlPacketHeader.length - 5)
+        parser.feed(packet[5:8])
+        self.assertEqual(parser.missing(), len(packet) - 8)
+        self.assertIsNone(parser.next_packet())
+        parser.feed(packet[8:])
+        self.assertEqual(parser.missing(), 0)
+        self.assertEqual(parser.next_packet().parameters, (0, 2))
+
+    def test_status_packet_size(self):
+        rp = v2.DxlSyncReadPacket((1, 2, 3), 0x25, 2)
+        self.assertEqual(v2.status_packet_size(rp), 3 * len(v2_status_packet(1, (0, 0))))
+
+        rp = v1.DxlReadDataPacket(1, 0x24, 6)
+        self.assertEqual(v1.status_packet_size(rp), len(v1_status_packet(1, (0, ) * 6)))
+
+        for protocol, make_packet in ((v1, v1_status_packet), (v2, v2_status_packet)):
+            rp = protocol.DxlBulkReadPacket(((1, 0x2A, 2), (2, 0x24, 6)))
+            self.assertEqual(protocol.status_packet_size(rp),
+                             len(make_packet(1, (0, ) * 2)) + len(make_packet(2, (0, ) * 6)))
+
+
+class TestBulkReadPacket(unittest.TestCase):
+    def test_v1(self):
+        rp = v1.DxlBulkReadPacket(((1, 0x2A, 2), (2, 0x24, 6)))
+
+        self.assertEqual(rp.id, v1.DxlBroadcast)
+        self.assertEqual(rp.parameters, (0x00, 2, 1, 0x2A, 6, 2, 0x24))
+        self.assertEqual(rp.id_address_length, ((1, 0x2A, 2), (2, 0x24, 6)))
+
+    def test_v2(self):
+        rp = v2.DxlBulkReadPacket(((1, 0x2A, 2), (2, 0x124, 6)))
+
+        self.assertEqual(rp.id, v2.DxlBroadcast)
+        self.assertEqual(list(rp.parameters), [1, 0x2A, 0x00, 2, 0x00, 2, 0x24, 0x01, 6, 0x00])
+        self.assertEqual(rp.id_address_length, ((1, 0x2A, 2), (2, 0x124, 6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,6 +66,15 @@ class TestRestApi(unittest.TestCase):
         response = self.get(url)
         self.assert_status(response, 200, url)
 
+    def test_metrics(self):
+        """ API REST test for request:
+        GET /metrics
+        """
+        url = '/metrics'  # OK
+        response = self.get(url)
+        self.assert_status(response, 200, url)
+        self.assertIn('primitive_manager', response.json())
+
     def test_paths(self):
         """ API REST test for request:
         GET /
@@ -0,0 +1,86 @@
+import time
+import unittest
+
+from pypot.utils.histogram import LogHistogram
+from pypot.utils.stoppablethread import StoppableLoopThread, LoopOverrunPolicy
+
+
+class SlowLoop(StoppableLoopThread):
+    """ Loop whose updates regularly overrun their period. """
+    def __init__(self, frequency, policy, slow_every=5, slow_duration=0.035):
+        StoppableLoopThread.__init__(self, frequency, overrun_policy=policy)
+        self.slow_every = slow_every
+        self.slow_duration = slow_duration
+        self.starts = []
+
+    def update(self):
+        self.starts.append(time.monotonic())
+        if len(self.starts) % self.slow_every == 0:
+            time.sleep(self.slow_duration)
+
+
+class TestLoop(unittest.TestCase):
+    def run_loop(self, loop, duration=0.5):
+        loop.start()
+        time.sleep(duration)
+        loop.stop()
+        return loop.loop_stats
+
+    def test_no_drift(self):
+        loop = SlowLoop(100., LoopOverrunPolicy.skip, slow_every=10 ** 6)
+        stats = self.run_loop(loop)
+
+        # The updates stay on the initial grid
+        elapsed = loop.starts[-1] - loop.starts[0]
+        self.assertLess(abs(elapsed - (len(loop.starts) - 1) * loop.period), loop.period / 2)
+        self.assertEqual(stats.overruns, 0)
+        self.assertEqual(stats.iterations, len(loop.starts))
+
+    def test_skip(self):
+        stats = self.run_loop(SlowLoop(100., LoopOverrunPolicy.skip))
+
+        self.assertGreater(stats.overruns, 0)
+        self.assertGreaterEqual(stats.skipped, 2 * stats.overruns)
+
+    def test_catch_up(self):
+        loop = SlowLoop(100., LoopOverrunPolicy.catch_up)
+        stats = self.run_loop(loop)
+
+        self.assertGreater(stats.overruns, 0)
+        self.assertEqual(stats.skipped, 0)
+
+        # The missed ticks are run back to back
+        gaps = [b - a for a, b in zip(loop.starts, loop.starts[1:])]
+        self.assertLess(min(gaps), loop.period / 2)
+
+    def test_run_late(self):
+        stats = self.run_loop(SlowLoop(100., LoopOverrunPolicy.run_late))
+
+        self.assertGreater(stats.overruns, 0)
+        self.assertEqual(stats.skipped, 0)
+
+
+class TestLogHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        h = LogHistogram(max_value=10.0, unit=1e-6, precision=5)
+        values = [i * 1e-4 for i in range(1, 10001)]
+        for v in values:
+            h.record(v)
+
+        self.assertEqual(h.count, len(values))
+        self.assertEqual(h.max, values[-1])
+        for q in (50, 90, 99):
+            expected = values[int(q / 100. * len(values)) - 1]
+            self.assertAlmostEqual(h.percentile(q), expected, delta=expected / 16.)
+
+    def test_clamp(self):
+        h = LogHistogram(max_value=1.0)
+        h.record(-1.0)
+        h.record(100.0)
+
+        self.assertEqual(h.count, 2)
+        self.assertLessEqual(h.percentile(100), 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from pypot.dynamixel.motor import DxlMXMotor
+from pypot.dynamixel.store import DxlStateStore
+from pypot.dynamixel.controller import PosSpeedLoadDxlController
+
+
+class FakeIO(object):
+    port = 'fake'
+
+    def __init__(self, values):
+        self.values = values
+        self.goals = None
+
+    def get_present_position_speed_load(self, ids):
+        return [self.values[id] for id in ids]
+
+    def set_goal_position_speed_load(self, values):
+        self.goals = values
+
+
+class TestDxlStateStore(unittest.TestCase):
+    def setUp(self):
+        self.motors = [DxlMXMotor(1, direct=True, offset=0.0),
+                       DxlMXMotor(2, direct=False, offset=10.0)]
+
+    def test_motor_views(self):
+        self.motors[1].__dict__['present_position'] = 30.0
+
+        store = DxlStateStore(self.motors)
+
+        self.assertNotIn('present_position', self.motors[1].__dict__)
+        self.assertEqual(self.motors[1].present_position, -40.0)
+
+        self.motors[1].goal_position = 20.0
+        self.assertEqual(store.arrays['goal_position'][1], -30.0)
+        self.assertEqual(list(store.get('goal_position')), [0.0, 20.0])
+
+        store.set('goal_position', [5.0, -5.0])
+        self.assertEqual([m.goal_position for m in self.motors], [5.0, -5.0])
+
+    def test_pos_speed_load_controller(self):
+        io = FakeIO({1: (10.0, 1.0, 2.0), 2: (30.0, 3.0, 4.0)})
+        c = PosSpeedLoadDxlController(io, self.motors, 50.)
+        c.store = DxlStateStore(self.motors)
+
+        c.get_present_position_speed_load(self.motors)
+
+        self.assertEqual(list(c.store.arrays['present_position']), [10.0, 30.0])
+        self.assertEqual([m.present_position for m in self.motors], [10.0, -40.0])
+        self.assertEqual([m.present_load for m in self.motors], [2.0, -4.0])
+
+        self.motors[1].__dict__['compliant'] = False
+        self.motors[1].goal_position = 0.0
+        self.motors[1].moving_speed = 50.0
+        self.motors[1].torque_limit = 80.0
+        c._old_torques = {1: False, 2: True}
+
+        c.set_goal_position_speed_load(self.motors)
+        self.assertEqual(io.goals, {2: (-10.0, -50.0, 80.0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,302 @@
+import time
+import unittest
+
+from collections import defaultdict
+
+from pypot.dynamixel.io import DxlIO, DxlError
+from pypot.dynamixel.motor import DxlMXMotor
+from pypot.dynamixel.protocol import v1
+from pypot.dynamixel.budget import BusBudget, plan
+from pypot.dynamixel.controller import (DxlController, BulkReadDxlController,
+                                        PosSpeedLoadDxlController)
+from pypot.dynamixel.syncloop import (MetaDxlController, BaseDxlController,
+                                      ScheduledDxlController)
+from pypot.dynamixel.multibus import MultiBusController
+from pypot.robot.controller import MotorsController
+from pypot.utils import SyncEvent
+
+
+class FakeIO(object):
+    _protocol = v1
+    port = 'fake'
+
+
+class FakeMotor(object):
+    def __init__(self, id, model):
+        self.id = id
+        self.model = model
+        self._broken = False
+        self._read_synchronous = defaultdict(lambda: False)
+        self._read_synced = defaultdict(SyncEvent)
+
+
+class RecordingController(MotorsController):
+    def __init__(self, name, freq, log):
+        MotorsController.__init__(self, FakeIO(), [], freq)
+        self.varname = name
+        self.log = log
+
+    def update(self):
+        self.log.append(self.varname)
+
+
+class TestScheduledDxlController(unittest.TestCase):
+    def test_slots(self):
+        log = []
+        controllers = [RecordingController('slow', 10., log),
+                       RecordingController('fast', 50., log),
+                       RecordingController('fast2', 50., log)]
+
+        c = ScheduledDxlController(FakeIO(), [], controllers)
+
+        self.assertEqual([s.name for s in c.slots], ['fast, fast2', 'slow'])
+        self.assertAlmostEqual(c.period, 1. / 50)
+
+    def test_rate_monotonic(self):
+        log = []
+        controllers = [RecordingController('slow', 10., log),
+                       RecordingController('fast', 50., log)]
+
+        c = ScheduledDxlController(FakeIO(), [], controllers)
+        c.start()
+        time.sleep(0.5)
+        c.stop()
+
+        # Both slots are released at start, the fastest one has the priority
+        self.assertEqual(log[:2], ['fast', 'slow'])
+        self.assertGreater(log.count('fast'), 3 * log.count('slow'))
+
+        fast, slow = c.stats
+        self.assertEqual(fast['runs'], log.count('fast'))
+        self.assertEqual(slow['runs'], log.count('slow'))
+        self.assertLess(c.utilization, c.budget)
+
+    def test_crashed_loop(self):
+        log = []
+
+        class CrashingController(RecordingController):
+            def update(self):
+                raise ValueError('crash')
+
+        crashing = CrashingController('crash', 10., log)
+        controllers = [RecordingController('fast', 50., log), crashing]
+
+        c = ScheduledDxlController(FakeIO(), [], controllers)
+        c.start()
+        time.sleep(0.2)
+        c.stop()
+
+        # the crashed loop and its empty slot are removed, the others keep running
+        self.assertEqual(c.controllers, controllers[:1])
+        self.assertEqual([s.name for s in c.slots], ['fast'])
+        self.assertEqual(crashing.loop_stats.iterations, 0)
+        self.assertGreater(log.count('fast'), 3)
+
+    def test_crashed_fastest_loop(self):
+        log = []
+
+        class CrashingController(RecordingController):
+            def update(self):
+                raise ValueError('crash')
+
+        controllers = [CrashingController('crash', 50., log),
+                       RecordingController('slow', 1., log)]
+
+        c = ScheduledDxlController(FakeIO(), [], controllers)
+        c.start()
+        time.sleep(0.1)
+
+        # the empty fastest slot is kept and still signals the updates
+        self.assertEqual([s.name for s in c.slots], ['', 'slow'])
+        c._updated.clear()
+        self.assertTrue(c._updated.wait(0.1))
+        c.stop()
+
+    def test_no_loop(self):
+        with self.assertRaises(ValueError) as cm:
+            ScheduledDxlController(FakeIO(), [], [])
+        self.assertIn('No synchronization loop', str(cm.exception))
+
+    def test_bulk_read_merge(self):
+        for model, merged in (('MX-28', True), ('AX-12', False)):
+            io = FakeIO()
+            motors = [FakeMotor(1, model), FakeMotor(2, model)]
+
+            controllers = [DxlController(io, motors, 1., False, 'get', 'present_voltage'),
+                           DxlController(io, motors, 1., False, 'get', 'present_temperature')]
+
+            c = ScheduledDxlController(io, motors, controllers)
+
+            if merged:
+                self.assertEqual(len(c.controllers), 1)
+                self.assertIsInstance(c.controllers[0], BulkReadDxlController)
+                self.assertEqual(c.controllers[0].varnames,
+                                 ['present_voltage', 'present_temperature'])
+            else:
+                self.assertEqual(c.controllers, controllers)
+
+
+class WriteRecordingIO(FakeIO):
+    def __init__(self):
+        self.writes = []
+
+    def _set_torque_enable(self, value_for_id):
+        pass
+
+    def set_goal_position(self, value_for_id):
+        self.writes.append(('goal_position', value_for_id))
+
+    def set_goal_position_speed_load(self, value_for_id):
+        self.writes.append(('goal_position_speed_load', value_for_id))
+
+
+class TestDirtyWrites(unittest.TestCase):
+    def setUp(self):
+        self.io = WriteRecordingIO()
+        self.motors = [DxlMXMotor(id, model='MX-28') for id in (1, 2)]
+        for m in self.motors:
+            m.__dict__.update(compliant=False, goal_position=0,
+                              moving_speed=0, torque_limit=0)
+
+        self.c = PosSpeedLoadDxlController(self.io, self.motors, 50.)
+        self.c._old_torques = {1: True, 2: True}
+
+    def write(self):
+        self.io.writes = []
+        self.c.set_goal_position_speed_load(self.motors)
+        return self.io.writes
+
+    def test_only_changes_are_written(self):
+        self.assertEqual(self.write(), [('goal_position_speed_load',
+                                         {1: (0, 0, 0), 2: (0, 0, 0)})])
+        self.assertEqual(self.write(), [])
+
+        # Less than half an encoder tick
+        self.motors[0].goal_position = 0.01
+        self.assertEqual(self.write(), [])
+
+        self.motors[0].goal_position = 10.0
+        self.assertEqual(self.write(), [('goal_position', {1: 10.0})])
+
+        self.motors[1].moving_speed = 100.0
+        self.assertEqual(self.write(), [('goal_position_speed_load',
+                                         {2: (0, 100.0, 0)})])
+
+    def test_refresh(self):
+        self.write()
+
+        self.c.refresh()
+        self.assertEqual(len(self.write()[0][1]), 2)
+
+        self.c.refresh_period = 0.
+        self.assertEqual(len(self.write()[0][1]), 2)
+
+        # Motors turned stiff always get their goals
+        self.c.refresh_period = None
+        self.write()
+        self.motors[0].__dict__['compliant'] = True
+        self.write()
+        self.motors[0].__dict__['compliant'] = False
+        self.assertEqual(self.write(), [('goal_position_speed_load',
+                                         {1: (0, 0, 0)})])
+
+
+    def test_force_control_not_refreshed(self):
+        self.motors[1].__dict__['force_control_enable'] = True
+        self.write()
+
+        self.c.refresh_period = 0.
+        self.assertEqual(self.write(), [('goal_position_speed_load', {1: (0, 0, 0)})])
+
+        self.motors[1].goal_position = 10.0
+        self.assertEqual(self.write(), [('goal_position_speed_load',
+                                         {1: (0, 0, 0), 2: (10.0, 0, 0)})])
+
+    def test_failed_write(self):
+        self.write()
+
+        def fail(value_for_id):
+            raise DxlError('instruction packet not entirely sent')
+
+        self.io.set_goal_position = fail
+        self.motors[0].goal_position = 10.0
+        self.assertRaises(DxlError, self.write)
+
+        # the change is written at the next update
+        del self.io.set_goal_position
+        self.assertEqual(self.write(), [('goal_position', {1: 10.0})])
+
+
+class SlowBusIO(WriteRecordingIO):
+    def __init__(self, port):
+        WriteRecordingIO.__init__(self)
+        self.port = port
+
+    def is_torque_enabled(self, ids):
+        return [False for _ in ids]
+
+    def get_goal_position_speed_load(self, ids):
+        return [(0.0, 0.0, 0.0) for _ in ids]
+
+    def get_present_position_speed_load(self, ids):
+        time.sleep(0.05)
+        return [(float(id), 0.0, 0.0) for id in ids]
+
+
+class TestMultiBusController(unittest.TestCase):
+    def test_lockstep(self):
+        controllers = []
+        for port, ids in (('bus1', (1, 2)), ('bus2', (3, 4))):
+            io = SlowBusIO(port)
+            motors = [DxlMXMotor(id, model='MX-28') for id in ids]
+            loop = PosSpeedLoadDxlController(io, motors, 50.)
+            controllers.append(MetaDxlController(io, motors, [loop]))
+
+        c = MultiBusController(controllers)
+
+        self.assertEqual([meta.controllers for meta in controllers], [[], []])
+        self.assertAlmostEqual(c.period, 1. / 50)
+
+        c.setup()
+        c.update()
+        c.teardown()
+
+        tick = c.last_tick
+        self.assertEqual(tick.sequence, 1)
+        self.assertEqual(tick.present_position, (1.0, 2.0, 3.0, 4.0))
+        # both buses were read in parallel
+        self.assertLess(tick.read_window, 0.09)
+
+
+class TestBusBudget(unittest.TestCase):
+    def setUp(self):
+        self.motors = [DxlMXMotor(id, model='MX-28') for id in range(1, 9)]
+        self.controller = BaseDxlController(None, self.motors)
+
+    def test_baudrate(self):
+        fast = BusBudget(DxlIO, 1000000, latency=0).utilization(self.controller)
+        slow = BusBudget(DxlIO, 57600, latency=0).utilization(self.controller)
+
+        self.assertAlmostEqual(slow / fast, 1000000 / 57600.)
+
+    def test_bulk_read(self):
+        budget = BusBudget(DxlIO)
+        loops = [DxlController(None, self.motors, 1., False, 'get', 'present_voltage'),
+                 DxlController(None, self.motors, 1., False, 'get', 'present_temperature')]
+        bulk = BulkReadDxlController(None, self.motors, 1., False,
+                                     ['present_voltage', 'present_temperature'])
+
+        self.assertLess(budget.loop_cost(bulk).duration,
+                        sum(budget.loop_cost(loop).duration for loop in loops))
+
+    def test_plan(self):
+        budget = BusBudget(DxlIO, 57600)
+        p = plan(budget, self.controller, target=0.8)
+
+        self.assertGreater(p.utilization, 0.8)
+        self.assertAlmostEqual(p.utilization * p.frequency_factor, 0.8)
+        self.assertGreater(p.nb_buses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
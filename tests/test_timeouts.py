@@ -0,0 +1,131 @@
+import time
+import unittest
+
+from pypot.dynamixel.io.timeouts import AdaptiveTimeouts
+from pypot.dynamixel.motor import DxlMXMotor
+from pypot.dynamixel.controller import DxlController
+from pypot.dynamixel.io import Dxl320IO
+from pypot.dynamixel.io.abstract_io import DxlTimeoutError, DxlCommunicationError
+
+from utils import FakeBus
+
+
+class FakeIO(object):
+    def __init__(self):
+        self.timeouts = AdaptiveTimeouts(0.05, failure_threshold=2, cooldown=0.05)
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.timeouts = AdaptiveTimeouts(0.05, min_timeout=0.001, margin=2.0,
+                                         failure_threshold=2, cooldown=0.05)
+
+    def test_timeout_from_rtt(self):
+        self.assertEqual(self.timeouts.timeout(1), 0.05)
+
+        for _ in range(64):
+            self.timeouts.success(1, 0.002)
+        self.assertAlmostEqual(self.timeouts.timeout(1), 0.004)
+
+        # exponential backoff
+        self.timeouts.failure(1)
+        self.assertAlmostEqual(self.timeouts.timeout(1), 0.008)
+
+        self.timeouts.success(1)
+        self.assertAlmostEqual(self.timeouts.timeout(1), 0.004)
+
+    def test_circuit_breaker(self):
+        self.timeouts.failure(1)
+        self.assertTrue(self.timeouts.available(1))
+
+        self.timeouts.failure(1)
+        self.assertFalse(self.timeouts.available(1))
+        self.assertEqual(self.timeouts.dropped, [1])
+
+        time.sleep(0.06)
+        self.assertTrue(self.timeouts.available(1))
+
+        # a failed probe doubles the cooldown
+        self.timeouts.failure(1)
+        time.sleep(0.06)
+        self.assertFalse(self.timeouts.available(1))
+        time.sleep(0.05)
+        self.assertTrue(self.timeouts.available(1))
+
+        self.timeouts.success(1, 0.002)
+        self.timeouts.failure(1)
+        self.assertTrue(self.timeouts.available(1))
+
+    def test_skipped_motors(self):
+        io = FakeIO()
+        motors = [DxlMXMotor(id) for id in (1, 2)]
+        c = DxlController(io, motors, 50., False, 'get', 'present_temperature')
+
+        io.timeouts.failure(2)
+        io.timeouts.failure(2)
+        self.assertEqual(c.working_motors, motors[:1])
+
+
+class ErrorHandler(object):
+    def __init__(self):
+        self.timeouts = []
+
+    def handle_timeout(self, e):
+        self.timeouts.append(e.ids)
+
+
+class TestSyncReadTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus([1, 2], model=350, protocol=2).start()
+        self.io = Dxl320IO(self.bus.port, timeout=0.2, use_sync_read=True,
+                           adaptive_timeouts=True)
+
+    def tearDown(self):
+        self.io.close()
+        self.bus.close()
+
+    def test_sync_read(self):
+        self.assertEqual(self.io.get_model([1, 2]), ('XL-320', 'XL-320'))
+
+        # the first motor does not answer: it waits for its own timeout only
+        self.io.timeouts._health(3).timeout = 0.01
+        for _ in range(self.io.timeouts.failure_threshold):
+            start = time.time()
+            with self.assertRaises(DxlTimeoutError):
+                self.io._read_raw([3, 1], 0, 2, None)
+            self.assertLess(time.time() - start, 0.15)
+
+        self.assertEqual(self.io.timeouts.dropped, [3])
+
+        # a motor further in the request
+        with self.assertRaises(DxlTimeoutError) as e:
+            self.io._read_raw([1, 4], 0, 2, None)
+        self.assertEqual(e.exception.ids, [4])
+        self.assertEqual(self.io.timeouts._motors[4].failures, 1)
+        self.assertEqual(self.io._serial.timeout, self.io.timeout)
+
+        handler = ErrorHandler()
+        self.assertEqual(self.io._read_raw([1, 4], 0, 2, handler)[1], ())
+        self.assertEqual(handler.timeouts, [[4]])
+
+        self.assertEqual(self.io._read_raw([1, 2], 0, 2, None)[1], [0x5e, 0x01, 0x5e, 0x01])
+
+    def test_unexpected_answer(self):
+        class ReversedBus(FakeBus):
+            # answers the sync reads in the wrong order
+            def _answer(self, id, instruction, params):
+                if instruction == 0x82:
+                    params = params[:4] + params[4:][::-1]
+                FakeBus._answer(self, id, instruction, params)
+
+        bus = ReversedBus([1, 2], model=350, protocol=2).start()
+        try:
+            with Dxl320IO(bus.port, use_sync_read=True, adaptive_timeouts=True) as io:
+                with self.assertRaises(DxlCommunicationError):
+                    io._read_raw([1, 2], 0, 2, None)
+        finally:
+            bus.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
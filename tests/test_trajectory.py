@@ -0,0 +1,61 @@
+import time
+import unittest
+
+import numpy as np
+
+from pypot.creatures import PoppyErgoJr
+from pypot.utils.trajectory import (GroupLinearTrajectory, GroupMinJerkTrajectory,
+                                    MinimumJerkTrajectory)
+
+
+class TestGroupTrajectories(unittest.TestCase):
+    def test_minjerk(self):
+        initial, final = [0., 10., -30.], [90., 10., 45.]
+
+        group = GroupMinJerkTrajectory(initial, final, 1.5, init_vel=[0., 5., -10.])
+        singles = [MinimumJerkTrajectory(i, f, 1.5, init_vel=v)
+                   for i, f, v in zip(initial, final, [0., 5., -10.])]
+
+        for t in np.linspace(0, 1.5, 16):
+            np.testing.assert_allclose(group.get_value(t),
+                                       [s._mylambda(t) for s in singles], atol=1e-9)
+
+        np.testing.assert_allclose(group.get_value(2.), final)
+        np.testing.assert_allclose(group.get_value(-1.), initial)
+
+    def test_linear(self):
+        group = GroupLinearTrajectory([0., 10.], [10., -10.], 2.)
+        np.testing.assert_allclose(group.get_value(0.5), [2.5, 5.])
+        np.testing.assert_allclose(group.get_value(3.), [10., -10.])
+
+
+class TestGroupGoto(unittest.TestCase):
+    def setUp(self):
+        self.jr = PoppyErgoJr(simulator='dummy')
+
+    def tearDown(self):
+        self.jr.close()
+
+    def test_goto(self):
+        goals = {m.name: 10. * i for i, m in enumerate(self.jr.motors)}
+
+        t0 = time.time()
+        self.jr.goto_position(goals, 0.3, control='minjerk', wait=True)
+        self.assertGreater(time.time() - t0, 0.25)
+
+        for m in self.jr.motors:
+            self.assertAlmostEqual(m.goal_position, goals[m.name])
+
+    def test_mixed_controls(self):
+        self.jr.m1.goto_behavior = 'dummy'
+        self.jr.m2.goto_behavior = 'linear'
+
+        self.jr.goto_position({'m1': 20., 'm2': -20., 'm3': 5.}, 0.2, wait=True)
+
+        self.assertAlmostEqual(self.jr.m1.goal_position, 20.)
+        self.assertAlmostEqual(self.jr.m2.goal_position, -20.)
+        self.assertAlmostEqual(self.jr.m3.goal_position, 5.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,13 @@
+import os
+import time
+import select
 import socket
+import threading
 
 from contextlib import closing
 
+from pypot.dynamixel.protocol.crc import crc16
+
 
 def get_open_port():
     with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
@@ -9,3 +15,129 @@ def get_open_port():
         s.listen(1)
         port = s.getsockname()[1]
         return port
+
+
+class FakeBus(object):
+    """ Motors answering the instruction packets written on the master side of a pty.
+
+        The port to open is :attr:`port`, the control table of each motor is in :attr:`tables`.
+
+        """
+    def __init__(self, ids, model=12, protocol=1, broadcast_delay=0.0):
+        self.master, self.slave = os.openpty()
+        self.port = os.ttyname(self.slave)
+        self.protocol = protocol
+        # like the real motors, each motor answers a broadcast ping after a delay proportional to its id
+        self.broadcast_delay = broadcast_delay
+
+        self.tables = {id: bytearray(80) for id in ids}
+        for t in self.tables.values():
+            t[0:2] = model.to_bytes(2, 'little')
+
+        self.received = []
+        self._buffer = bytearray()
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        os.write(self._stop_w, b'x')
+        self._thread.join()
+        for fd in (self.master, self.slave, self._stop_r, self._stop_w):
+            os.close(fd)
+
+    def _run(self):
+        while True:
+            ready, _, _ = select.select([self.master, self._stop_r], [], [])
+            if self._stop_r in ready:
+                return
+
+            self._buffer.extend(os.read(self.master, 1024))
+            while True:
+                packet = self._next_packet()
+                if packet is None:
+                    break
+                self._answer(*packet)
+
+    def _next_packet(self):
+        # like the motors, skip everything until a packet header
+        marker = b'\xff\xff' if self.protocol == 1 else b'\xff\xff\xfd\x00'
+        i = self._buffer.find(marker)
+        if i < 0:
+            del self._buffer[:-len(marker) + 1]
+            return None
+        del self._buffer[:i]
+        b = self._buffer
+
+        if self.protocol == 1:
+            if len(b) < 4 or len(b) < b[3] + 4:
+                return None
+            packet, self._buffer = b[:b[3] + 4], b[b[3] + 4:]
+            return packet[2], packet[4], packet[5:-1]
+
+        if len(b) < 7:
+            return None
+        length = b[5] + (b[6] << 8)
+        if len(b) < 7 + length:
+            return None
+        packet, self._buffer = b[:7 + length], b[7 + length:]
+        return packet[4], packet[7], packet[8:-2]
+
+    def _answer(self, id, instruction, params):
+        self.received.append((id, instruction))
+
+        if instruction == 0x83:  # sync write
+            if self.protocol == 1:
+                address, length, params = params[0], params[1], params[2:]
+            else:
+                address, length, params = params[0] + (params[1] << 8), params[2] + (params[3] << 8), params[4:]
+
+            for i in range(0, len(params), length + 1):
+                table = self.tables.get(params[i])
+                if table is not None:
+                    table[address:address + length] = params[i + 1:i + 1 + length]
+            return
+
+        if instruction == 0x82 and self.protocol == 2:  # sync read, answered in the ids order
+            address, length = params[0] + (params[1] << 8), params[2] + (params[3] << 8)
+            for id in params[4:]:
+                if id not in self.tables:
+                    return
+                os.write(self.master, self._status_packet(id, bytes(self.tables[id][address:address + length])))
+            return
+
+        broadcast = id == 254 and instruction == 0x01
+        ids = sorted(self.tables) if broadcast else [id]
+
+        start = time.monotonic()
+        for id in ids:
+            if id not in self.tables:
+                continue
+
+            if broadcast:
+                time.sleep(max(start + id * self.broadcast_delay - time.monotonic(), 0))
+
+            if instruction == 0x01:  # ping
+                answer = b'' if self.protocol == 1 else bytes(self.tables[id][0:2]) + b'\x00'
+            elif instruction == 0x02:  # read data
+                if self.protocol == 1:
+                    address, length = params[0], params[1]
+                else:
+                    address, length = params[0] + (params[1] << 8), params[2] + (params[3] << 8)
+                answer = bytes(self.tables[id][address:address + length])
+            else:
+                continue
+
+            os.write(self.master, self._status_packet(id, answer))
+
+    def _status_packet(self, id, params):
+        if self.protocol == 1:
+            content = bytes([id, len(params) + 2, 0]) + params
+            return b'\xff\xff' + content + bytes([~sum(content) & 0xFF])
+
+        packet = (b'\xff\xff\xfd\x00' + bytes([id]) +
+                  (len(params) + 4).to_bytes(2, 'little') + b'\x55\x00' + params)
+        return packet + crc16(packet, len(packet)).to_bytes(2, 'little')